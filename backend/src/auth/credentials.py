@@ -2,7 +2,7 @@ from fastapi import Request
 from src.auth.strategy import AuthenticationStrategy, AuthenticationResult
 from src.repositories import get_user_repository
 from src.repositories.user_repository import UserRepository
-from src.services.password import verify_password
+from src.services.password import verify_password_async
 
 
 class CredentialsStrategy(AuthenticationStrategy):
@@ -31,7 +31,7 @@ class CredentialsStrategy(AuthenticationStrategy):
                 error='Invalid credentials'
             )
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return AuthenticationResult(
                 success=False,
                 error='Invalid credentials'
@@ -1,16 +1,29 @@
 from fastapi import Depends, Request
 from typing import Optional
 from src.auth.service import auth_service
+from src.auth.user_cache import user_cache
 from src.repositories import get_user_repository
 from src.repositories.user_repository import UserRepository
-from src.models.domain import User
+from src.models.domain import UserIdentity
 from src.exceptions import UnauthorizedException, ForbiddenException
 
 
+async def load_user_identity(user_id: str, repo: UserRepository) -> Optional[UserIdentity]:
+    """Resolve an authenticated user id, served from the user cache when possible."""
+    user = user_cache.get(user_id)
+    if user:
+        return user
+    # Only load the fields auth needs; the password hash never leaves the database
+    user = await repo.get_by_id(user_id, projection=UserIdentity)
+    if user:
+        user_cache.set(user)
+    return user
+
+
 async def get_current_user(
     request: Request,
     repo: UserRepository = Depends(get_user_repository)
-) -> User:
+) -> UserIdentity:
     authorization = request.headers.get('Authorization')
     
     if not authorization:
@@ -31,7 +44,7 @@ async def get_current_user(
     if not user_id:
         raise UnauthorizedException()
     
-    user = await repo.get_by_id(user_id)
+    user = await load_user_identity(user_id, repo)
     if not user:
         raise UnauthorizedException()
     
@@ -41,7 +54,7 @@ async def get_current_user(
 async def get_optional_user(
     request: Request,
     repo: UserRepository = Depends(get_user_repository)
-) -> Optional[User]:
+) -> Optional[UserIdentity]:
     try:
         return await get_current_user(request, repo)
     except UnauthorizedException:
@@ -50,8 +63,8 @@ async def get_optional_user(
 
 def require_roles(*required_roles: str):
     async def _require_roles(
-        current_user: User = Depends(get_current_user)
-    ) -> User:
+        current_user: UserIdentity = Depends(get_current_user)
+    ) -> UserIdentity:
         if not required_roles:
             return current_user
         if current_user.role not in required_roles:
@@ -4,6 +4,7 @@ from src.auth.strategy import AuthenticationStrategy, AuthenticationResult
 from src.auth.credentials import CredentialsStrategy
 from src.auth.oauth.google import GoogleOAuthStrategy
 from src.auth.jwt import create_access_token, create_refresh_token, verify_token
+from src.auth.token_cache import TokenCache
 from src.repositories import get_user_repository
 from src.repositories.user_repository import UserRepository
 from src.models.domain import User
@@ -18,6 +19,7 @@ class AuthenticationService:
             'google': GoogleOAuthStrategy(),
         }
         self._repo: UserRepository = None
+        self._token_cache = TokenCache(max_size=settings.jwt_verify_cache_max_size)
 
     def _get_repo(self) -> UserRepository:
         if self._repo is None:
@@ -85,8 +87,13 @@ class AuthenticationService:
         }
 
     def verify_access_token(self, token: str) -> Optional[Dict[str, Any]]:
+        # Clients resend the same token until it expires; skip signature verification for known ones
+        payload = self._token_cache.get(token)
+        if payload:
+            return payload
         payload = verify_token(token)
         if payload and payload.get('type') != 'refresh':
+            self._token_cache.set(token, payload)
             return payload
         return None
 
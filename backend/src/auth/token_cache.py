@@ -0,0 +1,57 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+token_cache_lookups_total = Counter(
+    'auth_token_cache_lookups_total',
+    'Verified access token cache lookups',
+    ['result']
+)
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified token payloads keyed by a SHA-256 digest of the token.
+
+    Entries live until the token's own exp claim, so a cached token is never
+    accepted after it would have failed verification.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, Tuple[float, Dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            token_cache_lookups_total.labels(result='miss').inc()
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            token_cache_lookups_total.labels(result='miss').inc()
+            return None
+        self._entries.move_to_end(key)
+        token_cache_lookups_total.labels(result='hit').inc()
+        return dict(payload)
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        expires_at = payload.get('exp')
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (float(expires_at), dict(payload))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,135 @@
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import aio_pika
+from aio_pika import ExchangeType, IncomingMessage
+from prometheus_client import Counter
+
+from src.config import settings
+from src.logging.logger import get_logger
+from src.models.domain import UserIdentity
+
+logger = get_logger(__name__, 'api')
+
+user_cache_lookups_total = Counter(
+    'auth_user_cache_lookups_total',
+    'Authenticated-user cache lookups',
+    ['result']
+)
+
+
+class UserCache:
+    """
+    TTL + LRU cache of authenticated users keyed by user id.
+
+    Entries are evicted locally by UserService on writes. When attached to a
+    RabbitMQ channel, evictions are also fanned out to every other API process
+    through the invalidation exchange; the TTL bounds staleness otherwise.
+    Celery workers attach publish-only, so user writes made by tasks reach the
+    API processes too.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 30,
+        invalidation_exchange: Optional[str] = None
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.invalidation_exchange = invalidation_exchange
+        self._entries: OrderedDict[str, Tuple[float, UserIdentity]] = OrderedDict()
+        self._exchange: Optional[aio_pika.abc.AbstractExchange] = None
+        self._origin = uuid.uuid4().hex
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, user_id: str) -> Optional[UserIdentity]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            user_cache_lookups_total.labels(result='miss').inc()
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            user_cache_lookups_total.labels(result='miss').inc()
+            return None
+        self._entries.move_to_end(user_id)
+        user_cache_lookups_total.labels(result='hit').inc()
+        return user
+
+    def set(self, user: UserIdentity) -> None:
+        if not self.enabled:
+            return
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def invalidate(self, user_id: str) -> None:
+        """Evict a user here and, when attached, in every other process."""
+        self.evict(user_id)
+        if self._exchange is None:
+            return
+        try:
+            await self._exchange.publish(
+                aio_pika.Message(
+                    body=json.dumps({'user_id': user_id, 'origin': self._origin}).encode(),
+                    delivery_mode=aio_pika.DeliveryMode.NOT_PERSISTENT
+                ),
+                routing_key=''
+            )
+        except Exception:
+            logger.warning(
+                'Failed to publish user cache invalidation',
+                extra={'user_id': user_id},
+                exc_info=True
+            )
+
+    async def attach(self, channel: aio_pika.abc.AbstractChannel, consume: bool = True) -> None:
+        """
+        Publish on the invalidation exchange, if one is configured.
+
+        With consume, also evict on invalidations published by other processes;
+        processes that serve no authenticated requests only need to publish.
+        """
+        if not self.invalidation_exchange or not self.enabled:
+            return
+        exchange = await channel.declare_exchange(self.invalidation_exchange, ExchangeType.FANOUT)
+        if consume:
+            queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+            await queue.bind(exchange)
+            await queue.consume(self._handle_invalidation, no_ack=True)
+        self._exchange = exchange
+
+    def detach(self) -> None:
+        self._exchange = None
+
+    async def _handle_invalidation(self, message: IncomingMessage) -> None:
+        try:
+            body = json.loads(message.body.decode())
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return
+        if body.get('origin') == self._origin:
+            return
+        user_id = body.get('user_id')
+        if user_id:
+            self.evict(user_id)
+
+
+user_cache = UserCache(
+    max_size=settings.user_cache_max_size,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    invalidation_exchange=settings.user_cache_invalidation_exchange
+)
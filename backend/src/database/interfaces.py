@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List
+from typing import Generic, TypeVar, Optional, List, Union
 from pydantic import BaseModel
+from src.database.pagination import Page
 
 T = TypeVar('T', bound=BaseModel)
 ID = TypeVar('ID')
+P = TypeVar('P', bound=BaseModel)
 
 
 class IRepository(ABC, Generic[T, ID]):
@@ -12,13 +14,22 @@ class IRepository(ABC, Generic[T, ID]):
         pass
 
     @abstractmethod
-    async def get_by_id(self, id: ID) -> Optional[T]:
+    async def get_by_id(self, id: ID, projection: Optional[type[P]] = None) -> Optional[Union[T, P]]:
         pass
 
     @abstractmethod
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[type[P]] = None
+    ) -> Page[Union[T, P]]:
+        pass
+
     @abstractmethod
     async def update(self, id: ID, entity: T) -> Optional[T]:
         pass
@@ -28,9 +39,25 @@ class IRepository(ABC, Generic[T, ID]):
         pass
 
     @abstractmethod
-    async def find_one(self, filter: dict) -> Optional[T]:
+    async def find_one(self, filter: dict, projection: Optional[type[P]] = None) -> Optional[Union[T, P]]:
+        pass
+
+    @abstractmethod
+    async def find_many(
+        self,
+        filter: dict,
+        skip: int = 0,
+        limit: int = 100,
+        projection: Optional[type[P]] = None
+    ) -> List[Union[T, P]]:
         pass
 
     @abstractmethod
-    async def find_many(self, filter: dict, skip: int = 0, limit: int = 100) -> List[T]:
+    async def find_page(
+        self,
+        filter: dict,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[type[P]] = None
+    ) -> Page[Union[T, P]]:
         pass
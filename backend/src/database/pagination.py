@@ -0,0 +1,37 @@
+import base64
+import binascii
+from typing import Generic, TypeVar, List, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    A single page of keyset-paginated results.
+
+    next_cursor is an opaque continuation token; it is None when there are no more results.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """Encode the last seen document id into an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(str(last_id).encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """
+    Decode a cursor produced by encode_cursor back into the resume-point id.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii'))
+    except (binascii.Error, InvalidId, UnicodeError, ValueError, TypeError):
+        raise ValueError('errors.pagination.invalid_cursor')
@@ -3,6 +3,7 @@ Dependency injection for services and repositories.
 """
 from fastapi import Depends
 from src.config import settings
+from src.auth.user_cache import user_cache
 from src.repositories import get_user_repository, get_uploaded_file_repository
 from src.repositories.user_repository import UserRepository
 from src.repositories.uploaded_file_repository import UploadedFileRepository
@@ -12,6 +13,7 @@ from src.services.health_service import HealthService
 from src.services.file_storage_service import FileStorageService
 from src.storage.local_file_store import LocalFileStore
 from src.storage.s3_file_store import S3FileStore
+from src.storage.cached_file_store import CachedFileStore, get_disk_cache, get_memory_cache
 from src.storage.base import FileStorage
 
 
@@ -20,12 +22,23 @@ def get_file_storage() -> FileStorage:
     if settings.file_storage_type == 's3':
         if not settings.s3_bucket_name:
             raise ValueError('errors.storage.s3_bucket_required')
-        return S3FileStore(
+        storage = S3FileStore(
             bucket_name=settings.s3_bucket_name,
-            region=settings.s3_region
+            region=settings.s3_region,
+            endpoint_url=settings.s3_endpoint_url,
+            max_pool_connections=settings.s3_max_pool_connections,
+            part_size=settings.s3_multipart_part_size,
+            upload_concurrency=settings.s3_multipart_concurrency,
+            url_expires_in=settings.s3_url_expires_in
         )
     else:
-        return LocalFileStore(base_path=settings.file_storage_path)
+        storage = LocalFileStore(base_path=settings.file_storage_path)
+
+    memory_cache = get_memory_cache()
+    disk_cache = get_disk_cache()
+    if memory_cache or disk_cache:
+        return CachedFileStore(storage, memory_cache, disk_cache)
+    return storage
 
 
 def get_file_storage_service(
@@ -33,7 +46,14 @@ def get_file_storage_service(
     uploaded_file_repository: UploadedFileRepository = Depends(get_uploaded_file_repository)
 ) -> FileStorageService:
     """Dependency injection for FileStorageService."""
-    return FileStorageService(file_storage, uploaded_file_repository)
+    return FileStorageService(
+        file_storage,
+        uploaded_file_repository,
+        min_upload_chunk_size=settings.file_upload_min_chunk_size,
+        max_upload_chunk_size=settings.file_upload_max_chunk_size,
+        content_addressed=settings.file_storage_content_addressed,
+        image_variant_sizes=settings.image_variant_sizes_list
+    )
 
 
 def get_user_service(
@@ -41,7 +61,7 @@ def get_user_service(
     file_storage_service: FileStorageService = Depends(get_file_storage_service)
 ) -> UserService:
     """Dependency injection for UserService."""
-    return UserService(user_repository, file_storage_service)
+    return UserService(user_repository, file_storage_service, user_cache)
 
 
 def get_task_service() -> TaskService:
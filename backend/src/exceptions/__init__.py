@@ -3,8 +3,10 @@ from src.exceptions.handlers import (
     validation_exception_handler,
     unauthorized_exception_handler,
     forbidden_exception_handler,
+    service_unavailable_exception_handler,
     UnauthorizedException,
-    ForbiddenException
+    ForbiddenException,
+    ServiceUnavailableException
 )
 
 # Import error handlers from submodule
@@ -17,8 +19,10 @@ __all__ = [
     'validation_exception_handler',
     'unauthorized_exception_handler',
     'forbidden_exception_handler',
+    'service_unavailable_exception_handler',
     'UnauthorizedException',
     'ForbiddenException',
+    'ServiceUnavailableException',
     'translate_error_message',
     'raise_translated_error',
 ]
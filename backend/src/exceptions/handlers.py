@@ -14,6 +14,12 @@ class ForbiddenException(Exception):
         super().__init__('Forbidden')
 
 
+class ServiceUnavailableException(Exception):
+    def __init__(self, retry_after: int = 1):
+        super().__init__('Service unavailable')
+        self.retry_after = retry_after
+
+
 def format_validation_error(error: dict, translator) -> dict:
     loc = error.get('loc', [])
     field_parts = [str(l) for l in loc if l not in ('body', 'query', 'path')]
@@ -98,3 +104,18 @@ async def forbidden_exception_handler(
             'message': translator.t('errors.auth.forbidden')
         }
     )
+
+
+async def service_unavailable_exception_handler(
+    request: Request,
+    exc: ServiceUnavailableException
+) -> JSONResponse:
+    translator = get_translator(request)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(exc.retry_after)},
+        content={
+            'status': translator.t('common.error'),
+            'message': translator.t('errors.service.busy')
+        }
+    )
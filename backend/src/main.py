@@ -11,8 +11,10 @@ from src.exceptions import (
     validation_exception_handler,
     unauthorized_exception_handler,
     forbidden_exception_handler,
+    service_unavailable_exception_handler,
     UnauthorizedException,
-    ForbiddenException
+    ForbiddenException,
+    ServiceUnavailableException
 )
 from src.middleware.correlation import CorrelationMiddleware
 from src.logging.logger import get_logger
@@ -25,6 +27,7 @@ from src.routes import auth
 from src.routes import files
 from src.routes import websocket
 from src.tasks.queue import enqueue
+from src.websocket.connection_manager import connection_manager
 from src.websocket.queue_consumer import consume_ws_queue
 from pathlib import Path
 
@@ -63,6 +66,7 @@ async def lifespan(app: FastAPI):
         await ws_consumer_task
     except asyncio.CancelledError:
         pass
+    await connection_manager.shutdown()
     await DatabaseConnection.disconnect()
     logger.info('Disconnected from MongoDB')
 
@@ -81,11 +85,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['X-Next-Cursor'],
 )
 
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(UnauthorizedException, unauthorized_exception_handler)
 app.add_exception_handler(ForbiddenException, forbidden_exception_handler)
+app.add_exception_handler(ServiceUnavailableException, service_unavailable_exception_handler)
 
 app.mount('/metrics', metrics_app)
 
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from pydantic_core import PydanticCustomError
-from typing import Optional, Literal
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
@@ -30,10 +30,38 @@ class User(UserBase):
     id: Optional[str] = None
     hashed_password: str
     avatar_file_key: Optional[str] = None
+    # Thumbnail sizes generated for the avatar; until one exists avatar_url points at the original
+    avatar_variant_sizes: List[int] = []
+    # Key the avatar content is stored under (its blob in content-addressed mode), when it differs
+    avatar_storage_key: Optional[str] = None
     role: Literal['user', 'admin'] = 'user'
     created_at: Optional[datetime] = None
 
 
+class UserSummary(UserBase):
+    """User without credentials; projection model for listings."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    avatar_file_key: Optional[str] = None
+    # Thumbnail sizes generated for the avatar; until one exists avatar_url points at the original
+    avatar_variant_sizes: List[int] = []
+    # Key the avatar content is stored under (its blob in content-addressed mode), when it differs
+    avatar_storage_key: Optional[str] = None
+    role: Literal['user', 'admin'] = 'user'
+    created_at: Optional[datetime] = None
+
+
+class UserIdentity(BaseModel):
+    """Fields needed to authenticate and authorize a request; projection model for auth."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    email: str
+    name: str
+    role: Literal['user', 'admin'] = 'user'
+
+
 class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
@@ -54,6 +82,19 @@ class UploadedFile(BaseModel):
     content_type: Optional[str] = None
     file_size: int
     used_for: Optional[str] = None
+    # Storage key of the shared content blob in content-addressed mode; None when stored under file_key
+    blob_key: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class UploadedFileRef(BaseModel):
+    """Fields needed to decide whether a file can be cleaned up; projection model for scans."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    file_key: str
+    used_for: Optional[str] = None
+    blob_key: Optional[str] = None
     created_at: Optional[datetime] = None
 
 
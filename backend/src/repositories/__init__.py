@@ -1,6 +1,7 @@
 from src.database.connection import DatabaseConnection
 from src.repositories.user_repository import UserRepository
 from src.repositories.uploaded_file_repository import UploadedFileRepository
+from src.repositories.mongo.mongo_repository import MongoRepository
 
 
 def get_user_repository() -> UserRepository:
@@ -11,3 +12,9 @@ def get_user_repository() -> UserRepository:
 def get_uploaded_file_repository() -> UploadedFileRepository:
     db = DatabaseConnection.get_db()
     return UploadedFileRepository(db)
+
+
+def get_indexed_repositories() -> list[MongoRepository]:
+    """Repositories whose declared indexes are reconciled at startup."""
+    db = DatabaseConnection.get_db()
+    return [UserRepository(db), UploadedFileRepository(db)]
@@ -1,15 +1,28 @@
-from typing import Generic, TypeVar, Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Generic, TypeVar, Optional, List, Dict, Any, Union
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
 from bson import ObjectId
 from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel, ReturnDocument
 from src.repositories.base import BaseRepository
+from src.database.pagination import Page, encode_cursor, decode_cursor
 
 T = TypeVar('T', bound=BaseModel)
 ID = TypeVar('ID')
+P = TypeVar('P', bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def projection_for(model: type[BaseModel]) -> Dict[str, int]:
+    """Build the MongoDB projection selecting the fields of a (partial) model."""
+    return {('_id' if name == 'id' else name): 1 for name in model.model_fields}
 
 
 class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
+    # Indexes the repository's queries rely on; subclasses declare their own
+    indexes: List[IndexModel] = []
+
     def __init__(self, db: AsyncIOMotorDatabase, collection_name: str, entity_type: type[T]):
         super().__init__(collection_name)
         self._db = db
@@ -18,6 +31,50 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
     def _get_collection(self) -> AsyncIOMotorCollection:
         return self._db[self.collection_name]
 
+    async def ensure_indexes(self) -> Dict[str, Any]:
+        """
+        Reconcile the collection's indexes with the declared ones.
+
+        Missing indexes are created, declared indexes whose key spec changed are
+        rebuilt, and existing indexes that are not declared are reported but kept.
+        A declared index whose key spec already exists under another name (e.g. a
+        default name like email_1 from an older deploy) is not created again, as
+        MongoDB would reject it, and is reported as equivalent instead.
+
+        Returns:
+            Dictionary with 'indexes' (created names), 'rebuilt' and 'undeclared' index
+            names, and 'equivalent' (declared name -> name of the existing index)
+        """
+        collection = self._get_collection()
+        existing = {index['name']: index async for index in collection.list_indexes()}
+        declared = {index.document['name']: index.document for index in self.indexes}
+
+        rebuilt = []
+        for name, spec in declared.items():
+            current = existing.get(name)
+            if current and list(current['key'].items()) != list(spec['key'].items()):
+                await collection.drop_index(name)
+                del existing[name]
+                rebuilt.append(name)
+
+        existing_by_key = {tuple(index['key'].items()): name for name, index in existing.items()}
+        equivalent = {}
+        missing = []
+        for index in self.indexes:
+            name = index.document['name']
+            match = existing_by_key.get(tuple(index.document['key'].items()))
+            if match is not None and match != name:
+                equivalent[name] = match
+            else:
+                missing.append(index)
+
+        created = await collection.create_indexes(missing) if missing else []
+        undeclared = [
+            name for name in existing
+            if name != '_id_' and name not in declared and name not in equivalent.values()
+        ]
+        return {'indexes': created, 'rebuilt': rebuilt, 'undeclared': undeclared, 'equivalent': equivalent}
+
     def _entity_to_dict(self, entity: T) -> Dict[str, Any]:
         data = entity.model_dump(exclude_none=True)
         if '_id' in data and isinstance(data['_id'], str):
@@ -27,11 +84,14 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
                 pass
         return data
 
-    def _dict_to_entity(self, data: Dict[str, Any]) -> T:
+    def _dict_to_entity(self, data: Dict[str, Any], entity_type: Optional[type[BaseModel]] = None) -> T:
         if '_id' in data:
             data['id'] = str(data['_id'])
             del data['_id']  # Remove _id to avoid Pydantic validation issues
-        return self._entity_type(**data)
+        return (entity_type or self._entity_type)(**data)
+
+    def _projection(self, projection: Optional[type[P]]) -> Optional[Dict[str, int]]:
+        return projection_for(projection) if projection else None
 
     async def create(self, entity: T) -> T:
         collection = self._get_collection()
@@ -40,19 +100,28 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
             del data['_id']
         entity_dict = entity.model_dump()
         if 'created_at' in entity_dict:
-            data['created_at'] = datetime.utcnow()
+            # BSON dates have millisecond precision; truncate so the returned entity matches later reads
+            now = datetime.utcnow()
+            data['created_at'] = now.replace(microsecond=now.microsecond // 1000 * 1000)
         result = await collection.insert_one(data)
-        return await self.get_by_id(str(result.inserted_id))
+        # Build the entity from what was written instead of reading it back
+        data['_id'] = result.inserted_id
+        return self._dict_to_entity(data)
+
+    async def get_by_id(self, id: ID, projection: Optional[type[P]] = None) -> Optional[Union[T, P]]:
+        """
+        Get a document by id.
 
-    async def get_by_id(self, id: ID) -> Optional[T]:
+        Pass a partial model as projection to load only its fields and get an instance of it back.
+        """
         if not isinstance(id, str):
             return None
         try:
             collection = self._get_collection()
-            doc = await collection.find_one({'_id': ObjectId(id)})
+            doc = await collection.find_one({'_id': ObjectId(id)}, projection=self._projection(projection))
             if not doc:
                 return None
-            return self._dict_to_entity(doc)
+            return self._dict_to_entity(doc, projection)
         except Exception:
             return None
 
@@ -62,6 +131,15 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
         docs = await cursor.to_list(length=limit)
         return [self._dict_to_entity(doc) for doc in docs]
     
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[type[P]] = None
+    ) -> Page[Union[T, P]]:
+        """Keyset-paginated variant of get_all."""
+        return await self.find_page({}, limit=limit, cursor=cursor, projection=projection)
+
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Alias for get_all for backward compatibility."""
         return await self.get_all(skip=skip, limit=limit)
@@ -95,13 +173,15 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
                 # No changes to make
                 return await self.get_by_id(id)
             
-            result = await collection.update_one(
+            # Apply the update and get the updated document in one round-trip
+            doc = await collection.find_one_and_update(
                 {'_id': ObjectId(id)},
-                update_op
+                update_op,
+                return_document=ReturnDocument.AFTER
             )
-            if result.modified_count == 0 and not unset_fields:
+            if not doc:
                 return None
-            return await self.get_by_id(id)
+            return self._dict_to_entity(doc)
         except Exception:
             return None
 
@@ -115,15 +195,64 @@ class MongoRepository(BaseRepository[T, ID], Generic[T, ID]):
         except Exception:
             return False
 
-    async def find_one(self, filter: dict) -> Optional[T]:
+    async def find_one(self, filter: dict, projection: Optional[type[P]] = None) -> Optional[Union[T, P]]:
         collection = self._get_collection()
-        doc = await collection.find_one(filter)
+        doc = await collection.find_one(filter, projection=self._projection(projection))
         if not doc:
             return None
-        return self._dict_to_entity(doc)
+        return self._dict_to_entity(doc, projection)
 
-    async def find_many(self, filter: dict, skip: int = 0, limit: int = 100) -> List[T]:
+    async def find_many(
+        self,
+        filter: dict,
+        skip: int = 0,
+        limit: int = 100,
+        projection: Optional[type[P]] = None
+    ) -> List[Union[T, P]]:
         collection = self._get_collection()
-        cursor = collection.find(filter).skip(skip).limit(limit)
+        cursor = collection.find(filter, projection=self._projection(projection)).skip(skip).limit(limit)
         docs = await cursor.to_list(length=limit)
-        return [self._dict_to_entity(doc) for doc in docs]
+        return [self._dict_to_entity(doc, projection) for doc in docs]
+
+    async def find_page(
+        self,
+        filter: dict,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Optional[type[P]] = None
+    ) -> Page[Union[T, P]]:
+        """
+        Find documents matching the filter using keyset pagination.
+
+        Results are ordered by _id (ObjectIds are creation-ordered, so this follows
+        insertion time) and resumed with an _id range instead of skip, so every page
+        costs the same index seek regardless of depth.
+
+        Args:
+            filter: MongoDB filter
+            limit: Maximum number of documents per page
+            cursor: Continuation token from a previous page's next_cursor
+            projection: Partial model to load instead of the full entity (optional)
+
+        Returns:
+            Page with items and next_cursor (None when there are no more results)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = filter
+        if cursor:
+            after = {'_id': {'$gt': decode_cursor(cursor)}}
+            query = {'$and': [filter, after]} if filter else after
+        collection = self._get_collection()
+        # Fetch one extra document to learn whether another page exists
+        cursor_obj = collection.find(query, projection=self._projection(projection)).sort('_id', ASCENDING).limit(limit + 1)
+        docs = await cursor_obj.to_list(length=limit + 1)
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1]['_id'])
+        return Page(
+            items=[self._dict_to_entity(doc, projection) for doc in docs],
+            next_cursor=next_cursor
+        )
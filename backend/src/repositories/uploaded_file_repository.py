@@ -1,10 +1,24 @@
-from typing import Optional, List
+from typing import Optional, Dict, List, Set, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel
 from src.models.domain import UploadedFile
-from src.repositories.mongo.mongo_repository import MongoRepository
+from src.repositories.mongo.mongo_repository import MongoRepository, P
+from src.database.pagination import Page
 
 
 class UploadedFileRepository(MongoRepository[UploadedFile, str]):
+    indexes = [
+        IndexModel([('file_key', ASCENDING)], name='file_key'),
+        # Owner listing is keyset-paginated on _id
+        IndexModel([('owner_id', ASCENDING), ('_id', ASCENDING)], name='owner_id__id'),
+        # Cleanup candidate selection
+        IndexModel([('used_for', ASCENDING), ('created_at', ASCENDING)], name='used_for_created_at'),
+        # Cleanup chunking scans candidates in _id order (see get_cleanup_boundaries)
+        IndexModel([('used_for', ASCENDING), ('_id', ASCENDING)], name='used_for__id'),
+        # Reference counting of content-addressed blobs
+        IndexModel([('blob_key', ASCENDING)], name='blob_key', sparse=True),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'uploaded_files', UploadedFile)
     
@@ -20,13 +34,53 @@ class UploadedFileRepository(MongoRepository[UploadedFile, str]):
         """Get all files uploaded by a specific user."""
         return await self.find_many({'owner_id': owner_id}, skip=skip, limit=limit)
 
+    async def get_page_by_owner(
+        self,
+        owner_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page[UploadedFile]:
+        """Get files uploaded by a specific user using keyset pagination."""
+        return await self.find_page({'owner_id': owner_id}, limit=limit, cursor=cursor)
+
     async def delete_by_file_key(self, file_key: str) -> bool:
-        """Delete uploaded file record by file key."""
-        file_record = await self.get_by_file_key(file_key)
-        if not file_record:
-            return False
-        return await self.delete(file_record.id)
+        """Delete uploaded file record by file key in a single query."""
+        collection = self._get_collection()
+        result = await collection.delete_one({'file_key': file_key})
+        return result.deleted_count > 0
+
+    async def delete_many_by_file_keys(self, file_keys: List[str]) -> int:
+        """Delete uploaded file records for all given keys in a single query."""
+        if not file_keys:
+            return 0
+        collection = self._get_collection()
+        result = await collection.delete_many({'file_key': {'$in': list(file_keys)}})
+        return result.deleted_count
+    
+    async def get_blob_keys(self, file_keys: List[str]) -> Dict[str, str]:
+        """Map the given file keys to their content blob keys, for records that have one."""
+        if not file_keys:
+            return {}
+        collection = self._get_collection()
+        cursor = collection.find(
+            {'file_key': {'$in': list(file_keys)}, 'blob_key': {'$ne': None}},
+            projection={'_id': 0, 'file_key': 1, 'blob_key': 1}
+        )
+        return {doc['file_key']: doc['blob_key'] async for doc in cursor}
+    
+    async def find_referenced_blob_keys(self, blob_keys: List[str]) -> Set[str]:
+        """Return the blob keys still referenced by at least one record, in a single query."""
+        if not blob_keys:
+            return set()
+        collection = self._get_collection()
+        return set(await collection.distinct('blob_key', {'blob_key': {'$in': list(blob_keys)}}))
     
-    async def find_many(self, filter: dict, skip: int = 0, limit: int = 100) -> List[UploadedFile]:
+    async def find_many(
+        self,
+        filter: dict,
+        skip: int = 0,
+        limit: int = 100,
+        projection: Optional[type[P]] = None
+    ) -> List[Union[UploadedFile, P]]:
         """Find multiple uploaded files matching the filter."""
-        return await super().find_many(filter, skip=skip, limit=limit)
+        return await super().find_many(filter, skip=skip, limit=limit, projection=projection)
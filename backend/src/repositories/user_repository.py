@@ -1,16 +1,43 @@
-from typing import Optional
+from typing import Optional, List, Set, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
 from src.models.domain import User
-from src.repositories.mongo.mongo_repository import MongoRepository
+from src.repositories.mongo.mongo_repository import MongoRepository, P
 
 
 class UserRepository(MongoRepository[User, str]):
+    indexes = [
+        IndexModel([('email', ASCENDING)], name='email'),
+        IndexModel([('role', ASCENDING)], name='role'),
+        IndexModel([('avatar_file_key', ASCENDING)], name='avatar_file_key'),
+    ]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         super().__init__(db, 'users', User)
 
     async def get_by_email(self, email: str) -> Optional[User]:
         return await self.find_one({'email': email})
+
+    async def find_referenced_avatar_keys(self, file_keys: List[str]) -> Set[str]:
+        """Return the subset of file_keys set as some user's avatar, in one indexed query."""
+        if not file_keys:
+            return set()
+        collection = self._get_collection()
+        keys = await collection.distinct(
+            'avatar_file_key',
+            {'avatar_file_key': {'$in': list(file_keys)}}
+        )
+        return set(keys)
+
+    async def set_avatar_variant_sizes(self, file_key: str, sizes: List[int]) -> int:
+        """Record the generated thumbnail sizes on the users whose avatar is file_key."""
+        collection = self._get_collection()
+        result = await collection.update_many(
+            {'avatar_file_key': file_key},
+            {'$set': {'avatar_variant_sizes': list(sizes)}}
+        )
+        return result.modified_count
     
-    async def find_one(self, filter: dict) -> Optional[User]:
+    async def find_one(self, filter: dict, projection: Optional[type[P]] = None) -> Optional[Union[User, P]]:
         """Find a user matching the filter."""
-        return await super().find_one(filter)
+        return await super().find_one(filter, projection=projection)
@@ -4,7 +4,7 @@ from pydantic import BaseModel, EmailStr
 from src.auth.service import auth_service
 from src.auth.dependencies import get_current_user
 from src.auth.jwt import create_oauth_state_token, verify_oauth_state_token
-from src.models.domain import User
+from src.models.domain import UserIdentity
 from src.logging.logger import get_logger
 from src.exceptions import UnauthorizedException
 from src.config import settings
@@ -96,7 +96,7 @@ async def refresh_token(
 
 @router.get('/auth/me')
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: UserIdentity = Depends(get_current_user)
 ):
     return {
         'id': current_user.id,
@@ -108,7 +108,7 @@ async def get_current_user_info(
 @router.post('/auth/logout')
 async def logout(
     request: Request,
-    current_user: User = Depends(get_current_user)
+    current_user: UserIdentity = Depends(get_current_user)
 ):
     logger.info(
         f'User logged out: {current_user.id}',
@@ -1,12 +1,13 @@
+from email.utils import format_datetime
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Request, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse, FileResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Tuple
 from src.services.file_storage_service import FileStorageService
 from src.services.user_service import UserService
 from src.dependencies import get_file_storage_service, get_user_service
 from src.auth.dependencies import get_current_user
-from src.models.domain import User
+from src.models.domain import UserIdentity
 from src.i18n.translator import get_translator
 from src.exceptions.error_handlers import raise_translated_error
 from src.constants.file_types import is_image_file, get_content_type
@@ -40,7 +41,7 @@ async def get_upload_url(
     prefix: Optional[str] = Query('', description='Optional prefix for file organization'),
     used_for: Optional[str] = Query(None, description='Purpose of the file (e.g., avatar, document)'),
     expires_in: int = Query(3600, description='URL expiration time in seconds (for S3)'),
-    current_user: User = Depends(get_current_user),
+    current_user: UserIdentity = Depends(get_current_user),
     file_storage_service: FileStorageService = Depends(get_file_storage_service)
 ):
     """
@@ -71,6 +72,48 @@ async def get_upload_url(
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_FILE_USAGE = {'avatar', 'document'}
+UNSATISFIABLE_RANGE = (-1, -1)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the file's ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in candidates or etag.removeprefix('W/') in candidates
+
+
+def _parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header into an inclusive (start, end) pair.
+    
+    Returns None when the header should be ignored (malformed or multiple ranges, which
+    are answered with the full file) and UNSATISFIABLE_RANGE when no byte of the range exists.
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            suffix_length = int(last)
+            if suffix_length <= 0:
+                return UNSATISFIABLE_RANGE
+            start = max(size - suffix_length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return UNSATISFIABLE_RANGE
+    if end < start:
+        return None
+    return start, min(end, size - 1)
 
 
 @router.post('/files/upload', response_model=FileUploadResponse)
@@ -79,7 +122,7 @@ async def upload_file(
     file: UploadFile = File(...),
     file_key: Optional[str] = Query(None, description='Pre-generated file key (from upload-url endpoint). If not provided, will be generated from filename.'),
     used_for: Optional[str] = Query(None, description='Purpose of the file (e.g., avatar, document)'),
-    current_user: User = Depends(get_current_user),
+    current_user: UserIdentity = Depends(get_current_user),
     file_storage_service: FileStorageService = Depends(get_file_storage_service)
 ):
     """
@@ -129,9 +172,13 @@ async def upload_file(
             custom_key=file_key,
             owner_id=current_user.id,
             used_for=used_for,
-            max_size=MAX_FILE_SIZE
+            max_size=MAX_FILE_SIZE,
+            expected_size=file.size
         )
         
+        if used_for == 'avatar':
+            await file_storage_service.schedule_image_variants(stored_key)
+        
         file_url = file_storage_service.get_file_url(stored_key)
         extracted_filename = file_storage_service.extract_original_filename(stored_key)
         
@@ -148,7 +195,7 @@ async def upload_file(
 async def upload_avatar(
     request: Request,
     avatar_data: AvatarUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserIdentity = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
     file_storage_service: FileStorageService = Depends(get_file_storage_service)
 ):
@@ -212,7 +259,7 @@ async def upload_avatar(
 @router.delete('/users/me/avatar')
 async def delete_avatar(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: UserIdentity = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service)
 ):
     """
@@ -232,12 +279,16 @@ async def delete_avatar(
 async def get_file(
     request: Request,
     file_key: str,
-    current_user: User = Depends(get_current_user),
+    size: Optional[int] = Query(None, ge=1, description='Serve the thumbnail variant closest to this size (images only)'),
+    current_user: UserIdentity = Depends(get_current_user),
     file_storage_service: FileStorageService = Depends(get_file_storage_service)
 ):
     """
     Retrieve a file by its storage key.
     
+    With size, images are served from their WebP (or JPEG, if the client does not
+    accept WebP) thumbnail variant once it has been generated, else the original.
+    
     Gateway: HTTP endpoint -> Service layer
     """
     translator = get_translator(request)
@@ -257,9 +308,20 @@ async def get_file(
                 detail=translator.t('errors.file.unauthorized') if translator else 'You do not have permission to use this file'
             )
 
-        file_data = await file_storage_service.retrieve_file(file_key)
+        storage_key = file_storage_service.storage_key_for(uploaded_file)
+        file_info = None
+        variant_key = None
+        if size:
+            image_format = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+            variant_key = file_storage_service.variant_key(file_key, size, image_format)
+            if variant_key:
+                file_info = await file_storage_service.get_file_info(variant_key)
+        if file_info is not None:
+            storage_key = variant_key
+        else:
+            file_info = await file_storage_service.get_file_info(storage_key)
         
-        if file_data is None:
+        if file_info is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=translator.t('errors.file.not_found') if translator else 'File not found'
@@ -270,14 +332,54 @@ async def get_file(
         safe_filename = file_storage_service.sanitize_filename_for_header(original_filename)
         
         # Determine content type from file extension
-        content_type = get_content_type(original_filename)
+        content_type = get_content_type(storage_key if storage_key == variant_key else original_filename)
+        
+        headers = {
+            'Content-Disposition': f'inline; filename="{safe_filename}"',
+            'ETag': file_info.etag,
+            'Accept-Ranges': 'bytes',
+            'Cache-Control': 'private, no-cache',
+        }
+        if variant_key:
+            headers['Vary'] = 'Accept'
+        if file_info.last_modified:
+            headers['Last-Modified'] = format_datetime(file_info.last_modified, usegmt=True)
+        
+        if _etag_matches(request.headers.get('If-None-Match'), file_info.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if range_header and (not if_range or if_range == file_info.etag):
+            byte_range = _parse_byte_range(range_header, file_info.size)
+            if byte_range == UNSATISFIABLE_RANGE:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={**headers, 'Content-Range': f'bytes */{file_info.size}'}
+                )
+        
+        if byte_range:
+            start, end = byte_range
+            headers['Content-Range'] = f'bytes {start}-{end}/{file_info.size}'
+            headers['Content-Length'] = str(end - start + 1)
+            return StreamingResponse(
+                file_storage_service.stream_file(storage_key, start=start, end=end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=content_type,
+                headers=headers
+            )
+        
+        # Whole local files go through FileResponse, which uses sendfile when the server supports it
+        local_path = file_storage_service.get_local_file_path(storage_key)
+        if local_path:
+            return FileResponse(local_path, media_type=content_type, headers=headers)
         
-        return Response(
-            content=file_data,
+        headers['Content-Length'] = str(file_info.size)
+        return StreamingResponse(
+            file_storage_service.stream_file(storage_key),
             media_type=content_type,
-            headers={
-                'Content-Disposition': f'inline; filename="{safe_filename}"'
-            }
+            headers=headers
         )
     except ValueError as e:
         raise_translated_error(translator, e)
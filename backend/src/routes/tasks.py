@@ -4,7 +4,7 @@ from src.dependencies import get_task_service
 from src.i18n.translator import get_translator
 from src.exceptions.error_handlers import raise_translated_error
 from src.auth.dependencies import get_current_user
-from src.models.domain import User
+from src.models.domain import UserIdentity
 
 router = APIRouter()
 
@@ -13,7 +13,7 @@ router = APIRouter()
 async def get_task_status(
     request: Request,
     task_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserIdentity = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service)
 ):
     """
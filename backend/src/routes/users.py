@@ -1,9 +1,11 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Request, status, Query, Response
 from src.models.domain import UserResponse, UserCreate, AdminUserCreate
 from src.services.user_service import UserService
 from src.dependencies import get_user_service
 from src.i18n.translator import get_translator
 from src.auth.dependencies import require_roles
+from src.exceptions.error_handlers import raise_translated_error
 
 router = APIRouter()
 
@@ -25,7 +27,6 @@ async def create_user(
         created_user = await user_service.create_user(user_data)
         return user_service.to_response(created_user)
     except ValueError as e:
-        from src.exceptions.error_handlers import raise_translated_error
         raise_translated_error(translator, e)
 
 
@@ -42,19 +43,44 @@ async def create_user_admin(
         created_user = await user_service.create_user_with_role(user_data)
         return user_service.to_response(created_user)
     except ValueError as e:
-        from src.exceptions.error_handlers import raise_translated_error
         raise_translated_error(translator, e)
 
 
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
 @router.get('/users', response_model=list[UserResponse])
 async def list_users(
-    skip: int = Query(0, ge=0),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description='Offset pagination; prefer cursor'),
+    cursor: Optional[str] = Query(None, description=f'Continuation token from the {NEXT_CURSOR_HEADER} header'),
     limit: int = Query(100, ge=1, le=1000),
     current_user=Depends(require_roles('admin')),
     user_service: UserService = Depends(get_user_service)
 ):
-    users = await user_service.list_users(skip=skip, limit=limit)
-    return [user_service.to_response(user) for user in users]
+    """
+    List users.
+
+    Gateway: HTTP endpoint -> Service layer
+
+    Uses keyset pagination: the next page's cursor is returned in the X-Next-Cursor header.
+    The skip parameter is kept for backward compatibility and cannot be combined with cursor.
+    """
+    translator = get_translator(request)
+    if skip and cursor:
+        raise_translated_error(translator, ValueError('errors.pagination.skip_with_cursor'))
+    if skip:
+        users = await user_service.list_users(skip=skip, limit=limit)
+        return [user_service.to_response(user) for user in users]
+
+    try:
+        page = await user_service.list_users_page(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise_translated_error(translator, e)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return [user_service.to_response(user) for user in page.items]
 
 
 @router.delete('/users/{user_id}', status_code=status.HTTP_204_NO_CONTENT)
@@ -71,7 +97,6 @@ async def delete_user(
             raise ValueError('errors.user.not_found')
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except ValueError as e:
-        from src.exceptions.error_handlers import raise_translated_error
         error_key = str(e)
         if error_key == 'errors.user.cannot_delete_self':
             raise_translated_error(translator, e, status_code=status.HTTP_403_FORBIDDEN)
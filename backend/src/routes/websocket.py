@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from src.auth.dependencies import load_user_identity
 from src.auth.service import auth_service
 from src.repositories import get_user_repository
 from src.repositories.user_repository import UserRepository
@@ -24,7 +25,7 @@ async def websocket_endpoint(
     if not user_id:
         await websocket.close(code=4401)
         return
-    user = await repo.get_by_id(user_id)
+    user = await load_user_identity(user_id, repo)
     if not user:
         await websocket.close(code=4401)
         return
@@ -33,6 +34,7 @@ async def websocket_endpoint(
     try:
         while True:
             await websocket.receive_text()
+            connection_manager.touch(websocket)
     except WebSocketDisconnect:
         pass
     except Exception:
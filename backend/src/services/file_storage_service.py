@@ -1,10 +1,76 @@
+import asyncio
+import hashlib
 import uuid
-from typing import Optional
+from typing import AsyncIterator, Optional, Dict, List, Sequence, Union
 from pathlib import Path
+from urllib.parse import quote
 from src.services.base import BaseService
-from src.storage.base import FileStorage
+from src.storage.base import FileStorage, FileInfo, DEFAULT_STREAM_CHUNK_SIZE
 from src.repositories.uploaded_file_repository import UploadedFileRepository
 from src.models.domain import UploadedFile
+from src.constants.file_types import is_image_file
+from src.services.image_variants import IMAGE_VARIANT_FORMATS, render_image_variants
+from src.tasks.queue import enqueue_async
+
+DEFAULT_DELETE_CONCURRENCY = 16
+MIN_UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Adaptive chunking aims for about this many reads per upload
+TARGET_UPLOAD_CHUNKS = 16
+# Publishing from a request gives up quickly while the broker is down (kombu retry policy)
+VARIANT_PUBLISH_RETRY_POLICY = {'max_retries': 1, 'interval_start': 0, 'interval_step': 0.5, 'interval_max': 0.5}
+# Storage key prefixes used in content-addressed mode
+BLOB_KEY_PREFIX = 'blobs'
+STAGING_KEY_PREFIX = 'staging'
+
+
+def choose_upload_chunk_size(
+    expected_size: Optional[int],
+    min_chunk_size: int = MIN_UPLOAD_CHUNK_SIZE,
+    max_chunk_size: int = MAX_UPLOAD_CHUNK_SIZE
+) -> int:
+    """
+    Pick the read size for an upload from its declared size.
+    
+    Aims for TARGET_UPLOAD_CHUNKS reads, rounded up to a power of two and clamped
+    to [min_chunk_size, max_chunk_size]. Unknown sizes use min_chunk_size.
+    """
+    if not expected_size or expected_size <= 0:
+        return min_chunk_size
+    target = -(-expected_size // TARGET_UPLOAD_CHUNKS)
+    return max(min_chunk_size, min(max_chunk_size, 1 << (target - 1).bit_length()))
+
+
+async def _iter_upload_chunks(file_stream, chunk_size: int) -> AsyncIterator[Union[bytes, memoryview]]:
+    """
+    Read an upload in chunks of up to chunk_size bytes.
+    
+    Streams backed by a file object (FastAPI UploadFile) are read with readinto() into
+    one preallocated buffer, so the yielded memoryviews are only valid until the next
+    chunk is requested. Other streams fall back to read().
+    
+    Reads run in a worker thread, except for uploads whose declared size (the public
+    UploadFile.size) fits in a single chunk: one small read costs less than the hop.
+    """
+    raw = getattr(file_stream, 'file', None)
+    if raw is None or not hasattr(raw, 'readinto'):
+        while True:
+            chunk = await file_stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    
+    buffer = memoryview(bytearray(chunk_size))
+    size = getattr(file_stream, 'size', None)
+    read_inline = size is not None and size <= chunk_size
+    while True:
+        if read_inline:
+            read = raw.readinto(buffer)
+        else:
+            read = await asyncio.to_thread(raw.readinto, buffer)
+        if not read:
+            return
+        yield buffer[:read]
 
 
 class FileStorageService(BaseService):
@@ -13,11 +79,19 @@ class FileStorageService(BaseService):
     def __init__(
         self,
         file_storage: FileStorage,
-        uploaded_file_repository: Optional[UploadedFileRepository] = None
+        uploaded_file_repository: Optional[UploadedFileRepository] = None,
+        min_upload_chunk_size: int = MIN_UPLOAD_CHUNK_SIZE,
+        max_upload_chunk_size: int = MAX_UPLOAD_CHUNK_SIZE,
+        content_addressed: bool = False,
+        image_variant_sizes: Sequence[int] = ()
     ):
         super().__init__()
         self.file_storage = file_storage
         self.uploaded_file_repository = uploaded_file_repository
+        self.min_upload_chunk_size = min_upload_chunk_size
+        self.max_upload_chunk_size = max_upload_chunk_size
+        self.content_addressed = content_addressed
+        self.image_variant_sizes = sorted(set(image_variant_sizes))
     
     def generate_key(self, prefix: str = '', original_filename: Optional[str] = None) -> str:
         """
@@ -42,13 +116,13 @@ class FileStorageService(BaseService):
             key = file_uuid
         
         return key
-
+    
     def prepare_upload_key(self, original_filename: str, custom_key: Optional[str], prefix: str = '') -> tuple[str, str]:
         if custom_key:
             sanitized_key = self._validate_and_sanitize_key(custom_key)
             filename = self.extract_original_filename(sanitized_key)
             return sanitized_key, filename
-
+        
         generated_key = self.generate_key(prefix=prefix, original_filename=original_filename)
         filename = self.extract_original_filename(generated_key)
         return generated_key, filename
@@ -131,7 +205,8 @@ class FileStorageService(BaseService):
         custom_key: Optional[str] = None,
         owner_id: Optional[str] = None,
         used_for: Optional[str] = None,
-        max_size: Optional[int] = None
+        max_size: Optional[int] = None,
+        expected_size: Optional[int] = None
     ) -> tuple[str, int]:
         """
         Store a file from a stream and return its storage key and size.
@@ -142,8 +217,11 @@ class FileStorageService(BaseService):
         - Content type is preserved if provided
         - Custom key is validated and sanitized if provided (exactly 2 parts, no nesting)
         - File size is tracked during streaming
+        - Read size adapts to expected_size (declared upload size), within the configured bounds
         - UploadedFile record is created if repository is available and owner_id is provided
         - UUID ensures uniqueness - no overwrites possible
+        - In content-addressed mode the content is stored once per SHA-256 digest and
+          the record references it through blob_key (see _store_blob)
         """
         # Use custom key if provided, otherwise generate one
         if custom_key:
@@ -152,36 +230,52 @@ class FileStorageService(BaseService):
         else:
             key = self.generate_key(original_filename=original_filename)
         
+        # Blobs are reference-counted through UploadedFile records, so both are required
+        content_addressed = bool(self.content_addressed and self.uploaded_file_repository and owner_id)
+        hasher = hashlib.sha256() if content_addressed else None
+        
         # Track file size during streaming
         file_size = 0
         
+        chunk_size = choose_upload_chunk_size(
+            expected_size,
+            self.min_upload_chunk_size,
+            self.max_upload_chunk_size
+        )
+        
         # Create a wrapper to track size and validate during stream
-        # FastAPI UploadFile uses .read() method, not async iteration
+        # FastAPI UploadFile is read via its underlying file, not async iteration
         async def size_tracking_stream():
             nonlocal file_size
-            chunk_size = 8192  # 8KB chunks
-            while True:
-                chunk = await file_stream.read(chunk_size)
-                if not chunk:
-                    break
+            async for chunk in _iter_upload_chunks(file_stream, chunk_size):
                 file_size += len(chunk)
                 if max_size and file_size > max_size:
                     raise ValueError(f'errors.file.size_exceeds:{max_size}')
+                if hasher:
+                    hasher.update(chunk)
                 yield chunk
         
-        # Store the file from stream with size tracking
-        try:
-            stored_key = await self.file_storage.store_stream(key, size_tracking_stream(), content_type)
-        except Exception as e:
+        staging_key = None
+        blob_key = None
+        if content_addressed:
+            # Hash first; content is only written (to a staging key) when the upload cannot be re-read
+            staging_key = await self._hash_upload(file_stream, size_tracking_stream(), content_type)
+            blob_key = f'{BLOB_KEY_PREFIX}/{hasher.hexdigest()}'
+            stored_key = key
+        else:
+            # Store the file from stream with size tracking
             try:
-                await self.file_storage.delete(key)
-            except Exception as delete_error:
-                self._log_warning(
-                    f'Failed to delete file after stream error: {key}',
-                    error=delete_error,
-                    owner_id=owner_id
-                )
-            raise
+                stored_key = await self.file_storage.store_stream(key, size_tracking_stream(), content_type)
+            except Exception as e:
+                try:
+                    await self.file_storage.delete(key)
+                except Exception as delete_error:
+                    self._log_warning(
+                        f'Failed to delete file after stream error: {key}',
+                        error=delete_error,
+                        owner_id=owner_id
+                    )
+                raise
         
         # Create UploadedFile record if repository is available and owner_id is provided
         if self.uploaded_file_repository and owner_id:
@@ -193,16 +287,19 @@ class FileStorageService(BaseService):
                     original_filename=original_name,
                     content_type=content_type,
                     file_size=file_size,
-                    used_for=used_for
+                    used_for=used_for,
+                    blob_key=blob_key
                     # created_at will be set automatically by repository
                 )
                 await self.uploaded_file_repository.create(uploaded_file)
             except Exception as e:
+                orphan_key = staging_key if content_addressed else stored_key
                 try:
-                    await self.file_storage.delete(stored_key)
+                    if orphan_key:
+                        await self.file_storage.delete(orphan_key)
                 except Exception as delete_error:
                     self._log_warning(
-                        f'Failed to delete file after record creation error: {stored_key}',
+                        f'Failed to delete file after record creation error: {orphan_key}',
                         error=delete_error,
                         owner_id=owner_id
                     )
@@ -213,15 +310,97 @@ class FileStorageService(BaseService):
                 )
                 raise ValueError('errors.file.record_create_failed') from e
         
+        if content_addressed:
+            await self._store_blob(stored_key, blob_key, staging_key, file_stream, chunk_size, content_type)
+        
         self._log_info(
             f'File stored from stream: {stored_key}',
             key=stored_key,
             content_type=content_type,
-            file_size=file_size
+            file_size=file_size,
+            blob_key=blob_key
         )
         
         return stored_key, file_size
     
+    async def _hash_upload(self, file_stream, chunks: AsyncIterator, content_type: Optional[str]) -> Optional[str]:
+        """
+        Consume an upload through the hashing stream.
+        
+        UploadFile spools the whole request body before the route runs, so it is only
+        read and rewound; nothing is written. Streams that cannot be rewound are written
+        to a staging key while they are hashed, and that key is returned.
+        """
+        raw = getattr(file_stream, 'file', None)
+        if raw is not None and hasattr(raw, 'seekable') and raw.seekable():
+            async for _ in chunks:
+                pass
+            raw.seek(0)
+            return None
+        
+        staging_key = f'{STAGING_KEY_PREFIX}/{uuid.uuid4()}'
+        try:
+            await self.file_storage.store_stream(staging_key, chunks, content_type)
+        except Exception:
+            try:
+                await self.file_storage.delete(staging_key)
+            except Exception as delete_error:
+                self._log_warning(
+                    f'Failed to delete staged file after stream error: {staging_key}',
+                    error=delete_error
+                )
+            raise
+        return staging_key
+    
+    async def _store_blob(
+        self,
+        file_key: str,
+        blob_key: str,
+        staging_key: Optional[str],
+        file_stream,
+        chunk_size: int,
+        content_type: Optional[str]
+    ) -> None:
+        """
+        Make sure the blob referenced by a freshly created record exists.
+        
+        The record is created before this check, so a concurrent release of the blob
+        either sees the record and keeps (or restores) the blob, or has moved it away
+        before the check and it is written again (see _release_blobs). New content
+        is written to a staging key and moved into place, so a failed write never
+        leaves a partial blob behind. On failure the record is removed again.
+        """
+        try:
+            if await self.file_storage.exists(blob_key):
+                if staging_key:
+                    await self.file_storage.delete(staging_key)
+                self._log_info(
+                    f'Upload deduplicated: {file_key}',
+                    key=file_key,
+                    blob_key=blob_key
+                )
+                return
+            if staging_key is None:
+                staging_key = f'{STAGING_KEY_PREFIX}/{uuid.uuid4()}'
+                await self.file_storage.store_stream(
+                    staging_key,
+                    _iter_upload_chunks(file_stream, chunk_size),
+                    content_type
+                )
+            await self.file_storage.move(staging_key, blob_key)
+        except Exception:
+            try:
+                await self.uploaded_file_repository.delete_by_file_key(file_key)
+                if staging_key:
+                    await self.file_storage.delete(staging_key)
+            except Exception as cleanup_error:
+                self._log_warning(
+                    f'Failed to clean up after blob store error: {file_key}',
+                    error=cleanup_error,
+                    blob_key=blob_key
+                )
+            raise
+    
     async def retrieve_file(self, key: str) -> Optional[bytes]:
         """
         Retrieve a file by its storage key.
@@ -233,9 +412,65 @@ class FileStorageService(BaseService):
         if not key:
             raise ValueError('errors.file.storage_key_required')
         
-        file_data = await self.file_storage.retrieve(key)
+        file_data = await self.file_storage.retrieve(await self.resolve_storage_key(key))
         return file_data
     
+    async def resolve_storage_key(self, key: str) -> str:
+        """
+        Get the key the content of a file is stored under.
+        
+        Business rules:
+        - Files stored in content-addressed mode resolve to their blob key
+        - Any other key is returned unchanged
+        """
+        if not self.content_addressed or not self.uploaded_file_repository:
+            return key
+        
+        blob_keys = await self.uploaded_file_repository.get_blob_keys([key])
+        return blob_keys.get(key, key)
+    
+    def storage_key_for(self, uploaded_file: UploadedFile) -> str:
+        """Get the key the content of a recorded file is stored under, without a lookup."""
+        return uploaded_file.blob_key or uploaded_file.file_key
+    
+    async def get_file_info(self, key: str) -> Optional[FileInfo]:
+        """
+        Get size and ETag of a file without reading its content.
+        
+        Business rules:
+        - Key must be provided
+        - Returns None if file not found
+        """
+        if not key:
+            raise ValueError('errors.file.storage_key_required')
+        
+        return await self.file_storage.stat(key)
+    
+    def stream_file(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file, or the inclusive byte range [start, end] of it, in constant memory.
+        
+        Business rules:
+        - Key must be provided
+        """
+        if not key:
+            raise ValueError('errors.file.storage_key_required')
+        
+        return self.file_storage.iter_range(key, start=start, end=end, chunk_size=chunk_size)
+    
+    def get_local_file_path(self, key: str) -> Optional[Path]:
+        """Get the filesystem path of a file when storage is local, for zero-copy responses."""
+        if not key:
+            raise ValueError('errors.file.storage_key_required')
+        
+        return self.file_storage.get_local_path(key)
+    
     async def delete_file(self, key: str) -> bool:
         """
         Delete a file by its storage key.
@@ -244,23 +479,30 @@ class FileStorageService(BaseService):
         - Key must be provided
         - Returns True if deleted, False if not found
         - UploadedFile record is deleted if repository is available
+        - A content-addressed blob is deleted with its last referencing record
         """
         if not key:
             raise ValueError('errors.file.storage_key_required')
         
-        deleted = await self.file_storage.delete(key)
-        
-        # Delete UploadedFile record if repository is available
-        if deleted and self.uploaded_file_repository:
-            try:
-                await self.uploaded_file_repository.delete_by_file_key(key)
-            except Exception as e:
-                self._log_warning(
-                    f'Failed to delete UploadedFile record: {key}',
-                    error=e
-                )
+        blob_key = await self.resolve_storage_key(key)
+        if blob_key != key:
+            deleted = await self.uploaded_file_repository.delete_by_file_key(key)
+            await self._release_blobs([blob_key])
+        else:
+            deleted = await self.file_storage.delete(key)
+            
+            # Delete UploadedFile record if repository is available
+            if deleted and self.uploaded_file_repository:
+                try:
+                    await self.uploaded_file_repository.delete_by_file_key(key)
+                except Exception as e:
+                    self._log_warning(
+                        f'Failed to delete UploadedFile record: {key}',
+                        error=e
+                    )
         
         if deleted:
+            await self._delete_variants([key])
             self._log_info(
                 f'File deleted: {key}',
                 key=key
@@ -268,6 +510,152 @@ class FileStorageService(BaseService):
         
         return deleted
     
+    async def _delete_variants(self, keys: List[str], concurrency: int = DEFAULT_DELETE_CONCURRENCY) -> None:
+        """Delete the image variants of deleted files; missing variants are ignored."""
+        variant_keys = [variant_key for key in keys for variant_key in self._variant_keys(key)]
+        if not variant_keys:
+            return
+        try:
+            await self.file_storage.delete_many(variant_keys, concurrency)
+        except Exception as e:
+            self._log_warning(
+                f'Failed to delete image variants of {len(keys)} files',
+                error=e
+            )
+    
+    async def _release_blobs(self, blob_keys: List[str], concurrency: int = DEFAULT_DELETE_CONCURRENCY) -> None:
+        """
+        Delete the given content-addressed blobs that no UploadedFile record references anymore.
+        
+        The reference count of a blob is the number of records carrying its blob_key,
+        so callers delete records first and then release their blobs. An upload of
+        the same content may create a record after the count: unreferenced blobs are
+        first moved to a staging key, then counted again, and the ones referenced by
+        then are moved back. An upload counted after that finds the blob missing
+        (its record is created before its existence check) and writes it again.
+        """
+        blob_keys = list(set(blob_keys))
+        try:
+            referenced = await self.uploaded_file_repository.find_referenced_blob_keys(blob_keys)
+        except Exception as e:
+            self._log_warning(
+                f'Failed to count references of {len(blob_keys)} blobs',
+                error=e
+            )
+            return
+        
+        unreferenced = [blob_key for blob_key in blob_keys if blob_key not in referenced]
+        if not unreferenced:
+            return
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        parked: Dict[str, str] = {}
+        
+        async def park(blob_key: str) -> None:
+            staging_key = f'{STAGING_KEY_PREFIX}/{uuid.uuid4()}'
+            async with semaphore:
+                try:
+                    await self.file_storage.move(blob_key, staging_key)
+                except Exception as e:
+                    self._log_warning(
+                        f'Failed to release blob: {blob_key}',
+                        error=e,
+                        blob_key=blob_key
+                    )
+                    return
+            parked[blob_key] = staging_key
+        
+        await asyncio.gather(*(park(blob_key) for blob_key in unreferenced))
+        if not parked:
+            return
+        
+        try:
+            rereferenced = await self.uploaded_file_repository.find_referenced_blob_keys(list(parked))
+        except Exception as e:
+            self._log_warning(
+                f'Failed to recount references of {len(parked)} blobs; restoring them',
+                error=e
+            )
+            rereferenced = set(parked)
+        
+        async def restore(blob_key: str) -> None:
+            async with semaphore:
+                try:
+                    await self.file_storage.move(parked[blob_key], blob_key)
+                except Exception as e:
+                    self._log_error(
+                        f'Failed to restore re-referenced blob: {blob_key}',
+                        error=e,
+                        blob_key=blob_key,
+                        staging_key=parked[blob_key]
+                    )
+        
+        await asyncio.gather(*(restore(blob_key) for blob_key in rereferenced))
+        released = [staging_key for blob_key, staging_key in parked.items() if blob_key not in rereferenced]
+        if released:
+            await self.file_storage.delete_many(released, concurrency)
+    
+    async def delete_files(
+        self,
+        keys: List[str],
+        concurrency: int = DEFAULT_DELETE_CONCURRENCY,
+        blob_keys: Optional[Dict[str, str]] = None
+    ) -> Dict[str, bool]:
+        """
+        Delete many files by their storage keys.
+        
+        Business rules:
+        - Storage deletes run concurrently, at most `concurrency` at a time
+          (batched by storages with a bulk delete API)
+        - A failing delete is reported as not deleted and does not stop the others
+        - UploadedFile records of deleted files are removed in a single query
+        - Content-addressed files drop their record; a blob is deleted once no record
+          references it. Callers that already know the blob keys pass them as
+          blob_keys (file key -> blob key) to skip the lookup
+        
+        Returns:
+            Mapping of key to whether it was deleted from storage
+        """
+        if not keys:
+            return {}
+        
+        if blob_keys is None and self.content_addressed and self.uploaded_file_repository:
+            blob_keys = await self.uploaded_file_repository.get_blob_keys(keys)
+        blob_keys = {key: blob_keys[key] for key in keys if blob_keys and blob_keys.get(key)}
+        
+        plain_keys = [key for key in keys if key not in blob_keys]
+        outcome = await self.file_storage.delete_many(plain_keys, concurrency) if plain_keys else {}
+        deleted_keys = [key for key, deleted in outcome.items() if deleted] + list(blob_keys)
+        records_deleted = True
+        
+        if deleted_keys and self.uploaded_file_repository:
+            try:
+                await self.uploaded_file_repository.delete_many_by_file_keys(deleted_keys)
+            except Exception as e:
+                records_deleted = False
+                self._log_warning(
+                    f'Failed to delete UploadedFile records for {len(deleted_keys)} files',
+                    error=e
+                )
+        
+        if blob_keys:
+            # A content-addressed file is gone once its record is; its blob may still be shared
+            outcome.update(dict.fromkeys(blob_keys, records_deleted))
+            if records_deleted:
+                await self._release_blobs(list(blob_keys.values()), concurrency)
+            else:
+                deleted_keys = [key for key in deleted_keys if key not in blob_keys]
+        
+        await self._delete_variants(deleted_keys, concurrency)
+        
+        self._log_info(
+            f'Files deleted: {len(deleted_keys)} of {len(keys)}',
+            requested=len(keys),
+            deleted=len(deleted_keys)
+        )
+        
+        return outcome
+    
     async def file_exists(self, key: str) -> bool:
         """
         Check if a file exists.
@@ -278,20 +666,167 @@ class FileStorageService(BaseService):
         if not key:
             raise ValueError('errors.file.storage_key_required')
         
-        return await self.file_storage.exists(key)
+        return await self.file_storage.exists(await self.resolve_storage_key(key))
     
-    def get_file_url(self, key: str) -> str:
+    def get_file_url(
+        self,
+        key: str,
+        size: Optional[int] = None,
+        variant_sizes: Sequence[int] = (),
+        storage_key: Optional[str] = None
+    ) -> str:
         """
         Get URL or path to access a file.
         
         Business rules:
         - Key must be provided
+        - With size, images resolve to their WebP variant (see variant_key) among
+          variant_sizes, the sizes known to have been generated; without a known
+          variant the original is used, so the URL never points at a missing object
+        - storage_key is the key the content is stored under (see resolve_storage_key);
+          when given, the storage URL of that object is returned
+        - In content-addressed mode without a storage_key the key does not name a
+          storage object, so the authenticated download endpoint (which resolves
+          the blob) is returned
         """
         if not key:
             raise ValueError('errors.file.storage_key_required')
         
+        # Variants are stored under their own key in both modes
+        variant_key = self.variant_key(key, size, sizes=variant_sizes) if size else None
+        if variant_key:
+            return self.file_storage.get_url(variant_key)
+        if storage_key:
+            return self.file_storage.get_url(storage_key)
+        if self.content_addressed:
+            return f'/api/files/{quote(key)}'
+        
         return self.file_storage.get_url(key)
     
+    def variant_key(
+        self,
+        key: str,
+        size: int,
+        image_format: str = 'webp',
+        sizes: Optional[Sequence[int]] = None
+    ) -> Optional[str]:
+        """
+        Get the storage key of the image variant best suited for a display size.
+        
+        Business rules:
+        - Only images have variants, and only when variant sizes are configured
+        - Candidates are the configured sizes, or the given sizes among them
+        - The smallest candidate not below the requested size is used
+          (the largest if none is big enough)
+        - Variants are stored next to the original: <key>.<size>.<format>
+        """
+        if image_format not in IMAGE_VARIANT_FORMATS or not is_image_file(key):
+            return None
+        
+        candidates = self.image_variant_sizes if sizes is None else sorted(
+            set(sizes).intersection(self.image_variant_sizes)
+        )
+        if not candidates:
+            return None
+        
+        chosen = next((s for s in candidates if s >= size), candidates[-1])
+        return f'{key}.{chosen}.{image_format}'
+    
+    async def stored_variant_sizes(self, key: str) -> List[int]:
+        """Configured variant sizes whose WebP variant of the image exists in storage."""
+        sizes = []
+        for size in self.image_variant_sizes:
+            variant_key = self.variant_key(key, size, sizes=[size])
+            if variant_key and await self.file_storage.exists(variant_key):
+                sizes.append(size)
+        return sizes
+    
+    def _variant_keys(self, key: str) -> List[str]:
+        """All variant keys an image may have."""
+        if not self.image_variant_sizes or not is_image_file(key):
+            return []
+        return [
+            f'{key}.{size}.{image_format}'
+            for size in self.image_variant_sizes
+            for image_format in IMAGE_VARIANT_FORMATS
+        ]
+    
+    async def schedule_image_variants(self, key: str) -> bool:
+        """
+        Queue generation of an image's size variants.
+        
+        Business rules:
+        - Only images are processed, and only when variant sizes are configured
+        - Publishing runs off the event loop with a short retry policy
+        - Best effort: the file is already stored, so a broker failure is logged
+          and the original keeps being served
+        
+        Returns:
+            True if a task was queued
+        """
+        if not self._variant_keys(key):
+            return False
+        
+        try:
+            await enqueue_async(
+                'generate_image_variants',
+                key,
+                publish_options={'retry_policy': VARIANT_PUBLISH_RETRY_POLICY}
+            )
+        except Exception as e:
+            self._log_warning(
+                f'Failed to queue image variants: {key}',
+                error=e,
+                key=key
+            )
+            return False
+        return True
+    
+    async def generate_image_variants(self, key: str) -> List[str]:
+        """
+        Render and store the size variants of an image.
+        
+        Business rules:
+        - Key must be provided
+        - Non-images and missing files produce no variants
+        - Images whose variants all exist already are not rendered again, so a
+          repeated task (e.g. queued by both the upload and set_avatar) is cheap
+        - Rendering runs in a worker thread
+        
+        Returns:
+            Keys of the stored variants
+        """
+        if not key:
+            raise ValueError('errors.file.storage_key_required')
+        
+        variant_keys = self._variant_keys(key)
+        if not variant_keys:
+            return []
+        
+        if all([await self.file_storage.exists(variant_key) for variant_key in variant_keys]):
+            self._log_info(f'Image variants already stored: {key}', key=key)
+            return variant_keys
+        
+        file_data = await self.retrieve_file(key)
+        if file_data is None:
+            return []
+        
+        variants = await asyncio.to_thread(render_image_variants, file_data, self.image_variant_sizes)
+        stored_keys = []
+        for (size, image_format), variant_data in variants.items():
+            variant_key = f'{key}.{size}.{image_format}'
+            await self.file_storage.store(variant_key, variant_data, IMAGE_VARIANT_FORMATS[image_format][1])
+            stored_keys.append(variant_key)
+        
+        self._log_info(
+            f'Image variants stored: {key}',
+            key=key,
+            variants=len(stored_keys),
+            source_size=len(file_data)
+        )
+        
+        return stored_keys
+    
     def _validate_and_sanitize_key(self, key: str) -> str:
         """
         Validate and sanitize a custom file key.
@@ -340,7 +875,7 @@ class FileStorageService(BaseService):
             return parts[-1]
         else:
             return key
-
+    
     def sanitize_filename_for_header(self, filename: str) -> str:
         if not filename:
             raise ValueError('errors.file.filename_required')
@@ -375,11 +910,11 @@ class FileStorageService(BaseService):
         )
         
         # Local storage returns regular API endpoint (POST method)
-        # S3 would return presigned URL (PUT method) - handled by storage implementation
+        # S3 returns presigned URL (PUT method) - handled by storage implementation
         result = {
             'file_key': file_key,
             'upload_url': upload_url,
-            'method': 'POST'
+            'method': self.file_storage.presigned_upload_method
         }
         
         return result
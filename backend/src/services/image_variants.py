@@ -0,0 +1,57 @@
+"""
+Rendering of fixed-size image derivatives (avatar thumbnails).
+"""
+import io
+from typing import Dict, Iterable, Tuple
+
+from PIL import Image, ImageOps
+
+# Variant format name -> (Pillow format, content type)
+IMAGE_VARIANT_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+}
+DEFAULT_VARIANT_QUALITY = 80
+
+
+def render_image_variants(
+    data: bytes,
+    sizes: Iterable[int],
+    quality: int = DEFAULT_VARIANT_QUALITY
+) -> Dict[Tuple[int, str], bytes]:
+    """
+    Render square size x size variants of an image in every IMAGE_VARIANT_FORMATS format.
+
+    The image is EXIF-rotated and center-cropped to a square. JPEG sources are decoded
+    at a reduced scale when the largest variant allows it, which keeps large photos cheap.
+
+    Args:
+        data: Encoded source image
+        sizes: Edge lengths in pixels
+        quality: Encoder quality for lossy formats
+
+    Returns:
+        Mapping of (size, format name) to encoded bytes
+
+    Raises:
+        PIL.UnidentifiedImageError: if data is not a supported image
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    if not sizes:
+        return {}
+
+    with Image.open(io.BytesIO(data)) as source:
+        source.draft('RGB', (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    variants = {}
+    for size in sizes:
+        # Each size is derived from the previous (larger) one to avoid resampling the source again
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for name, (pillow_format, _) in IMAGE_VARIANT_FORMATS.items():
+            encoded = image.convert('RGB') if pillow_format == 'JPEG' and image.mode != 'RGB' else image
+            buffer = io.BytesIO()
+            encoded.save(buffer, format=pillow_format, quality=quality, optimize=pillow_format == 'JPEG')
+            variants[(size, name)] = buffer.getvalue()
+    return variants
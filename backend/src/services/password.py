@@ -1,4 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 import bcrypt
+from prometheus_client import Counter, Gauge
+
+from src.config import settings
+from src.exceptions import ServiceUnavailableException
+
+R = TypeVar('R')
+
+password_hash_pending = Gauge(
+    'password_hash_pending',
+    'Password hash/verify calls queued or running on the password pool'
+)
+
+password_hash_rejected_total = Counter(
+    'password_hash_rejected_total',
+    'Password hash/verify calls rejected because the password pool was full',
+    ['operation']
+)
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +30,56 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism. At most
+    max_pending calls may be queued or running; further calls are rejected with
+    ServiceUnavailableException instead of piling up behind a login storm.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password')
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, operation: str, func: Callable[..., R], *args) -> R:
+        if self._pending >= self.max_pending:
+            password_hash_rejected_total.labels(operation=operation).inc()
+            raise ServiceUnavailableException()
+        self._pending += 1
+        password_hash_pending.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            password_hash_pending.dec()
+
+    async def hash(self, password: str) -> str:
+        return await self._run('hash', hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run('verify', verify_password, password, hashed)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await password_hasher.verify(password, hashed)
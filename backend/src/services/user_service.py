@@ -1,11 +1,15 @@
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 from src.services.base import BaseService
+from src.auth.user_cache import UserCache
 from src.config import settings
 from src.services.file_storage_service import FileStorageService
 from src.repositories.user_repository import UserRepository
-from src.models.domain import User, UserCreate, UserResponse, AdminUserCreate
-from src.services.password import hash_password
+from src.models.domain import User, UserCreate, UserResponse, AdminUserCreate, UserSummary
+from src.database.pagination import Page
+from src.services.password import hash_password_async
+
+AVATAR_DISPLAY_SIZE = 256  # Edge length avatars are rendered at by the clients
 
 
 class UserService(BaseService):
@@ -14,11 +18,18 @@ class UserService(BaseService):
     def __init__(
         self,
         user_repository: UserRepository,
-        file_storage_service: Optional[FileStorageService] = None
+        file_storage_service: Optional[FileStorageService] = None,
+        user_cache: Optional[UserCache] = None
     ):
         super().__init__()
         self.user_repository = user_repository
         self.file_storage_service = file_storage_service
+        self.user_cache = user_cache
+    
+    async def _invalidate_cached_user(self, user_id: str) -> None:
+        """Drop a changed user from the authenticated-user cache."""
+        if self.user_cache:
+            await self.user_cache.invalidate(user_id)
     
     async def create_user(self, user_data: UserCreate) -> User:
         """
@@ -35,7 +46,7 @@ class UserService(BaseService):
             raise ValueError('errors.user.email_exists')
         
         # Hash password
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         
         # Create user entity
         user = User(
@@ -62,7 +73,7 @@ class UserService(BaseService):
         if existing_user:
             raise ValueError('errors.user.email_exists')
 
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
 
         user = User(
             email=user_data.email,
@@ -94,6 +105,7 @@ class UserService(BaseService):
             updated_user = await self.user_repository.update(existing_user.id, existing_user)
             if updated_user is None:
                 raise ValueError('errors.user.not_found')
+            await self._invalidate_cached_user(updated_user.id)
             self._log_info(
                 f'User promoted to admin: {updated_user.id}',
                 user_id=updated_user.id,
@@ -135,9 +147,20 @@ class UserService(BaseService):
             raise ValueError('errors.user.not_found')
         return user
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        users = await self.user_repository.get_all(skip=skip, limit=limit)
+    async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserSummary]:
+        users = await self.user_repository.find_many({}, skip=skip, limit=limit, projection=UserSummary)
         return users
+
+    async def list_users_page(self, limit: int = 100, cursor: Optional[str] = None) -> Page[UserSummary]:
+        """
+        List users using keyset pagination.
+
+        Business rules:
+        - Pages are ordered by creation
+        - Cursor must come from a previous page's next_cursor
+        - Credentials are not loaded
+        """
+        return await self.user_repository.get_page(limit=limit, cursor=cursor, projection=UserSummary)
     
     async def update_user(self, user_id: str, user_data: dict) -> User:
         """
@@ -162,9 +185,10 @@ class UserService(BaseService):
         
         # Update password if provided
         if 'password' in user_data:
-            user.hashed_password = hash_password(user_data['password'])
+            user.hashed_password = await hash_password_async(user_data['password'])
         
         updated_user = await self.user_repository.update(user_id, user)
+        await self._invalidate_cached_user(user_id)
         
         self._log_info(
             f'User updated: {updated_user.id}',
@@ -185,6 +209,7 @@ class UserService(BaseService):
         deleted = await self.user_repository.delete(user_id)
         
         if deleted:
+            await self._invalidate_cached_user(user_id)
             self._log_info(
                 f'User deleted: {user_id}',
                 user_id=user_id
@@ -206,6 +231,8 @@ class UserService(BaseService):
         - File must exist in storage
         - Old avatar is deleted if exists
         - User's avatar_file_key is updated
+        - Thumbnail variants are queued unless the upload already produced them;
+          the sizes that exist are recorded on the user (see to_response)
         """
         user = await self.get_user_or_raise(user_id)
         
@@ -229,7 +256,20 @@ class UserService(BaseService):
         
         # Update user
         user.avatar_file_key = file_key
+        user.avatar_variant_sizes = []
+        # Resolved once here so avatar URLs point at the stored object without a lookup per response
+        storage_key = await self.file_storage_service.resolve_storage_key(file_key)
+        user.avatar_storage_key = storage_key if storage_key != file_key else None
         updated_user = await self.user_repository.update(user_id, user)
+        await self._invalidate_cached_user(user_id)
+        
+        # Checked after the update: a variants task finishing from here on records its sizes itself
+        variant_sizes = await self.file_storage_service.stored_variant_sizes(file_key)
+        if variant_sizes:
+            await self.user_repository.set_avatar_variant_sizes(file_key, variant_sizes)
+            updated_user.avatar_variant_sizes = variant_sizes
+        else:
+            await self.file_storage_service.schedule_image_variants(file_key)
         
         self._log_info(
             f'Avatar set for user: {user_id}',
@@ -265,10 +305,13 @@ class UserService(BaseService):
         
         # Clear avatar key
         user.avatar_file_key = None
+        user.avatar_variant_sizes = []
+        user.avatar_storage_key = None
         updated_user = await self.user_repository.update(user_id, user)
         
         if updated_user is None:
             raise ValueError('errors.user.not_found')
+        await self._invalidate_cached_user(user_id)
         
         self._log_info(
             f'Avatar deleted for user: {user_id}',
@@ -277,11 +320,16 @@ class UserService(BaseService):
         
         return updated_user
     
-    def to_response(self, user: User) -> UserResponse:
+    def to_response(self, user: Union[User, UserSummary]) -> UserResponse:
         """Convert User domain model to UserResponse DTO."""
         avatar_url = None
         if user.avatar_file_key and self.file_storage_service:
-            avatar_url = self.file_storage_service.get_file_url(user.avatar_file_key)
+            avatar_url = self.file_storage_service.get_file_url(
+                user.avatar_file_key,
+                size=AVATAR_DISPLAY_SIZE,
+                variant_sizes=user.avatar_variant_sizes,
+                storage_key=user.avatar_storage_key
+            )
         
         return UserResponse(
             id=user.id,
@@ -1,10 +1,28 @@
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """Metadata needed to serve a stored file without reading it."""
+    size: int
+    etag: str
+    last_modified: Optional[datetime] = None
 
 
 class FileStorage(ABC):
     """Abstract base class for file storage implementations."""
     
+    # HTTP method clients use with generate_presigned_upload_url
+    presigned_upload_method = 'POST'
+    
     @abstractmethod
     async def store(self, key: str, file_data: bytes, content_type: Optional[str] = None) -> str:
         """
@@ -25,6 +43,9 @@ class FileStorage(ABC):
         """
         Store a file from a stream with the given key.
         
+        Chunks may be memoryviews over a buffer the producer reuses; write or copy
+        each chunk before requesting the next one.
+        
         Args:
             key: Unique identifier for the file
             file_stream: File content as an async iterator or file-like object
@@ -48,6 +69,63 @@ class FileStorage(ABC):
         """
         pass
     
+    async def stat(self, key: str) -> Optional[FileInfo]:
+        """
+        Get size and validator of a file.
+        
+        The default implementation reads the whole file; implementations should
+        override it with a metadata-only lookup.
+        
+        Args:
+            key: Unique identifier for the file
+        
+        Returns:
+            FileInfo, or None if not found
+        """
+        file_data = await self.retrieve(key)
+        if file_data is None:
+            return None
+        return FileInfo(size=len(file_data), etag=f'"{hashlib.md5(file_data).hexdigest()}"')
+    
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file, or the inclusive byte range [start, end] of it, in chunks.
+        
+        The default implementation reads the whole file; implementations should
+        override it to read only the requested range.
+        
+        Args:
+            key: Unique identifier for the file
+            start: First byte to return
+            end: Last byte to return (inclusive, default: end of file)
+            chunk_size: Maximum size of each yielded chunk
+        
+        Yields:
+            File content chunks
+        """
+        file_data = await self.retrieve(key) or b''
+        stop = len(file_data) if end is None else end + 1
+        for offset in range(start, stop, chunk_size):
+            yield file_data[offset:min(offset + chunk_size, stop)]
+    
+    def get_local_path(self, key: str) -> Optional[Path]:
+        """
+        Get the filesystem path of a file, for zero-copy responses.
+        
+        Args:
+            key: Unique identifier for the file
+        
+        Returns:
+            Path for storages backed by the local filesystem, None otherwise
+        """
+        return None
+    
     @abstractmethod
     async def delete(self, key: str) -> bool:
         """
@@ -61,6 +139,54 @@ class FileStorage(ABC):
         """
         pass
     
+    async def move(self, source_key: str, target_key: str) -> str:
+        """
+        Move a file to another key, replacing any file already stored there.
+        
+        The default implementation copies the content through memory; implementations
+        should override it with a rename or server-side copy.
+        
+        Args:
+            source_key: Current key of the file
+            target_key: New key of the file
+        
+        Returns:
+            The target key
+        """
+        file_data = await self.retrieve(source_key)
+        if file_data is None:
+            raise FileNotFoundError(source_key)
+        await self.store(target_key, file_data)
+        await self.delete(source_key)
+        return target_key
+    
+    async def delete_many(self, keys: List[str], concurrency: int = 10) -> Dict[str, bool]:
+        """
+        Delete many files by their keys.
+        
+        The default implementation runs delete() for each key, at most
+        `concurrency` at a time; implementations with a bulk delete API should
+        override it. A failing delete is reported as not deleted.
+        
+        Args:
+            keys: Unique identifiers of the files
+            concurrency: Maximum number of deletes in flight
+        
+        Returns:
+            Mapping of key to whether it was deleted
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def delete_one(key: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.delete(key)
+                except Exception:
+                    return False
+        
+        results = await asyncio.gather(*(delete_one(key) for key in keys))
+        return dict(zip(keys, results))
+    
     @abstractmethod
     async def exists(self, key: str) -> bool:
         """
@@ -0,0 +1,379 @@
+import asyncio
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from src.config import settings
+from src.storage.base import FileStorage, FileInfo, DEFAULT_STREAM_CHUNK_SIZE
+from src.storage.local_file_store import get_io_executor
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+file_cache_lookups_total = Counter(
+    'file_cache_lookups_total',
+    'File blob cache lookups by tier',
+    ['tier', 'result']
+)
+
+file_cache_served_bytes_total = Counter(
+    'file_cache_served_bytes_total',
+    'File bytes served through CachedFileStore by source (memory, disk or backend)',
+    ['source']
+)
+
+file_cache_size_bytes = Gauge(
+    'file_cache_size_bytes',
+    'Bytes currently held by a file blob cache tier',
+    ['tier']
+)
+
+CacheEntry = Tuple[bytes, FileInfo]
+
+
+class MemoryBlobCache:
+    """
+    In-memory LRU of small file blobs, bounded by total bytes.
+    
+    Files larger than max_entry_size are never cached. Entries expire after
+    ttl_seconds, which bounds staleness of deletes made by other processes.
+    """
+    
+    def __init__(self, max_bytes: int, max_entry_size: int, ttl_seconds: float = 300) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_size = min(max_entry_size, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[float, bytes, FileInfo]] = OrderedDict()
+    
+    def accepts(self, size: int) -> bool:
+        return size <= self.max_entry_size
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self.evict(key)
+            file_cache_lookups_total.labels(tier='memory', result='miss').inc()
+            return None
+        self._entries.move_to_end(key)
+        file_cache_lookups_total.labels(tier='memory', result='hit').inc()
+        return entry[1], entry[2]
+    
+    def contains(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+    
+    def put(self, key: str, data: bytes, info: FileInfo) -> None:
+        if not self.accepts(len(data)):
+            return
+        self.evict(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, data, info)
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+        file_cache_size_bytes.labels(tier='memory').set(self.size)
+    
+    def evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+            file_cache_size_bytes.labels(tier='memory').set(self.size)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+        file_cache_size_bytes.labels(tier='memory').set(0)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # A unique temp name per write, so concurrent fills of the same key never share one
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _unlink(Path(tmp_path))
+        raise
+
+
+def _read_cached(path: Path) -> Optional[bytes]:
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class DiskBlobCache:
+    """
+    Local-disk LRU of file blobs, meant as a second tier in front of a remote backend.
+    
+    Each process keeps its own directory (path/<pid>), created empty and removed on
+    exit, so the in-memory index is always authoritative. Files are written
+    atomically and read on the shared I/O thread pool.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        max_entry_size: int,
+        ttl_seconds: float = 300
+    ) -> None:
+        self.path = Path(path) / str(os.getpid())
+        self.max_bytes = max_bytes
+        self.max_entry_size = min(max_entry_size, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[float, int, FileInfo]] = OrderedDict()
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path.mkdir(parents=True, exist_ok=True)
+        atexit.register(shutil.rmtree, self.path, True)
+    
+    def accepts(self, size: int) -> bool:
+        return size <= self.max_entry_size
+    
+    def _file_path(self, key: str) -> Path:
+        return self.path / hashlib.sha256(key.encode()).hexdigest()
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_io_executor(), func, *args)
+    
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        data = None
+        if entry is not None and entry[0] > time.monotonic():
+            data = await self._run(_read_cached, self._file_path(key))
+        # A concurrent put or evict may have dropped or replaced the entry during the read
+        current = self._entries.get(key) is entry
+        if data is None or not current:
+            if entry is not None and current:
+                await self.evict(key)
+            file_cache_lookups_total.labels(tier='disk', result='miss').inc()
+            return None
+        self._entries.move_to_end(key)
+        file_cache_lookups_total.labels(tier='disk', result='hit').inc()
+        return data, entry[2]
+    
+    async def put(self, key: str, data: bytes, info: FileInfo) -> None:
+        if not self.accepts(len(data)):
+            return
+        try:
+            await self._run(_write_atomic, self._file_path(key), data)
+        except OSError:
+            logger.warning(
+                f'Failed to write file cache entry: {key}',
+                extra={'key': key},
+                exc_info=True
+            )
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, len(data), info)
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            evicted_key, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+            await self._run(_unlink, self._file_path(evicted_key))
+        file_cache_size_bytes.labels(tier='disk').set(self.size)
+    
+    async def evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+            file_cache_size_bytes.labels(tier='disk').set(self.size)
+            await self._run(_unlink, self._file_path(key))
+
+
+_memory_cache: Optional[MemoryBlobCache] = None
+_disk_cache: Optional[DiskBlobCache] = None
+
+
+def get_memory_cache() -> Optional[MemoryBlobCache]:
+    """Process-wide memory tier (stores are created per request), or None when disabled."""
+    global _memory_cache
+    if _memory_cache is None and settings.file_cache_memory_max_bytes > 0:
+        _memory_cache = MemoryBlobCache(
+            max_bytes=settings.file_cache_memory_max_bytes,
+            max_entry_size=settings.file_cache_max_entry_size,
+            ttl_seconds=settings.file_cache_ttl_seconds
+        )
+    return _memory_cache
+
+
+def get_disk_cache() -> Optional[DiskBlobCache]:
+    """Process-wide disk tier, or None when FILE_CACHE_DISK_PATH is not set."""
+    global _disk_cache
+    if _disk_cache is None and settings.file_cache_disk_path and settings.file_cache_disk_max_bytes > 0:
+        _disk_cache = DiskBlobCache(
+            path=settings.file_cache_disk_path,
+            max_bytes=settings.file_cache_disk_max_bytes,
+            max_entry_size=settings.file_cache_disk_max_entry_size,
+            ttl_seconds=settings.file_cache_ttl_seconds
+        )
+    return _disk_cache
+
+
+class CachedFileStore(FileStorage):
+    """
+    Read-through cache in front of any FileStorage.
+    
+    Reads are served from the memory tier, then the optional disk tier, then the
+    backend; a backend read of a small enough file fills both tiers. Writes,
+    moves and deletes evict the affected keys first.
+    """
+    
+    def __init__(
+        self,
+        backend: FileStorage,
+        memory_cache: Optional[MemoryBlobCache] = None,
+        disk_cache: Optional[DiskBlobCache] = None
+    ):
+        self.backend = backend
+        self.memory_cache = memory_cache
+        self.disk_cache = disk_cache
+        self.presigned_upload_method = backend.presigned_upload_method
+    
+    async def _invalidate(self, key: str) -> None:
+        if self.memory_cache:
+            self.memory_cache.evict(key)
+        if self.disk_cache:
+            await self.disk_cache.evict(key)
+    
+    def _accepts(self, size: int) -> bool:
+        return bool(
+            (self.memory_cache and self.memory_cache.accepts(size))
+            or (self.disk_cache and self.disk_cache.accepts(size))
+        )
+    
+    async def _cached(self, key: str) -> Tuple[Optional[CacheEntry], str]:
+        """Find a file in the cache tiers only, promoting disk hits to memory."""
+        if self.memory_cache:
+            entry = self.memory_cache.get(key)
+            if entry is not None:
+                return entry, 'memory'
+        if self.disk_cache:
+            entry = await self.disk_cache.get(key)
+            if entry is not None:
+                if self.memory_cache:
+                    self.memory_cache.put(key, *entry)
+                return entry, 'disk'
+        return None, 'backend'
+    
+    async def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[FileInfo], str]:
+        """
+        Find a file in the cache tiers, loading it from the backend on a miss.
+        
+        Returns the content (None if missing or too large to cache), its FileInfo
+        (None if missing) and where it came from.
+        """
+        entry, source = await self._cached(key)
+        if entry is not None:
+            return entry[0], entry[1], source
+        
+        info = await self.backend.stat(key)
+        if info is None or not self._accepts(info.size):
+            return None, info, 'backend'
+        data = await self.backend.retrieve(key)
+        if data is None:
+            return None, None, 'backend'
+        if self.memory_cache:
+            self.memory_cache.put(key, data, info)
+        if self.disk_cache:
+            await self.disk_cache.put(key, data, info)
+        return data, info, 'backend'
+    
+    async def store(self, key: str, file_data: bytes, content_type: Optional[str] = None) -> str:
+        await self._invalidate(key)
+        return await self.backend.store(key, file_data, content_type)
+    
+    async def store_stream(self, key: str, file_stream, content_type: Optional[str] = None) -> str:
+        await self._invalidate(key)
+        return await self.backend.store_stream(key, file_stream, content_type)
+    
+    async def move(self, source_key: str, target_key: str) -> str:
+        await self._invalidate(source_key)
+        await self._invalidate(target_key)
+        return await self.backend.move(source_key, target_key)
+    
+    async def retrieve(self, key: str) -> Optional[bytes]:
+        data, info, source = await self._lookup(key)
+        if data is None and info is not None:
+            data = await self.backend.retrieve(key)
+        if data is not None:
+            file_cache_served_bytes_total.labels(source=source).inc(len(data))
+        return data
+    
+    async def stat(self, key: str) -> Optional[FileInfo]:
+        # Metadata-only callers (HEAD, 304 revalidation) must not pull the body;
+        # the cache is filled by the body read, if one follows
+        entry, _ = await self._cached(key)
+        if entry is not None:
+            return entry[1]
+        return await self.backend.stat(key)
+    
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        data, _, source = await self._lookup(key)
+        if data is None:
+            async for chunk in self.backend.iter_range(key, start, end, chunk_size):
+                file_cache_served_bytes_total.labels(source='backend').inc(len(chunk))
+                yield chunk
+            return
+        
+        stop = len(data) if end is None else min(end + 1, len(data))
+        for offset in range(start, stop, chunk_size):
+            chunk = data[offset:min(offset + chunk_size, stop)]
+            file_cache_served_bytes_total.labels(source=source).inc(len(chunk))
+            yield chunk
+    
+    def get_local_path(self, key: str) -> Optional[Path]:
+        # Files held in memory are streamed from there rather than re-read from disk
+        if self.memory_cache and self.memory_cache.contains(key):
+            return None
+        return self.backend.get_local_path(key)
+    
+    async def delete(self, key: str) -> bool:
+        await self._invalidate(key)
+        return await self.backend.delete(key)
+    
+    async def delete_many(self, keys: List[str], concurrency: int = 10) -> Dict[str, bool]:
+        for key in keys:
+            await self._invalidate(key)
+        return await self.backend.delete_many(keys, concurrency)
+    
+    async def exists(self, key: str) -> bool:
+        if self.memory_cache and self.memory_cache.contains(key):
+            return True
+        return await self.backend.exists(key)
+    
+    def get_url(self, key: str) -> str:
+        return self.backend.get_url(key)
+    
+    def generate_presigned_upload_url(self, key: str, content_type: str, expires_in: int = 3600) -> str:
+        return self.backend.generate_presigned_upload_url(key, content_type, expires_in)
@@ -1,17 +1,84 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Callable, Optional, TypeVar
 from urllib.parse import quote
-from src.storage.base import FileStorage
+from src.config import settings
+from src.storage.base import FileStorage, FileInfo, DEFAULT_STREAM_CHUNK_SIZE
 from src.logging.logger import get_logger
 
+R = TypeVar('R')
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    Shared thread pool for local filesystem calls.
+    
+    Its size (FILE_STORAGE_IO_WORKERS) caps concurrent disk operations per process;
+    a store is created per request, so the limit lives here rather than on the instance.
+    """
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=settings.file_storage_io_workers,
+            thread_name_prefix='file-io'
+        )
+    return _io_executor
+
+
+def _write_file(file_path: Path, file_data: bytes) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, 'wb') as f:
+        f.write(file_data)
+
+
+def _open_for_write(file_path: Path):
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    return open(file_path, 'wb')
+
+
+def _open_at(file_path: Path, offset: int):
+    f = open(file_path, 'rb')
+    if offset:
+        f.seek(offset)
+    return f
+
+
+def _move_file(source_path: Path, target_path: Path) -> None:
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source_path, target_path)
+
+
+def _read_file(file_path: Path) -> Optional[bytes]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
 
 class LocalFileStore(FileStorage):
-    """Local file storage implementation using mounted volumes."""
+    """
+    Local file storage implementation using mounted volumes.
     
-    def __init__(self, base_path: str = 'storage/uploads'):
+    Every filesystem call runs on a bounded thread pool so disk latency
+    never blocks the event loop.
+    """
+    
+    def __init__(self, base_path: str = 'storage/uploads', executor: Optional[ThreadPoolExecutor] = None):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.logger = get_logger(self.__class__.__name__)
+        self._executor = executor
+    
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        """Run a blocking filesystem call on the I/O thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor or get_io_executor(), func, *args)
     
     def _get_file_path(self, key: str) -> Path:
         """Get the full file path for a given key."""
@@ -40,12 +107,8 @@ class LocalFileStore(FileStorage):
         """
         file_path = self._get_file_path(key)
         
-        # Create parent directories if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
+        # Create parent directories if needed and write file
+        await self._run(_write_file, file_path, file_data)
         
         self.logger.info(
             f'File stored: {key}',
@@ -69,13 +132,15 @@ class LocalFileStore(FileStorage):
         file_path = self._get_file_path(key)
         
         # Create parent directories if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        f = await self._run(_open_for_write, file_path)
         
         # Write file from stream
         # FastAPI UploadFile supports async iteration
-        with open(file_path, 'wb') as f:
+        try:
             async for chunk in file_stream:
-                f.write(chunk)
+                await self._run(f.write, chunk)
+        finally:
+            await self._run(f.close)
         
         self.logger.info(
             f'File stored from stream: {key}',
@@ -96,20 +161,86 @@ class LocalFileStore(FileStorage):
         """
         file_path = self._get_file_path(key)
         
-        if not file_path.exists():
-            return None
-        
         try:
-            with open(file_path, 'rb') as f:
-                return f.read()
-        except Exception as e:
+            return await self._run(_read_file, file_path)
+        except Exception:
             self.logger.error(
                 f'Error retrieving file: {key}',
-                error=e,
-                extra={'key': key}
+                extra={'key': key},
+                exc_info=True
             )
             return None
     
+    async def stat(self, key: str) -> Optional[FileInfo]:
+        """
+        Get size and validator of a file from the filesystem metadata.
+        
+        Args:
+            key: Unique identifier for the file
+        
+        Returns:
+            FileInfo, or None if not found
+        """
+        try:
+            stat_result = await self._run(os.stat, self._get_file_path(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return FileInfo(
+            size=stat_result.st_size,
+            etag=f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"',
+            last_modified=datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+        )
+    
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a byte range of a file from local storage without loading it into memory.
+        
+        Args:
+            key: Unique identifier for the file
+            start: First byte to return
+            end: Last byte to return (inclusive, default: end of file)
+            chunk_size: Maximum size of each yielded chunk
+        
+        Yields:
+            File content chunks
+        """
+        f = await self._run(_open_at, self._get_file_path(key), start)
+        try:
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = await self._run(f.read, chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self._run(f.close)
+    
+    def get_local_path(self, key: str) -> Optional[Path]:
+        """Get the filesystem path of a file for zero-copy responses."""
+        return self._get_file_path(key)
+    
+    async def move(self, source_key: str, target_key: str) -> str:
+        """
+        Move a file to another key with an atomic rename (no data is copied).
+        
+        Args:
+            source_key: Current key of the file
+            target_key: New key of the file
+        
+        Returns:
+            The target key
+        """
+        await self._run(_move_file, self._get_file_path(source_key), self._get_file_path(target_key))
+        return target_key
+    
     async def delete(self, key: str) -> bool:
         """
         Delete a file from local storage.
@@ -122,16 +253,15 @@ class LocalFileStore(FileStorage):
         """
         file_path = self._get_file_path(key)
         
-        if not file_path.exists():
-            return False
-        
         try:
-            file_path.unlink()
+            await self._run(file_path.unlink)
             self.logger.info(
                 f'File deleted: {key}',
                 extra={'key': key}
             )
             return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             self.logger.error(
                 f'Error deleting file: {key}',
@@ -151,7 +281,7 @@ class LocalFileStore(FileStorage):
             True if file exists, False otherwise
         """
         file_path = self._get_file_path(key)
-        return file_path.exists()
+        return await self._run(file_path.exists)
     
     def get_url(self, key: str) -> str:
         """
@@ -1,18 +1,120 @@
-from typing import Optional
-from src.storage.base import FileStorage
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from src.config import settings
+from src.storage.base import FileStorage, FileInfo, DEFAULT_STREAM_CHUNK_SIZE
 from src.logging.logger import get_logger
 
+R = TypeVar('R')
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+# DeleteObjects accepts at most 1000 keys per request
+MAX_DELETE_BATCH_SIZE = 1000
+
+NOT_FOUND_CODES = frozenset({'404', 'NoSuchKey', 'NotFound'})
+
+_clients: Dict[Tuple[str, Optional[str], int], Any] = {}
+_clients_lock = threading.Lock()
+_s3_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_s3_client(region: str, endpoint_url: Optional[str] = None, max_pool_connections: int = 32):
+    """
+    Shared S3 client for the given region/endpoint.
+    
+    A store is created per request, so the client (and its HTTP connection pool)
+    is cached here and reused; boto3 clients are safe to share between threads.
+    An empty endpoint_url (S3_ENDPOINT_URL= in the env file) means the AWS default.
+    """
+    endpoint_url = endpoint_url or None
+    cache_key = (region, endpoint_url, max_pool_connections)
+    with _clients_lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            client = boto3.session.Session().client(
+                's3',
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=Config(
+                    max_pool_connections=max_pool_connections,
+                    retries={'mode': 'standard'}
+                )
+            )
+            _clients[cache_key] = client
+        return client
+
+
+def get_s3_executor() -> ThreadPoolExecutor:
+    """
+    Shared thread pool for blocking S3 calls.
+    
+    Sized like the client connection pool (S3_MAX_POOL_CONNECTIONS) so that every
+    running call has a pooled connection available.
+    """
+    global _s3_executor
+    if _s3_executor is None:
+        _s3_executor = ThreadPoolExecutor(
+            max_workers=settings.s3_max_pool_connections,
+            thread_name_prefix='s3'
+        )
+    return _s3_executor
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response.get('Error', {}).get('Code') in NOT_FOUND_CODES
+
 
 class S3FileStore(FileStorage):
-    """S3 file storage implementation (skeleton for future implementation)."""
+    """
+    S3 file storage implementation.
     
-    def __init__(self, bucket_name: str, region: str = 'us-east-1'):
+    boto3 calls run on a bounded thread pool over a shared, pooled client.
+    Streams larger than one part are uploaded with multipart upload, sending up to
+    upload_concurrency parts at once, so memory stays at about
+    (upload_concurrency + 1) * part_size per upload whatever the file size.
+    """
+    
+    presigned_upload_method = 'PUT'
+    
+    def __init__(
+        self,
+        bucket_name: str,
+        region: str = 'us-east-1',
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 32,
+        part_size: int = 8 * 1024 * 1024,
+        upload_concurrency: int = 4,
+        url_expires_in: int = 3600,
+        client=None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
         self.bucket_name = bucket_name
         self.region = region
+        self.endpoint_url = endpoint_url or None
+        self.part_size = max(part_size, MIN_MULTIPART_PART_SIZE)
+        self.upload_concurrency = max(1, upload_concurrency)
+        self.url_expires_in = url_expires_in
         self.logger = get_logger(self.__class__.__name__)
-        # TODO: Initialize boto3 S3 client when implementing
-        # import boto3
-        # self.s3_client = boto3.client('s3', region_name=region)
+        self.s3_client = client or get_s3_client(region, self.endpoint_url, max_pool_connections)
+        self._executor = executor
+    
+    async def _run(self, func: Callable[..., R], *args, **kwargs) -> R:
+        """Run a blocking boto3 call on the S3 thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor or get_s3_executor(),
+            lambda: func(*args, **kwargs)
+        )
+    
+    def _content_args(self, content_type: Optional[str]) -> Dict[str, str]:
+        return {'ContentType': content_type} if content_type else {}
     
     async def store(self, key: str, file_data: bytes, content_type: Optional[str] = None) -> str:
         """
@@ -26,25 +128,29 @@ class S3FileStore(FileStorage):
         Returns:
             The S3 key where the file was stored
         """
-        # TODO: Implement S3 upload
-        # self.s3_client.put_object(
-        #     Bucket=self.bucket_name,
-        #     Key=key,
-        #     Body=file_data,
-        #     ContentType=content_type
-        # )
+        await self._run(
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=file_data,
+            **self._content_args(content_type)
+        )
         
         self.logger.info(
             f'File stored in S3: {key}',
             extra={'key': key, 'bucket': self.bucket_name}
         )
         
-        raise NotImplementedError('S3 storage not yet implemented')
+        return key
     
     async def store_stream(self, key: str, file_stream, content_type: Optional[str] = None) -> str:
         """
         Store a file from a stream in S3.
         
+        Streams that fit in one part are sent with a single PUT. Larger streams use
+        multipart upload with parts uploaded concurrently; the upload is aborted if
+        anything fails so no orphaned parts are left behind.
+        
         Args:
             key: Unique identifier for the file
             file_stream: File content as an async iterator or file-like object
@@ -53,10 +159,100 @@ class S3FileStore(FileStorage):
         Returns:
             The S3 key where the file was stored
         """
-        # TODO: Implement S3 streaming upload
-        # For now, collect stream into bytes and use regular store
-        # In production, use boto3 multipart upload for large files
-        raise NotImplementedError('S3 streaming storage not yet implemented')
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        uploads: List[asyncio.Task] = []
+        slots = asyncio.Semaphore(self.upload_concurrency)
+        
+        async def upload_part(part_number: int, body: bytes) -> Dict[str, Any]:
+            try:
+                response = await self._run(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body
+                )
+                return {'PartNumber': part_number, 'ETag': response['ETag']}
+            finally:
+                slots.release()
+        
+        async def start_part(body: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                response = await self._run(
+                    self.s3_client.create_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    **self._content_args(content_type)
+                )
+                upload_id = response['UploadId']
+            await slots.acquire()
+            uploads.append(asyncio.create_task(upload_part(len(uploads) + 1, body)))
+        
+        try:
+            async for chunk in file_stream:
+                # Chunks may be views over a reused buffer, so they are copied here
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    part = bytes(buffer[:self.part_size])
+                    del buffer[:self.part_size]
+                    await start_part(part)
+            
+            if upload_id is None:
+                await self.store(key, bytes(buffer), content_type)
+                return key
+            
+            if buffer:
+                await start_part(bytes(buffer))
+            parts = await asyncio.gather(*uploads)
+            await self._run(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException:
+            for task in uploads:
+                task.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+            if upload_id is not None:
+                await self._abort_multipart_upload(key, upload_id)
+            raise
+        
+        self.logger.info(
+            f'File stored in S3 from stream: {key}',
+            extra={'key': key, 'bucket': self.bucket_name, 'parts': len(uploads)}
+        )
+        
+        return key
+    
+    async def _abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        try:
+            await self._run(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id
+            )
+        except Exception:
+            self.logger.warning(
+                f'Failed to abort multipart upload: {key}',
+                extra={'key': key, 'upload_id': upload_id},
+                exc_info=True
+            )
+    
+    def _get_object_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+        with response['Body'] as body:
+            return body.read()
     
     async def retrieve(self, key: str) -> Optional[bytes]:
         """
@@ -68,33 +264,169 @@ class S3FileStore(FileStorage):
         Returns:
             File content as bytes, or None if not found
         """
-        # TODO: Implement S3 download
-        # try:
-        #     response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
-        #     return response['Body'].read()
-        # except self.s3_client.exceptions.NoSuchKey:
-        #     return None
+        try:
+            return await self._run(self._get_object_bytes, key)
+        except Exception:
+            self.logger.error(
+                f'Error retrieving file from S3: {key}',
+                extra={'key': key, 'bucket': self.bucket_name},
+                exc_info=True
+            )
+            return None
+    
+    async def stat(self, key: str) -> Optional[FileInfo]:
+        """
+        Get size and validator of a file with a HEAD request.
+        
+        Args:
+            key: Unique identifier for the file
+        
+        Returns:
+            FileInfo, or None if not found
+        """
+        try:
+            response = await self._run(self.s3_client.head_object, Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return FileInfo(
+            size=response['ContentLength'],
+            etag=response['ETag'],
+            last_modified=response.get('LastModified')
+        )
+    
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a byte range of an S3 object without loading it into memory.
+        
+        Args:
+            key: Unique identifier for the file
+            start: First byte to return
+            end: Last byte to return (inclusive, default: end of file)
+            chunk_size: Maximum size of each yielded chunk
         
-        raise NotImplementedError('S3 storage not yet implemented')
+        Yields:
+            File content chunks
+        """
+        byte_range = f'bytes={start}-' if end is None else f'bytes={start}-{end}'
+        response = await self._run(
+            self.s3_client.get_object,
+            Bucket=self.bucket_name,
+            Key=key,
+            Range=byte_range
+        )
+        body = response['Body']
+        try:
+            while True:
+                chunk = await self._run(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await self._run(body.close)
+    
+    async def move(self, source_key: str, target_key: str) -> str:
+        """
+        Move an object to another key with a server-side copy (objects up to 5 GB).
+        
+        Args:
+            source_key: Current key of the file
+            target_key: New key of the file
+        
+        Returns:
+            The target key
+        """
+        await self._run(
+            self.s3_client.copy_object,
+            Bucket=self.bucket_name,
+            Key=target_key,
+            CopySource={'Bucket': self.bucket_name, 'Key': source_key}
+        )
+        await self._run(self.s3_client.delete_object, Bucket=self.bucket_name, Key=source_key)
+        return target_key
     
     async def delete(self, key: str) -> bool:
         """
         Delete a file from S3.
         
+        S3 does not report whether the key existed, so any successful delete
+        returns True.
+        
         Args:
             key: Unique identifier for the file
         
         Returns:
-            True if deleted, False if not found
+            True if deleted, False on error
+        """
+        try:
+            await self._run(self.s3_client.delete_object, Bucket=self.bucket_name, Key=key)
+        except Exception:
+            self.logger.error(
+                f'Error deleting file from S3: {key}',
+                extra={'key': key, 'bucket': self.bucket_name},
+                exc_info=True
+            )
+            return False
+        
+        self.logger.info(
+            f'File deleted from S3: {key}',
+            extra={'key': key, 'bucket': self.bucket_name}
+        )
+        return True
+    
+    async def delete_many(self, keys: List[str], concurrency: int = 10) -> Dict[str, bool]:
+        """
+        Delete many files with batched DeleteObjects requests (up to 1000 keys each).
+        
+        Args:
+            keys: Unique identifiers of the files
+            concurrency: Maximum number of DeleteObjects requests in flight
+        
+        Returns:
+            Mapping of key to whether it was deleted
         """
-        # TODO: Implement S3 delete
-        # try:
-        #     self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
-        #     return True
-        # except Exception:
-        #     return False
+        if not keys:
+            return {}
         
-        raise NotImplementedError('S3 storage not yet implemented')
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def delete_batch(batch: List[str]) -> Dict[str, bool]:
+            async with semaphore:
+                try:
+                    response = await self._run(
+                        self.s3_client.delete_objects,
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                    )
+                except Exception:
+                    self.logger.error(
+                        f'Error deleting {len(batch)} files from S3',
+                        extra={'bucket': self.bucket_name, 'count': len(batch)},
+                        exc_info=True
+                    )
+                    return dict.fromkeys(batch, False)
+            outcome = dict.fromkeys(batch, True)
+            for error in response.get('Errors', []):
+                outcome[error['Key']] = False
+            return outcome
+        
+        batches = [keys[i:i + MAX_DELETE_BATCH_SIZE] for i in range(0, len(keys), MAX_DELETE_BATCH_SIZE)]
+        results: Dict[str, bool] = {}
+        for outcome in await asyncio.gather(*(delete_batch(batch) for batch in batches)):
+            results.update(outcome)
+        
+        self.logger.info(
+            f'Files deleted from S3: {sum(results.values())} of {len(keys)}',
+            extra={'bucket': self.bucket_name, 'requests': len(batches)}
+        )
+        return results
     
     async def exists(self, key: str) -> bool:
         """
@@ -106,18 +438,11 @@ class S3FileStore(FileStorage):
         Returns:
             True if file exists, False otherwise
         """
-        # TODO: Implement S3 head_object check
-        # try:
-        #     self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
-        #     return True
-        # except self.s3_client.exceptions.ClientError:
-        #     return False
-        
-        raise NotImplementedError('S3 storage not yet implemented')
+        return await self.stat(key) is not None
     
     def get_url(self, key: str) -> str:
         """
-        Get a presigned URL or public URL for the file.
+        Get a presigned GET URL for the file.
         
         Args:
             key: Unique identifier for the file
@@ -125,14 +450,11 @@ class S3FileStore(FileStorage):
         Returns:
             URL to access the file
         """
-        # TODO: Generate presigned URL or public URL
-        # return self.s3_client.generate_presigned_url(
-        #     'get_object',
-        #     Params={'Bucket': self.bucket_name, 'Key': key},
-        #     ExpiresIn=3600
-        # )
-        
-        return f'https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{key}'
+        return self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket_name, 'Key': key},
+            ExpiresIn=self.url_expires_in
+        )
     
     def generate_presigned_upload_url(self, key: str, content_type: str, expires_in: int = 3600) -> str:
         """
@@ -146,15 +468,12 @@ class S3FileStore(FileStorage):
         Returns:
             Presigned PUT URL for S3 upload
         """
-        # TODO: Implement S3 presigned URL generation
-        # return self.s3_client.generate_presigned_url(
-        #     'put_object',
-        #     Params={
-        #         'Bucket': self.bucket_name,
-        #         'Key': key,
-        #         'ContentType': content_type
-        #     },
-        #     ExpiresIn=expires_in
-        # )
-        
-        raise NotImplementedError('S3 presigned URL generation not yet implemented')
+        return self.s3_client.generate_presigned_url(
+            'put_object',
+            Params={
+                'Bucket': self.bucket_name,
+                'Key': key,
+                'ContentType': content_type
+            },
+            ExpiresIn=expires_in
+        )
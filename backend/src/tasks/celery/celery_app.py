@@ -4,7 +4,7 @@ from celery.signals import setup_logging
 from celery.schedules import crontab
 from src.config import settings
 from src.logging.logger import configure_root_logger
-from src.tasks.celery import metrics_server
+from src.tasks.celery import metrics_server, runtime
 
 celery_app = Celery(
     'bedrock_worker',
@@ -23,7 +23,7 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,
     worker_hijack_root_logger=False,
     worker_redirect_stdouts=False,
-    imports=('src.tasks.file_cleanup.task', 'src.tasks.file_cleanup.pagination', 'src.tasks.ensure_admin', 'src.tasks.startup'),
+    imports=('src.tasks.file_cleanup.task', 'src.tasks.file_cleanup.pagination', 'src.tasks.ensure_admin', 'src.tasks.ensure_indexes', 'src.tasks.image_variants', 'src.tasks.startup'),
     autodiscover_tasks=['src.tasks'],
     beat_schedule={
         'cleanup-unused-files': {
@@ -0,0 +1,142 @@
+import os
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Optional
+import aio_pika
+from celery.signals import worker_process_init, worker_process_shutdown
+from src.auth.user_cache import user_cache
+from src.config import settings
+from src.database.connection import DatabaseConnection
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__, 'tasks')
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+_invalidation_connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+
+
+def get_task_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop async task code runs on in this process.
+
+    The loop is created on first use and runs for the life of the process in a
+    daemon thread, so the Motor pool and other loop-bound clients are reused by
+    every task. A process forked from one that already had a loop gets its own.
+    """
+    global _loop, _loop_thread, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name='task-event-loop', daemon=True)
+            _loop_thread.start()
+            _loop_pid = os.getpid()
+        return _loop
+
+
+def run_async(awaitable: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine on the task loop and wait for its result.
+
+    Used by Celery tasks instead of asyncio.run(), which would create a new loop
+    (and strand the database pool bound to the previous one) for every task.
+    Safe to call from several worker threads at once. If the caller is interrupted
+    (e.g. by a soft time limit), the coroutine is cancelled.
+    """
+    future = asyncio.run_coroutine_threadsafe(awaitable, get_task_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def async_task(func: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+    """
+    Turn an async task body into the synchronous callable Celery expects.
+
+    Place it under @celery_app.task; each call runs the coroutine on the task loop
+    through run_async:
+
+        @celery_app.task(name='my_task', bind=True)
+        @async_task
+        async def my_task(self, ...):
+            ...
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_async(func(*args, **kwargs))
+
+    return wrapper
+
+
+def stop_task_loop() -> None:
+    """Stop and close the task loop of this process, if it is running."""
+    global _loop, _loop_thread, _loop_pid
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop, _loop_thread, _loop_pid = None, None, None
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=5)
+    if not loop.is_running():
+        loop.close()
+
+
+async def _attach_user_cache() -> None:
+    """Publish user cache invalidations made by tasks to the API processes."""
+    global _invalidation_connection
+    if not settings.user_cache_invalidation_exchange:
+        return
+    connection = await aio_pika.connect_robust(settings.rabbitmq_url, timeout=5)
+    try:
+        await user_cache.attach(await connection.channel(), consume=False)
+    except BaseException:
+        await connection.close()
+        raise
+    _invalidation_connection = connection
+
+
+async def _detach_user_cache() -> None:
+    global _invalidation_connection
+    user_cache.detach()
+    connection, _invalidation_connection = _invalidation_connection, None
+    if connection is not None:
+        await connection.close()
+
+
+@worker_process_init.connect
+def start_task_runtime(**kwargs):
+    """Create the task loop of a worker process and open its database pool up front."""
+    get_task_loop()
+    try:
+        run_async(DatabaseConnection.connect())
+    except Exception:
+        # Tasks connect on demand, so a worker whose database is not reachable yet still starts
+        logger.warning('Database connection failed at worker start', exc_info=True)
+    try:
+        run_async(_attach_user_cache())
+    except Exception:
+        # Without the exchange, API processes fall back to the user cache TTL
+        logger.warning('User cache invalidation publisher failed at worker start', exc_info=True)
+    logger.info('Task event loop started', extra={'pid': os.getpid()})
+
+
+@worker_process_shutdown.connect
+def stop_task_runtime(**kwargs):
+    """Close the invalidation publisher, the database pool and the task loop of a worker process."""
+    if _loop is not None and _loop_pid == os.getpid():
+        try:
+            run_async(_detach_user_cache())
+        except Exception:
+            logger.warning('User cache publisher close failed at worker shutdown', exc_info=True)
+        try:
+            run_async(DatabaseConnection.disconnect())
+        except Exception:
+            logger.warning('Database disconnect failed at worker shutdown', exc_info=True)
+    stop_task_loop()
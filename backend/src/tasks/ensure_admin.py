@@ -1,7 +1,7 @@
 import time
-import asyncio
 from typing import Dict, Any
 from src.tasks.celery.celery_app import celery_app
+from src.tasks.celery.runtime import async_task
 from src.tasks.context import get_task_correlation_id, set_task_correlation_id
 from src.tasks.metrics import celery_tasks_total, celery_task_duration_seconds
 from src.logging.logger import get_logger
@@ -12,7 +12,8 @@ from src.services.user_service import UserService
 logger = get_logger(__name__, 'tasks')
 
 @celery_app.task(name='ensure_default_admin', bind=True)
-def ensure_default_admin(self, correlation_id: str = None) -> Dict[str, Any]:
+@async_task
+async def ensure_default_admin(self, correlation_id: str = None) -> Dict[str, Any]:
     set_task_correlation_id(correlation_id)
     task_correlation_id = get_task_correlation_id()
     task_id = self.request.id
@@ -28,7 +29,7 @@ def ensure_default_admin(self, correlation_id: str = None) -> Dict[str, Any]:
     )
 
     try:
-        result = asyncio.run(_run_ensure_default_admin(task_correlation_id, task_id))
+        result = await _run_ensure_default_admin(task_correlation_id, task_id)
         duration = time.time() - start_time
 
         celery_tasks_total.labels(
@@ -0,0 +1,125 @@
+import time
+from typing import Dict, Any
+from src.tasks.celery.celery_app import celery_app
+from src.tasks.celery.runtime import async_task
+from src.tasks.context import get_task_correlation_id, set_task_correlation_id
+from src.tasks.metrics import celery_tasks_total, celery_task_duration_seconds
+from src.logging.logger import get_logger
+from src.database.connection import DatabaseConnection
+from src.repositories import get_indexed_repositories
+
+logger = get_logger(__name__, 'tasks')
+
+@celery_app.task(name='ensure_indexes', bind=True)
+@async_task
+async def ensure_indexes(self, correlation_id: str = None) -> Dict[str, Any]:
+    set_task_correlation_id(correlation_id)
+    task_correlation_id = get_task_correlation_id()
+    task_id = self.request.id
+    start_time = time.time()
+
+    logger.info(
+        'Ensure indexes task started',
+        extra={
+            'correlation_id': task_correlation_id,
+            'task_name': 'ensure_indexes',
+            'task_id': task_id
+        }
+    )
+
+    try:
+        result = await _run_ensure_indexes(task_correlation_id, task_id)
+        duration = time.time() - start_time
+
+        celery_tasks_total.labels(
+            task_name='ensure_indexes',
+            status='success'
+        ).inc()
+
+        celery_task_duration_seconds.labels(
+            task_name='ensure_indexes',
+            status='success'
+        ).observe(duration)
+
+        logger.info(
+            'Ensure indexes task completed',
+            extra={
+                'correlation_id': task_correlation_id,
+                'task_name': 'ensure_indexes',
+                'task_id': task_id,
+                'duration': duration * 1000,
+                **result
+            }
+        )
+
+        return result
+    except Exception as e:
+        duration = time.time() - start_time
+
+        celery_tasks_total.labels(
+            task_name='ensure_indexes',
+            status='failure'
+        ).inc()
+
+        celery_task_duration_seconds.labels(
+            task_name='ensure_indexes',
+            status='failure'
+        ).observe(duration)
+
+        logger.error(
+            f'Ensure indexes task failed: {str(e)}',
+            extra={
+                'correlation_id': task_correlation_id,
+                'task_name': 'ensure_indexes',
+                'task_id': task_id,
+                'duration': duration * 1000,
+            },
+            exc_info=True,
+        )
+        raise
+
+
+async def _run_ensure_indexes(correlation_id: str, task_id: str) -> Dict[str, Any]:
+    try:
+        DatabaseConnection.get_db()
+    except RuntimeError:
+        await DatabaseConnection.connect()
+
+    collections = {}
+    for repository in get_indexed_repositories():
+        result = await repository.ensure_indexes()
+        collections[repository.collection_name] = result
+        if result['undeclared']:
+            logger.warning(
+                f'Undeclared indexes on {repository.collection_name}',
+                extra={
+                    'correlation_id': correlation_id,
+                    'task_id': task_id,
+                    'collection': repository.collection_name,
+                    'undeclared_indexes': result['undeclared']
+                }
+            )
+        if result['equivalent']:
+            logger.info(
+                f'Declared indexes already present under other names on {repository.collection_name}',
+                extra={
+                    'correlation_id': correlation_id,
+                    'task_id': task_id,
+                    'collection': repository.collection_name,
+                    'equivalent_indexes': result['equivalent']
+                }
+            )
+
+    logger.info(
+        'Ensure indexes completed',
+        extra={
+            'correlation_id': correlation_id,
+            'task_id': task_id,
+            'collections': list(collections)
+        }
+    )
+
+    return {
+        'status': 'completed',
+        'collections': collections
+    }
@@ -1,13 +1,19 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from src.models.domain import UploadedFile
+from typing import Optional, List, Set
+from src.models.domain import UploadedFileRef
 from src.repositories.uploaded_file_repository import UploadedFileRepository
 from src.repositories.user_repository import UserRepository
-from src.services.file_storage_service import FileStorageService
+from src.services.file_storage_service import FileStorageService, DEFAULT_DELETE_CONCURRENCY
+from src.tasks.file_cleanup.pagination import build_cleanup_filter
 from src.logging.logger import get_logger
 
 logger = get_logger(__name__, 'tasks')
 
+DEFAULT_CLEANUP_BATCH_SIZE = 100
+DEFAULT_CLEANUP_BATCH_CONCURRENCY = 4
+
 
 class FileCleanupHandler(ABC):
     """Base handler for file cleanup operations."""
@@ -16,11 +22,17 @@ class FileCleanupHandler(ABC):
         self,
         uploaded_file_repository: UploadedFileRepository,
         file_storage_service: FileStorageService,
-        user_repository: UserRepository = None
+        user_repository: UserRepository = None,
+        delete_concurrency: int = DEFAULT_DELETE_CONCURRENCY,
+        batch_size: int = DEFAULT_CLEANUP_BATCH_SIZE,
+        batch_concurrency: int = DEFAULT_CLEANUP_BATCH_CONCURRENCY
     ):
         self.uploaded_file_repository = uploaded_file_repository
         self.file_storage_service = file_storage_service
         self.user_repository = user_repository
+        self.delete_concurrency = delete_concurrency
+        self.batch_size = max(1, batch_size)
+        self.batch_concurrency = max(1, batch_concurrency)
     
     @abstractmethod
     def get_file_type(self) -> str:
@@ -28,29 +40,71 @@ class FileCleanupHandler(ABC):
         pass
     
     @abstractmethod
-    async def is_file_used(self, uploaded_file: UploadedFile) -> bool:
+    async def is_file_used(self, uploaded_file: UploadedFileRef) -> bool:
         """
         Check if a file is currently in use.
         
         Args:
-            uploaded_file: The UploadedFile record to check
+            uploaded_file: The UploadedFile record to check (projected to UploadedFileRef)
         
         Returns:
             True if file is in use, False otherwise
         """
         pass
     
-    async def cleanup_files(self, max_age_hours: int = 6, skip: int = 0, limit: int = 1000) -> dict:
+    async def get_used_file_keys(self, uploaded_files: List[UploadedFileRef]) -> Set[str]:
+        """
+        Return the keys of the given files that are currently in use.
+        
+        The default implementation checks files one by one via is_file_used();
+        handlers should override it with a single batched lookup.
+        
+        Args:
+            uploaded_files: The UploadedFile records of one chunk
+        
+        Returns:
+            Set of file keys that must be kept
+        """
+        used_keys = set()
+        for uploaded_file in uploaded_files:
+            if await self.is_file_used(uploaded_file):
+                used_keys.add(uploaded_file.file_key)
+        return used_keys
+    
+    def build_filter(
+        self,
+        cutoff_time: datetime,
+        start_id: Optional[str] = None,
+        end_id: Optional[str] = None
+    ) -> dict:
+        """Build the filter selecting this handler's cleanup candidates."""
+        return build_cleanup_filter(self.get_file_type(), cutoff_time, start_id, end_id)
+    
+    async def cleanup_files(
+        self,
+        max_age_hours: int = 6,
+        start_id: Optional[str] = None,
+        end_id: Optional[str] = None,
+        limit: int = 1000
+    ) -> dict:
         """
         Clean up unused files older than max_age_hours.
         
         Files are considered unused if:
         - They are older than max_age_hours
-        - They are not bound to any entity (checked via is_file_used())
+        - They are not bound to any entity (checked via get_used_file_keys())
+        
+        The chunk is split into batches of batch_size files, at most batch_concurrency
+        of which run at a time so lookups and deletes of different batches overlap.
+        Each batch is processed in bulk: one lookup for used files, concurrent
+        storage deletes, and a single delete of the matching UploadedFile records.
+        Content-addressed files release their blob, which is deleted with its last reference.
+        A batch that fails as a whole counts its candidates as failed; the others go on.
         
         Args:
             max_age_hours: Maximum age in hours before cleanup (default: 6)
-            skip: Number of files to skip (for pagination)
+            start_id: Inclusive lower _id bound of the chunk range (optional)
+            end_id: Exclusive upper _id bound of the chunk range (optional)
             limit: Maximum number of files to process
         
         Returns:
@@ -59,62 +113,79 @@ class FileCleanupHandler(ABC):
         file_type = self.get_file_type()
         cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
         
-        # Get files of this type older than cutoff (with pagination)
+        # Get files of this type older than cutoff within the chunk's _id range (only the fields cleanup needs)
         files = await self.uploaded_file_repository.find_many(
-            {
-                'used_for': file_type,
-                'created_at': {'$lt': cutoff_time}
-            },
-            skip=skip,
-            limit=limit
+            self.build_filter(cutoff_time, start_id, end_id),
+            limit=limit,
+            projection=UploadedFileRef
         )
         
+        batches = [files[i:i + self.batch_size] for i in range(0, len(files), self.batch_size)]
+        running = min(self.batch_concurrency, len(batches)) or 1
+        # Share the storage delete budget between the batches in flight
+        delete_concurrency = max(1, self.delete_concurrency // running)
+        semaphore = asyncio.Semaphore(running)
+        
+        async def run_batch(batch: List[UploadedFileRef]) -> dict:
+            async with semaphore:
+                return await self._cleanup_batch(batch, delete_concurrency)
+        
+        stats = {'file_type': file_type, 'processed': len(files), 'deleted': 0, 'skipped': 0, 'failed': 0}
+        for batch_stats in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+            for name, count in batch_stats.items():
+                stats[name] += count
+        
+        return stats
+    
+    async def _cleanup_batch(self, files: List[UploadedFileRef], delete_concurrency: int) -> dict:
+        """Delete the unused files of one batch and count deleted, skipped and failed files."""
+        file_type = self.get_file_type()
+        try:
+            used_keys = await self.get_used_file_keys(files)
+            candidates = [f for f in files if f.file_key not in used_keys]
+            
+            # Delete files from storage (service handles both storage and DB record deletion)
+            results = await self.file_storage_service.delete_files(
+                [f.file_key for f in candidates],
+                concurrency=delete_concurrency,
+                blob_keys={f.file_key: f.blob_key for f in candidates if f.blob_key}
+            )
+        except Exception:
+            logger.error(
+                f'Failed to clean up batch of {len(files)} {file_type} files',
+                extra={'file_type': file_type, 'batch_size': len(files)},
+                exc_info=True
+            )
+            return {'deleted': 0, 'skipped': 0, 'failed': len(files)}
+        
         deleted_count = 0
         failed_count = 0
-        skipped_count = 0
-        
-        for uploaded_file in files:
-            try:
-                # Check if file is still in use
-                if await self.is_file_used(uploaded_file):
-                    skipped_count += 1
-                    continue
-                
-                # Delete file from storage (service handles both storage and DB record deletion)
-                deleted = await self.file_storage_service.delete_file(uploaded_file.file_key)
-                
-                if deleted:
-                    deleted_count += 1
-                    age_hours = None
-                    if uploaded_file.created_at:
-                        age_hours = (datetime.utcnow() - uploaded_file.created_at).total_seconds() / 3600
-                    logger.info(
-                        f'Cleaned up unused {file_type} file: {uploaded_file.file_key}',
-                        extra={
-                            'file_key': uploaded_file.file_key,
-                            'file_type': file_type,
-                            'age_hours': age_hours
-                        }
-                    )
-                else:
-                    failed_count += 1
-                    logger.warning(
-                        f'Failed to delete file from storage: {uploaded_file.file_key}',
-                        extra={'file_key': uploaded_file.file_key, 'file_type': file_type}
-                    )
-            except Exception as e:
+        now = datetime.utcnow()
+        
+        for uploaded_file in candidates:
+            if results.get(uploaded_file.file_key):
+                deleted_count += 1
+                age_hours = None
+                if uploaded_file.created_at:
+                    age_hours = (now - uploaded_file.created_at).total_seconds() / 3600
+                logger.info(
+                    f'Cleaned up unused {file_type} file: {uploaded_file.file_key}',
+                    extra={
+                        'file_key': uploaded_file.file_key,
+                        'file_type': file_type,
+                        'age_hours': age_hours
+                    }
+                )
+            else:
                 failed_count += 1
-                logger.error(
-                    f'Error cleaning up file: {uploaded_file.file_key}',
-                    error=e,
+                logger.warning(
+                    f'Failed to delete file from storage: {uploaded_file.file_key}',
                     extra={'file_key': uploaded_file.file_key, 'file_type': file_type}
                 )
         
         return {
-            'file_type': file_type,
-            'processed': len(files),
             'deleted': deleted_count,
-            'skipped': skipped_count,
+            'skipped': len(files) - len(candidates),
             'failed': failed_count
         }
 
@@ -125,16 +196,24 @@ class AvatarFileCleanupHandler(FileCleanupHandler):
     def get_file_type(self) -> str:
         return 'avatar'
     
-    async def is_file_used(self, uploaded_file: UploadedFile) -> bool:
+    async def is_file_used(self, uploaded_file: UploadedFileRef) -> bool:
         """
         Check if avatar file is in use by checking if any user has it as their avatar.
         """
-        if not self.user_repository:
-            return False
+        return uploaded_file.file_key in await self.get_used_file_keys([uploaded_file])
+    
+    async def get_used_file_keys(self, uploaded_files: List[UploadedFileRef]) -> Set[str]:
+        """
+        Return the avatar keys still referenced by a user.
+        
+        Resolved for the whole chunk with one indexed $in query on users.avatar_file_key.
+        """
+        if not self.user_repository or not uploaded_files:
+            return set()
         
-        # Check if any user has this file_key as their avatar
-        user = await self.user_repository.find_one({'avatar_file_key': uploaded_file.file_key})
-        return user is not None
+        return await self.user_repository.find_referenced_avatar_keys(
+            [f.file_key for f in uploaded_files]
+        )
 
 
 class DocumentFileCleanupHandler(FileCleanupHandler):
@@ -143,7 +222,7 @@ class DocumentFileCleanupHandler(FileCleanupHandler):
     def get_file_type(self) -> str:
         return 'document'
     
-    async def is_file_used(self, uploaded_file: UploadedFile) -> bool:
+    async def is_file_used(self, uploaded_file: UploadedFileRef) -> bool:
         """
         Check if document file is in use.
         
@@ -151,6 +230,9 @@ class DocumentFileCleanupHandler(FileCleanupHandler):
         In the future, this could check if document is referenced in other entities.
         """
         return False
+    
+    async def get_used_file_keys(self, uploaded_files: List[UploadedFileRef]) -> Set[str]:
+        return set()
 
 
 class DefaultFileCleanupHandler(FileCleanupHandler):
@@ -159,66 +241,24 @@ class DefaultFileCleanupHandler(FileCleanupHandler):
     def get_file_type(self) -> str:
         return 'untyped'
     
-    async def is_file_used(self, uploaded_file: UploadedFile) -> bool:
+    async def is_file_used(self, uploaded_file: UploadedFileRef) -> bool:
         """
         Default behavior: files without a type are considered unused if older than the cleanup window.
         """
         return False
     
-    async def cleanup_files(self, max_age_hours: int = 6, skip: int = 0, limit: int = 1000) -> dict:
+    async def get_used_file_keys(self, uploaded_files: List[UploadedFileRef]) -> Set[str]:
+        return set()
+    
+    def build_filter(
+        self,
+        cutoff_time: datetime,
+        start_id: Optional[str] = None,
+        end_id: Optional[str] = None
+    ) -> dict:
         """
-        Clean up files without a used_for type.
+        Select files without a used_for type.
         
         These are files that were uploaded but never bound to any entity.
-        
-        Args:
-            max_age_hours: Maximum age in hours before cleanup (default: 6)
-            skip: Number of files to skip (for pagination)
-            limit: Maximum number of files to process
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-        
-        # Get files without used_for or with null used_for, older than cutoff (with pagination)
-        files = await self.uploaded_file_repository.find_many(
-            {
-                '$or': [
-                    {'used_for': None},
-                    {'used_for': {'$exists': False}}
-                ],
-                'created_at': {'$lt': cutoff_time}
-            },
-            skip=skip,
-            limit=limit
-        )
-        
-        deleted_count = 0
-        failed_count = 0
-        
-        for uploaded_file in files:
-            try:
-                # Delete file from storage (service handles both storage and DB record deletion)
-                deleted = await self.file_storage_service.delete_file(uploaded_file.file_key)
-                
-                if deleted:
-                    deleted_count += 1
-                    logger.info(
-                        f'Cleaned up unused file without type: {uploaded_file.file_key}',
-                        extra={'file_key': uploaded_file.file_key}
-                    )
-                else:
-                    failed_count += 1
-            except Exception as e:
-                failed_count += 1
-                logger.error(
-                    f'Error cleaning up file: {uploaded_file.file_key}',
-                    error=e,
-                    extra={'file_key': uploaded_file.file_key}
-                )
-        
-        return {
-            'file_type': 'untyped',
-            'processed': len(files),
-            'deleted': deleted_count,
-            'skipped': 0,
-            'failed': failed_count
-        }
+        return build_cleanup_filter(None, cutoff_time, start_id, end_id)
@@ -1,10 +1,51 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ASCENDING
 from src.repositories.uploaded_file_repository import UploadedFileRepository
 from src.logging.logger import get_logger
 
 logger = get_logger(__name__, 'tasks')
 
+# Key spec of the UploadedFileRepository index the boundary scan relies on for its order
+CLEANUP_SCAN_INDEX = [('used_for', ASCENDING), ('_id', ASCENDING)]
+
+
+def build_cleanup_filter(
+    file_type: Optional[str],
+    cutoff_time: datetime,
+    start_id: Optional[str] = None,
+    end_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the MongoDB filter selecting cleanup candidates.
+    
+    Args:
+        file_type: Type of files to select (or None for untyped)
+        cutoff_time: Only files created before this time are selected
+        start_id: Inclusive lower _id bound of the chunk range (optional)
+        end_id: Exclusive upper _id bound of the chunk range (optional)
+    
+    Returns:
+        Filter query for the uploaded_files collection
+    """
+    # An equality on used_for (null also matches a missing field) keeps both
+    # cleanup indexes usable: used_for/created_at for counts, used_for/_id for _id order
+    filter_query = {
+        'used_for': file_type or None,
+        'created_at': {'$lt': cutoff_time}
+    }
+    
+    id_range = {}
+    if start_id:
+        id_range['$gte'] = ObjectId(start_id)
+    if end_id:
+        id_range['$lt'] = ObjectId(end_id)
+    if id_range:
+        filter_query['_id'] = id_range
+    
+    return filter_query
+
 
 async def get_file_count_for_cleanup(
     uploaded_file_repository: UploadedFileRepository,
@@ -23,20 +64,7 @@ async def get_file_count_for_cleanup(
         Total count of files matching criteria
     """
     cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-    
-    if file_type:
-        filter_query = {
-            'used_for': file_type,
-            'created_at': {'$lt': cutoff_time}
-        }
-    else:
-        filter_query = {
-            '$or': [
-                {'used_for': None},
-                {'used_for': {'$exists': False}}
-            ],
-            'created_at': {'$lt': cutoff_time}
-        }
+    filter_query = build_cleanup_filter(file_type, cutoff_time)
     
     # Use count_documents for accurate count
     # Access protected method for pagination utilities
@@ -45,6 +73,42 @@ async def get_file_count_for_cleanup(
     return count
 
 
+async def get_cleanup_boundaries(
+    uploaded_file_repository: UploadedFileRepository,
+    file_type: str,
+    max_age_hours: int,
+    chunk_size: int = 1000
+) -> list[str]:
+    """
+    Find the _id of the first file of every chunk with a single sorted scan.
+    
+    The scan walks the used_for/_id index, which returns candidates in _id order
+    (created_at is checked on the fetched documents), so no in-memory sort is needed.
+    
+    Args:
+        uploaded_file_repository: Repository to query
+        file_type: Type of files to process (or None for untyped)
+        max_age_hours: Maximum age in hours
+        chunk_size: Number of files per chunk
+    
+    Returns:
+        Ordered list of chunk start ids (as strings)
+    """
+    cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+    filter_query = build_cleanup_filter(file_type, cutoff_time)
+    
+    collection = uploaded_file_repository._get_collection()
+    cursor = collection.find(filter_query, {'_id': 1}).sort('_id', ASCENDING).hint(CLEANUP_SCAN_INDEX)
+    
+    boundaries = []
+    position = 0
+    async for doc in cursor:
+        if position % chunk_size == 0:
+            boundaries.append(str(doc['_id']))
+        position += 1
+    return boundaries
+
+
 async def create_cleanup_chunks(
     uploaded_file_repository: UploadedFileRepository,
     file_type: str,
@@ -52,7 +116,11 @@ async def create_cleanup_chunks(
     chunk_size: int = 1000
 ) -> list[Dict[str, Any]]:
     """
-    Create chunk definitions for paginated cleanup processing.
+    Create range-partitioned chunk definitions for cleanup processing.
+    
+    Each chunk covers a half-open _id range [start_id, end_id), so chunks are
+    disjoint and stay stable while other chunks delete records. The last chunk
+    has no upper bound.
     
     Args:
         uploaded_file_repository: Repository to query
@@ -61,19 +129,22 @@ async def create_cleanup_chunks(
         chunk_size: Number of files per chunk
     
     Returns:
-        List of chunk definitions with skip/limit for processing
+        List of chunk definitions with start_id/end_id/limit for processing
     """
-    total_count = await get_file_count_for_cleanup(
+    boundaries = await get_cleanup_boundaries(
         uploaded_file_repository,
         file_type,
-        max_age_hours
+        max_age_hours,
+        chunk_size
     )
     
     chunks = []
-    for skip in range(0, total_count, chunk_size):
+    for index, start_id in enumerate(boundaries):
+        end_id = boundaries[index + 1] if index + 1 < len(boundaries) else None
         chunks.append({
             'file_type': file_type,
-            'skip': skip,
+            'start_id': start_id,
+            'end_id': end_id,
             'limit': chunk_size,
             'max_age_hours': max_age_hours
         })
@@ -82,7 +153,6 @@ async def create_cleanup_chunks(
         f'Created {len(chunks)} chunks for {file_type or "untyped"} files',
         extra={
             'file_type': file_type,
-            'total_count': total_count,
             'chunk_size': chunk_size,
             'chunk_count': len(chunks)
         }
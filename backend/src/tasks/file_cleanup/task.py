@@ -1,14 +1,15 @@
 import time
-import asyncio
 from typing import Dict, Any
+from src.config import settings
 from src.tasks.celery.celery_app import celery_app
+from src.tasks.celery.runtime import async_task
 from src.tasks.context import get_task_correlation_id, set_task_correlation_id
 from src.tasks.metrics import celery_tasks_total, celery_task_duration_seconds
 from src.logging.logger import get_logger
 from src.database.connection import DatabaseConnection
 from src.repositories.uploaded_file_repository import UploadedFileRepository
 from src.repositories.user_repository import UserRepository
-from src.dependencies import get_file_storage_service
+from src.dependencies import get_file_storage, get_file_storage_service
 from src.tasks.file_cleanup.handlers import (
     AvatarFileCleanupHandler,
     DocumentFileCleanupHandler,
@@ -20,13 +21,14 @@ from src.tasks.queue import enqueue
 logger = get_logger(__name__, 'tasks')
 
 @celery_app.task(name='cleanup_unused_files', bind=True)
-def cleanup_unused_files(self, max_age_hours: int = 6, correlation_id: str = None):
+@async_task
+async def cleanup_unused_files(self, max_age_hours: int = 6, correlation_id: str = None):
     """
     Scheduled task to clean up unused files older than specified hours.
     
     This is the coordinator task that:
-    1. Counts total files to process
-    2. Splits work into chunks
+    1. Scans candidate file ids once to find chunk boundaries
+    2. Splits work into disjoint _id range chunks
     3. Queues chunk processing tasks
     
     File lifecycle:
@@ -56,7 +58,7 @@ def cleanup_unused_files(self, max_age_hours: int = 6, correlation_id: str = Non
     
     try:
         # Run async cleanup coordinator (creates chunks and queues them)
-        result = asyncio.run(_run_cleanup_coordinator(max_age_hours, task_correlation_id, task_id))
+        result = await _run_cleanup_coordinator(max_age_hours, task_correlation_id, task_id)
         
         duration = time.time() - start_time
         
@@ -201,22 +203,28 @@ async def _run_cleanup_coordinator(max_age_hours: int, correlation_id: str, task
 
 
 @celery_app.task(name='process_cleanup_chunk', bind=True)
-def process_cleanup_chunk(
+@async_task
+async def process_cleanup_chunk(
     self,
     file_type: str,
-    skip: int,
-    limit: int,
     max_age_hours: int,
+    start_id: str = None,
+    end_id: str = None,
+    limit: int = 1000,
     correlation_id: str = None
 ):
     """
     Process a single chunk of files for cleanup.
     
+    Chunks cover disjoint _id ranges, so they can run in parallel without
+    missing or re-processing files.
+    
     Args:
         file_type: Type of files to process (or None for untyped)
-        skip: Number of files to skip
-        limit: Maximum number of files to process
         max_age_hours: Maximum age in hours
+        start_id: Inclusive lower _id bound of the chunk range
+        end_id: Exclusive upper _id bound of the chunk range (None for the last chunk)
+        limit: Maximum number of files to process
         correlation_id: Correlation ID for request tracking
     """
     set_task_correlation_id(correlation_id)
@@ -232,16 +240,17 @@ def process_cleanup_chunk(
             'task_name': 'process_cleanup_chunk',
             'task_id': task_id,
             'file_type': file_type,
-            'skip': skip,
+            'start_id': start_id,
+            'end_id': end_id,
             'limit': limit,
             'max_age_hours': max_age_hours
         }
     )
     
     try:
-        result = asyncio.run(_run_cleanup_chunk(
-            file_type, skip, limit, max_age_hours, task_correlation_id, task_id
-        ))
+        result = await _run_cleanup_chunk(
+            file_type, start_id, end_id, limit, max_age_hours, task_correlation_id, task_id
+        )
         
         duration = time.time() - start_time
         
@@ -295,7 +304,8 @@ def process_cleanup_chunk(
 
 async def _run_cleanup_chunk(
     file_type: str,
-    skip: int,
+    start_id: str,
+    end_id: str,
     limit: int,
     max_age_hours: int,
     correlation_id: str,
@@ -317,29 +327,43 @@ async def _run_cleanup_chunk(
     
     uploaded_file_repository = UploadedFileRepository(db)
     user_repository = UserRepository(db)
-    file_storage_service = get_file_storage_service()
+    file_storage_service = get_file_storage_service(get_file_storage(), uploaded_file_repository)
     
     # Select appropriate handler
     if file_type == 'avatar':
         handler = AvatarFileCleanupHandler(
             uploaded_file_repository,
             file_storage_service,
-            user_repository
+            user_repository,
+            delete_concurrency=settings.file_cleanup_delete_concurrency,
+            batch_size=settings.file_cleanup_batch_size,
+            batch_concurrency=settings.file_cleanup_batch_concurrency
         )
     elif file_type == 'document':
         handler = DocumentFileCleanupHandler(
             uploaded_file_repository,
             file_storage_service,
-            user_repository
+            user_repository,
+            delete_concurrency=settings.file_cleanup_delete_concurrency,
+            batch_size=settings.file_cleanup_batch_size,
+            batch_concurrency=settings.file_cleanup_batch_concurrency
         )
     else:
         handler = DefaultFileCleanupHandler(
             uploaded_file_repository,
             file_storage_service,
-            user_repository
+            user_repository,
+            delete_concurrency=settings.file_cleanup_delete_concurrency,
+            batch_size=settings.file_cleanup_batch_size,
+            batch_concurrency=settings.file_cleanup_batch_concurrency
         )
     
-    result = await handler.cleanup_files(max_age_hours, skip=skip, limit=limit)
+    result = await handler.cleanup_files(
+        max_age_hours,
+        start_id=start_id,
+        end_id=end_id,
+        limit=limit
+    )
 
     logger.info(
         'File cleanup chunk completed',
@@ -347,7 +371,8 @@ async def _run_cleanup_chunk(
             'correlation_id': correlation_id,
             'task_id': task_id,
             'file_type': file_type,
-            'skip': skip,
+            'start_id': start_id,
+            'end_id': end_id,
             'limit': limit,
             'processed': result.get('processed', 0),
             'deleted': result.get('deleted', 0),
@@ -359,7 +384,8 @@ async def _run_cleanup_chunk(
     return {
         'status': 'completed',
         'file_type': file_type,
-        'skip': skip,
+        'start_id': start_id,
+        'end_id': end_id,
         'limit': limit,
         **result
     }
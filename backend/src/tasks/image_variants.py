@@ -0,0 +1,124 @@
+import time
+from typing import Dict, Any
+from src.tasks.celery.celery_app import celery_app
+from src.tasks.celery.runtime import async_task
+from src.tasks.context import get_task_correlation_id, set_task_correlation_id
+from src.tasks.metrics import celery_tasks_total, celery_task_duration_seconds
+from src.logging.logger import get_logger
+from src.database.connection import DatabaseConnection
+from src.repositories.uploaded_file_repository import UploadedFileRepository
+from src.repositories.user_repository import UserRepository
+from src.dependencies import get_file_storage, get_file_storage_service
+
+logger = get_logger(__name__, 'tasks')
+
+@celery_app.task(name='generate_image_variants', bind=True)
+@async_task
+async def generate_image_variants(self, file_key: str, correlation_id: str = None) -> Dict[str, Any]:
+    """
+    Render the thumbnail variants of an uploaded image (e.g. a new avatar).
+
+    Queued after the image is uploaded or bound; variants are stored next to the
+    original so get_file_url(key, size) and the files endpoint can serve them.
+    Users with the image as avatar get the generated sizes recorded, which
+    switches their avatar_url from the original to the thumbnail.
+
+    Args:
+        file_key: Storage key of the original image
+        correlation_id: Correlation ID for request tracking
+    """
+    set_task_correlation_id(correlation_id)
+    task_correlation_id = get_task_correlation_id()
+    task_id = self.request.id
+    start_time = time.time()
+
+    logger.info(
+        'Image variants task started',
+        extra={
+            'correlation_id': task_correlation_id,
+            'task_name': 'generate_image_variants',
+            'task_id': task_id,
+            'file_key': file_key
+        }
+    )
+
+    try:
+        result = await _run_generate_image_variants(file_key, task_correlation_id, task_id)
+        duration = time.time() - start_time
+
+        celery_tasks_total.labels(
+            task_name='generate_image_variants',
+            status='success'
+        ).inc()
+
+        celery_task_duration_seconds.labels(
+            task_name='generate_image_variants',
+            status='success'
+        ).observe(duration)
+
+        logger.info(
+            'Image variants task completed',
+            extra={
+                'correlation_id': task_correlation_id,
+                'task_name': 'generate_image_variants',
+                'task_id': task_id,
+                'duration': duration * 1000,
+                **result
+            }
+        )
+
+        return result
+    except Exception as e:
+        duration = time.time() - start_time
+
+        celery_tasks_total.labels(
+            task_name='generate_image_variants',
+            status='failure'
+        ).inc()
+
+        celery_task_duration_seconds.labels(
+            task_name='generate_image_variants',
+            status='failure'
+        ).observe(duration)
+
+        logger.error(
+            f'Image variants task failed: {str(e)}',
+            extra={
+                'correlation_id': task_correlation_id,
+                'task_name': 'generate_image_variants',
+                'task_id': task_id,
+                'file_key': file_key,
+                'duration': duration * 1000,
+            },
+            exc_info=True,
+        )
+        raise
+
+
+async def _run_generate_image_variants(file_key: str, correlation_id: str, task_id: str) -> Dict[str, Any]:
+    try:
+        db = DatabaseConnection.get_db()
+    except RuntimeError:
+        await DatabaseConnection.connect()
+        db = DatabaseConnection.get_db()
+
+    file_storage_service = get_file_storage_service(get_file_storage(), UploadedFileRepository(db))
+    variant_keys = await file_storage_service.generate_image_variants(file_key)
+    if variant_keys:
+        await UserRepository(db).set_avatar_variant_sizes(file_key, file_storage_service.image_variant_sizes)
+
+    logger.info(
+        f'Image variants generated: {file_key}',
+        extra={
+            'correlation_id': correlation_id,
+            'task_id': task_id,
+            'file_key': file_key,
+            'variants': len(variant_keys)
+        }
+    )
+
+    return {
+        'status': 'completed',
+        'file_key': file_key,
+        'variants': len(variant_keys)
+    }
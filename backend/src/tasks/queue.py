@@ -1,12 +1,30 @@
-from typing import Any, Optional
+import asyncio
+from typing import Any, Dict, Optional
 from src.tasks.queue_backend import get_queue_backend
 from src.logging.correlation import get_correlation_id
 
 
-def enqueue(task_name: str, *args, correlation_id: Optional[str] = None, **kwargs) -> Any:
+def enqueue(
+    task_name: str,
+    *args,
+    correlation_id: Optional[str] = None,
+    publish_options: Optional[Dict[str, Any]] = None,
+    **kwargs
+) -> Any:
     if correlation_id is None:
         correlation_id = get_correlation_id()
     
     kwargs['correlation_id'] = correlation_id
     
-    return get_queue_backend().send_task(task_name, *args, **kwargs)
+    return get_queue_backend().send_task(task_name, *args, publish_options=publish_options, **kwargs)
+
+
+async def enqueue_async(task_name: str, *args, **kwargs) -> Any:
+    """
+    Enqueue from async code without blocking the event loop.
+    
+    Publishing is a blocking broker call (with connection retries while the broker
+    is down), so it runs in a worker thread; the correlation id is read there from
+    the copied context as usual.
+    """
+    return await asyncio.to_thread(enqueue, task_name, *args, **kwargs)
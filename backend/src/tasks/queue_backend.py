@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from src.config import settings
@@ -20,17 +20,29 @@ class InMemoryTaskResult:
 
 
 class TaskQueueBackend:
-    """Queue backend interface."""
-
-    def send_task(self, task_name: str, *args: Any, **kwargs: Any) -> Any:
+    """Queue backend interface; publish_options are backend-specific publishing options."""
+
+    def send_task(
+        self,
+        task_name: str,
+        *args: Any,
+        publish_options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> Any:
         raise NotImplementedError
 
 
 class CeleryQueueBackend(TaskQueueBackend):
     """Queue backend that delegates to Celery."""
 
-    def send_task(self, task_name: str, *args: Any, **kwargs: Any) -> Any:
-        return celery_app.send_task(task_name, args=args, kwargs=kwargs)
+    def send_task(
+        self,
+        task_name: str,
+        *args: Any,
+        publish_options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> Any:
+        return celery_app.send_task(task_name, args=args, kwargs=kwargs, **(publish_options or {}))
 
 
 class InMemoryQueueBackend(TaskQueueBackend):
@@ -39,7 +51,13 @@ class InMemoryQueueBackend(TaskQueueBackend):
     def __init__(self) -> None:
         self._tasks: list[QueuedTask] = []
 
-    def send_task(self, task_name: str, *args: Any, **kwargs: Any) -> InMemoryTaskResult:
+    def send_task(
+        self,
+        task_name: str,
+        *args: Any,
+        publish_options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> InMemoryTaskResult:
         task_id = uuid4().hex
         record = QueuedTask(
             task_name=task_name,
@@ -1,16 +1,18 @@
 import time
-import asyncio
 from typing import Dict, Any
 from src.tasks.celery.celery_app import celery_app
+from src.tasks.celery.runtime import async_task
 from src.tasks.context import get_task_correlation_id, set_task_correlation_id
 from src.tasks.queue import enqueue
+from src.tasks.ensure_indexes import _run_ensure_indexes
 from src.tasks.metrics import celery_tasks_total, celery_task_duration_seconds
 from src.logging.logger import get_logger
 
 logger = get_logger(__name__, 'tasks')
 
 @celery_app.task(name='startup_tasks', bind=True)
-def startup_tasks(self, correlation_id: str = None) -> Dict[str, Any]:
+@async_task
+async def startup_tasks(self, correlation_id: str = None) -> Dict[str, Any]:
     set_task_correlation_id(correlation_id)
     task_correlation_id = get_task_correlation_id()
     task_id = self.request.id
@@ -26,7 +28,7 @@ def startup_tasks(self, correlation_id: str = None) -> Dict[str, Any]:
     )
 
     try:
-        result = asyncio.run(_run_startup_tasks(task_correlation_id, task_id))
+        result = await _run_startup_tasks(task_correlation_id, task_id)
         duration = time.time() - start_time
 
         celery_tasks_total.labels(
@@ -77,19 +79,29 @@ def startup_tasks(self, correlation_id: str = None) -> Dict[str, Any]:
         raise
 
 
+# Enqueued once the indexes are in place; they may rely on them
+STARTUP_TASKS = ['ensure_default_admin']
+
+
 async def _run_startup_tasks(correlation_id: str, task_id: str) -> Dict[str, Any]:
-    task = enqueue('ensure_default_admin', correlation_id=correlation_id)
-    logger.info(
-        'Startup task enqueued',
-        extra={
-            'correlation_id': correlation_id,
-            'task_id': task_id,
-            'startup_task': 'ensure_default_admin',
-            'startup_task_id': task.id
-        }
-    )
+    # Run inline rather than as a separate task, so indexes exist before the next steps start
+    indexes = await _run_ensure_indexes(correlation_id, task_id)
+    task_ids = []
+    for startup_task in STARTUP_TASKS:
+        task = enqueue(startup_task, correlation_id=correlation_id)
+        logger.info(
+            'Startup task enqueued',
+            extra={
+                'correlation_id': correlation_id,
+                'task_id': task_id,
+                'startup_task': startup_task,
+                'startup_task_id': task.id
+            }
+        )
+        task_ids.append(task.id)
     return {
         'status': 'completed',
-        'tasks': ['ensure_default_admin'],
-        'task_ids': [task.id]
+        'indexes': indexes['collections'],
+        'tasks': list(STARTUP_TASKS),
+        'task_ids': task_ids
     }
@@ -1,46 +1,229 @@
-from typing import Any
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Protocol
 
+import orjson
+from prometheus_client import Counter, Gauge, Histogram
 from starlette.websockets import WebSocket
 
+from src.config import settings
+
+websocket_connections = Gauge(
+    'websocket_connections',
+    'Open websocket connections on this process'
+)
+
+websocket_connected_users = Gauge(
+    'websocket_connected_users',
+    'Users with at least one open websocket connection on this process'
+)
+
+websocket_slow_consumers_total = Counter(
+    'websocket_slow_consumers_total',
+    'Messages that found a full outbound queue, by the action taken (drop the message or disconnect the client)',
+    ['action']
+)
+
+websocket_message_encode_seconds = Histogram(
+    'websocket_message_encode_seconds',
+    'Time spent encoding an outgoing websocket message (once per message, whatever the number of recipients)',
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+)
+
+# Close code sent to clients disconnected for not keeping up (RFC 6455 "Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+SLOW_CONSUMER_POLICIES = ('drop', 'disconnect')
+
+
+class PresenceListener(Protocol):
+    def user_connected(self, user_id: str) -> None: ...
+
+    def user_disconnected(self, user_id: str) -> None: ...
+
+
+@dataclass
+class ConnectionInfo:
+    user_id: str
+    connected_at: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    messages_dropped: int = 0
+
+
+@dataclass
+class _Connection:
+    info: ConnectionInfo
+    queue: asyncio.Queue
+    writer: Optional[asyncio.Task] = None
+
+
+def encode_message(data: Any) -> str:
+    # Same output as WebSocket.send_json, produced by the faster orjson encoder
+    try:
+        return orjson.dumps(data).decode()
+    except TypeError:
+        # orjson rejects some values json accepts (e.g. non-str keys, ints over 64 bits)
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
 
 class ConnectionManager:
-    def __init__(self) -> None:
+    """
+    Tracks the websocket connections of this process and delivers messages to them.
+
+    Every connection has a bounded outbound queue drained by its own writer task,
+    so send_to_user and broadcast only enqueue and one slow client cannot delay
+    the others. A message is encoded once and the same frame is queued for every
+    recipient. When a queue is full the message is dropped for that client, or
+    the client is disconnected, depending on the slow consumer policy.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None, slow_consumer_policy: Optional[str] = None) -> None:
+        self.queue_size = max(1, queue_size or settings.ws_send_queue_size)
+        self.slow_consumer_policy = slow_consumer_policy or settings.ws_slow_consumer_policy
+        if self.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f'Unknown slow consumer policy: {self.slow_consumer_policy}')
         self._connections: dict[str, set[WebSocket]] = {}
+        # Reverse index: socket -> owner, metadata and outbound queue, so unregister does not scan users
+        self._conns: dict[WebSocket, _Connection] = {}
+        self._closing: set[asyncio.Task] = set()
+        self._presence_listeners: list[PresenceListener] = []
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._conns)
+
+    @property
+    def user_count(self) -> int:
+        return len(self._connections)
+
+    def user_ids(self) -> list[str]:
+        return list(self._connections)
+
+    def add_presence_listener(self, listener: PresenceListener) -> None:
+        """Notify listener when a user gets a first connection here, or loses the last one."""
+        self._presence_listeners.append(listener)
 
     def register(self, websocket: WebSocket, user_id: str) -> None:
+        conn = self._conns.get(websocket)
+        if conn is not None:
+            if conn.info.user_id == user_id:
+                return
+            self.unregister(websocket)
         if user_id not in self._connections:
             self._connections[user_id] = set()
+            websocket_connected_users.inc()
+            for listener in self._presence_listeners:
+                listener.user_connected(user_id)
         self._connections[user_id].add(websocket)
+        conn = _Connection(ConnectionInfo(user_id), asyncio.Queue(self.queue_size))
+        self._conns[websocket] = conn
+        conn.writer = asyncio.get_running_loop().create_task(self._write(websocket, conn))
+        websocket_connections.inc()
 
     def unregister(self, websocket: WebSocket) -> None:
-        for user_id, conns in list(self._connections.items()):
-            conns.discard(websocket)
-            if not conns:
-                del self._connections[user_id]
+        conn = self._conns.pop(websocket, None)
+        if conn is None:
+            return
+        websocket_connections.dec()
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+        # Pending messages are discarded; keep the queue consistent for drain()
+        while not conn.queue.empty():
+            conn.queue.get_nowait()
+            conn.queue.task_done()
+        conns = self._connections.get(conn.info.user_id)
+        if conns is None:
+            return
+        conns.discard(websocket)
+        if not conns:
+            del self._connections[conn.info.user_id]
+            websocket_connected_users.dec()
+            for listener in self._presence_listeners:
+                listener.user_disconnected(conn.info.user_id)
+
+    def get_connection_info(self, websocket: WebSocket) -> Optional[ConnectionInfo]:
+        conn = self._conns.get(websocket)
+        return conn.info if conn is not None else None
+
+    def touch(self, websocket: WebSocket) -> None:
+        conn = self._conns.get(websocket)
+        if conn is not None:
+            conn.info.last_seen = time.time()
+
+    async def _write(self, websocket: WebSocket, conn: _Connection) -> None:
+        while True:
+            text, size = await conn.queue.get()
+            try:
+                await websocket.send_text(text)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.unregister(websocket)
+                return
+            finally:
+                conn.queue.task_done()
+            conn.info.messages_sent += 1
+            conn.info.bytes_sent += size
+
+    async def _close_slow_consumer(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), timeout=5)
+        except Exception:
+            pass
+
+    def _encode(self, data: Any) -> tuple[str, int]:
+        started = time.perf_counter()
+        text = encode_message(data)
+        size = len(text.encode())
+        websocket_message_encode_seconds.observe(time.perf_counter() - started)
+        return text, size
+
+    def _enqueue(self, websocket: WebSocket, frame: tuple[str, int]) -> None:
+        conn = self._conns.get(websocket)
+        if conn is None:
+            return
+        try:
+            conn.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            websocket_slow_consumers_total.labels(action=self.slow_consumer_policy).inc()
+            conn.info.messages_dropped += 1
+            if self.slow_consumer_policy == 'disconnect':
+                self.unregister(websocket)
+                task = asyncio.get_running_loop().create_task(self._close_slow_consumer(websocket))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
 
     async def send_to_user(self, user_id: str, data: Any) -> None:
         conns = self._connections.get(user_id)
         if not conns:
             return
-        dead = []
+        frame = self._encode(data)
         for ws in list(conns):
-            try:
-                await ws.send_json(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.unregister(ws)
+            self._enqueue(ws, frame)
 
     async def broadcast(self, data: Any) -> None:
-        dead = []
-        for conns in list(self._connections.values()):
-            for ws in list(conns):
-                try:
-                    await ws.send_json(data)
-                except Exception:
-                    dead.append(ws)
-        for ws in dead:
+        if not self._conns:
+            return
+        frame = self._encode(data)
+        for ws in list(self._conns):
+            self._enqueue(ws, frame)
+
+    async def drain(self) -> None:
+        """Wait until every message queued so far has been sent or discarded."""
+        await asyncio.gather(
+            *(conn.queue.join() for conn in list(self._conns.values())),
+            *list(self._closing)
+        )
+
+    async def shutdown(self) -> None:
+        """Stop all writer tasks; queued messages are discarded."""
+        writers = [conn.writer for conn in self._conns.values() if conn.writer is not None]
+        for ws in list(self._conns):
             self.unregister(ws)
+        await asyncio.gather(*writers, *list(self._closing), return_exceptions=True)
 
 
 connection_manager = ConnectionManager()
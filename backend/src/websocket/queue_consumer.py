@@ -1,45 +1,197 @@
 import json
+import time
 import asyncio
+from datetime import timezone
+from typing import Optional
 
 import aio_pika
-from aio_pika import IncomingMessage
+from aio_pika import ExchangeType, IncomingMessage
+from prometheus_client import Counter, Gauge, Histogram
 
+from src.auth.user_cache import user_cache
 from src.config import settings
+from src.logging.logger import get_logger
 from src.websocket.connection_manager import connection_manager
+from src.websocket.routing import (
+    BROADCAST_ROUTING_KEY,
+    MessageRouter,
+    NodePresence,
+    get_node_id,
+    node_queue_name,
+)
 
+logger = get_logger(__name__, 'api')
 
-async def _handle_message(message: IncomingMessage) -> None:
-    async with message.process():
+websocket_messages_dispatched_total = Counter(
+    'websocket_messages_dispatched_total',
+    'Messages taken from the websocket queue, by kind (user, broadcast, invalid, failed)',
+    ['kind']
+)
+
+websocket_dispatch_queue_size = Gauge(
+    'websocket_dispatch_queue_size',
+    'Messages received from the broker and waiting to be dispatched to connections'
+)
+
+websocket_queue_lag_seconds = Histogram(
+    'websocket_queue_lag_seconds',
+    'Time from publishing (message timestamp, when set) to dispatch of websocket messages',
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 300)
+)
+
+
+async def _dispatch(body: bytes) -> str:
+    """Hand one queued message to the connection manager and return its kind."""
+    try:
+        data = json.loads(body.decode())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return 'invalid'
+    payload = data.get('payload')
+    if payload is None:
+        return 'invalid'
+    if data.get('broadcast'):
+        await connection_manager.broadcast(payload)
+        return 'broadcast'
+    user_id = data.get('user_id')
+    if not user_id:
+        return 'invalid'
+    await connection_manager.send_to_user(user_id, payload)
+    return 'user'
+
+
+class MessageDispatcher:
+    """
+    In-process queue between the broker consumer and the connection manager.
+
+    The consumer callback only enqueues; one dispatcher task hands messages to
+    the connection manager in delivery order and acknowledges them in batches
+    (one multiple=True ack per ack_batch_size messages, or after ack_interval
+    seconds without new messages). Messages that fail to dispatch are rejected
+    individually, as message.process() did.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        ack_batch_size: Optional[int] = None,
+        ack_interval: Optional[float] = None
+    ) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(max(1, queue_size or settings.ws_dispatch_queue_size))
+        self.ack_batch_size = max(1, ack_batch_size or settings.ws_ack_batch_size)
+        self.ack_interval = ack_interval if ack_interval is not None else settings.ws_ack_interval_seconds
+        self._last_unacked: Optional[IncomingMessage] = None
+        self._unacked_count = 0
+
+    async def enqueue(self, message: IncomingMessage) -> None:
+        await self.queue.put(message)
+        websocket_dispatch_queue_size.set(self.queue.qsize())
+
+    async def run(self) -> None:
         try:
-            body = json.loads(message.body.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            while True:
+                if self._last_unacked is None:
+                    message = await self.queue.get()
+                else:
+                    try:
+                        message = await asyncio.wait_for(self.queue.get(), self.ack_interval)
+                    except asyncio.TimeoutError:
+                        await self.flush()
+                        continue
+                websocket_dispatch_queue_size.set(self.queue.qsize())
+                await self._process(message)
+        finally:
+            await self.flush()
+
+    async def _process(self, message: IncomingMessage) -> None:
+        try:
+            kind = await _dispatch(message.body)
+        except Exception:
+            websocket_messages_dispatched_total.labels(kind='failed').inc()
+            logger.warning('Failed to dispatch websocket message', exc_info=True)
+            # Settle earlier deliveries first so the multiple ack cannot cover this one
+            await self.flush()
+            await message.reject()
             return
-        payload = body.get('payload')
-        if payload is None:
+        websocket_messages_dispatched_total.labels(kind=kind).inc()
+        if message.timestamp:
+            published_at = message.timestamp
+            if published_at.tzinfo is None:
+                published_at = published_at.replace(tzinfo=timezone.utc)
+            websocket_queue_lag_seconds.observe(max(0.0, time.time() - published_at.timestamp()))
+        self._last_unacked = message
+        self._unacked_count += 1
+        if self._unacked_count >= self.ack_batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Acknowledge every message dispatched so far."""
+        message = self._last_unacked
+        if message is None:
             return
-        if body.get('broadcast'):
-            await connection_manager.broadcast(payload)
-        else:
-            user_id = body.get('user_id')
-            if user_id:
-                await connection_manager.send_to_user(user_id, payload)
+        count = self._unacked_count
+        self._last_unacked = None
+        self._unacked_count = 0
+        try:
+            await message.ack(multiple=True)
+        except Exception:
+            # The channel is gone; the broker redelivers the unacknowledged messages
+            logger.warning(
+                'Failed to acknowledge websocket messages',
+                extra={'count': count},
+                exc_info=True
+            )
+
+
+node_presence = NodePresence()
+connection_manager.add_presence_listener(node_presence)
 
 
 async def consume_ws_queue() -> None:
+    """
+    Deliver websocket messages to the clients connected to this node.
+
+    Every node has an exclusive queue on the routing exchange, bound to the
+    broadcast key and to the keys of its connected users (see NodePresence), so it
+    only receives messages it can deliver while broadcasts reach every node.
+    Messages published to the shared queue are moved to the exchange by
+    MessageRouter; publishers may also publish to the exchange directly.
+    """
     connection = None
     while True:
+        tasks = []
         try:
             connection = await aio_pika.connect_robust(settings.rabbitmq_url)
             channel = await connection.channel()
-            await channel.set_qos(prefetch_count=10)
-            queue = await channel.declare_queue(settings.ws_messages_queue, durable=True)
-            await queue.consume(_handle_message)
-            await asyncio.Future()
+            await channel.set_qos(prefetch_count=settings.ws_consumer_prefetch)
+            exchange = await channel.declare_exchange(settings.ws_routing_exchange, ExchangeType.TOPIC, durable=True)
+            node_queue = await channel.declare_queue(
+                node_queue_name(get_node_id()), exclusive=True, auto_delete=True
+            )
+            await node_queue.bind(exchange, BROADCAST_ROUTING_KEY)
+            dispatcher = MessageDispatcher()
+            tasks.append(asyncio.create_task(dispatcher.run()))
+            tasks.append(asyncio.create_task(node_presence.run(node_queue, exchange, connection_manager.user_ids)))
+            await node_queue.consume(dispatcher.enqueue)
+            router_channel = await connection.channel()
+            await router_channel.set_qos(prefetch_count=settings.ws_consumer_prefetch)
+            router = MessageRouter(
+                await router_channel.declare_exchange(settings.ws_routing_exchange, ExchangeType.TOPIC, durable=True)
+            )
+            shared_queue = await router_channel.declare_queue(settings.ws_messages_queue, durable=True)
+            await shared_queue.consume(router.route)
+            # Share the connection for cross-process user cache invalidation
+            await user_cache.attach(await connection.channel())
+            # Runs until a task fails (e.g. its channel closed)
+            await asyncio.gather(*tasks)
         except asyncio.CancelledError:
             break
         except Exception:
             await asyncio.sleep(5)
         finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            user_cache.detach()
             if connection:
                 await connection.close()
                 connection = None
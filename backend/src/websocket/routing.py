@@ -0,0 +1,126 @@
+import json
+import socket
+import asyncio
+import uuid
+from typing import Callable, Iterable, Optional
+
+import aio_pika
+from aio_pika import IncomingMessage
+from aio_pika.abc import AbstractExchange, AbstractQueue
+from prometheus_client import Counter
+
+from src.config import settings
+from src.logging.logger import get_logger
+
+logger = get_logger(__name__, 'api')
+
+BROADCAST_ROUTING_KEY = 'broadcast'
+
+websocket_messages_routed_total = Counter(
+    'websocket_messages_routed_total',
+    'Messages moved from the shared websocket queue to the routing exchange, by kind (user, broadcast, invalid)',
+    ['kind']
+)
+
+_node_id: Optional[str] = None
+
+
+def get_node_id() -> str:
+    """Identifier of this API process in the websocket routing topology."""
+    global _node_id
+    if _node_id is None:
+        _node_id = settings.ws_node_id or f'{socket.gethostname()}-{uuid.uuid4().hex[:8]}'
+    return _node_id
+
+
+def user_routing_key(user_id: str) -> str:
+    return f'user.{user_id}'
+
+
+def node_queue_name(node_id: str) -> str:
+    return f'{settings.ws_routing_exchange}.node.{node_id}'
+
+
+class NodePresence:
+    """
+    Keeps this node's queue bound to the routing keys of the users connected here.
+
+    The bindings are the user -> node presence map: the routing exchange delivers
+    a user's messages only to the nodes holding a connection of that user, and they
+    disappear with the node's exclusive queue if the node dies. Bind and unbind
+    calls are applied in order by a single task, so a quick reconnect cannot leave
+    a stale unbind behind.
+    """
+
+    def __init__(self) -> None:
+        self._changes: asyncio.Queue = asyncio.Queue()
+
+    def user_connected(self, user_id: str) -> None:
+        self._changes.put_nowait((True, user_id))
+
+    def user_disconnected(self, user_id: str) -> None:
+        self._changes.put_nowait((False, user_id))
+
+    async def run(
+        self,
+        queue: AbstractQueue,
+        exchange: AbstractExchange,
+        connected_user_ids: Callable[[], Iterable[str]]
+    ) -> None:
+        # Changes queued while detached are covered by binding the users connected now
+        while not self._changes.empty():
+            self._changes.get_nowait()
+        for user_id in list(connected_user_ids()):
+            await queue.bind(exchange, user_routing_key(user_id))
+        while True:
+            connected, user_id = await self._changes.get()
+            try:
+                if connected:
+                    await queue.bind(exchange, user_routing_key(user_id))
+                else:
+                    await queue.unbind(exchange, user_routing_key(user_id))
+            except Exception:
+                logger.warning(
+                    'Failed to update websocket presence binding',
+                    extra={'user_id': user_id, 'connected': connected},
+                    exc_info=True
+                )
+                raise
+
+
+class MessageRouter:
+    """
+    Moves messages from the shared websocket queue to the routing exchange.
+
+    Publishers that do not know the topology keep sending to the shared queue; any
+    node takes each message and republishes it with the routing key of its user
+    (or the broadcast key), so it reaches exactly the nodes that need it.
+    """
+
+    def __init__(self, exchange: AbstractExchange) -> None:
+        self.exchange = exchange
+
+    async def route(self, message: IncomingMessage) -> None:
+        async with message.process():
+            try:
+                data = json.loads(message.body.decode())
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                websocket_messages_routed_total.labels(kind='invalid').inc()
+                return
+            if data.get('broadcast'):
+                kind, routing_key = 'broadcast', BROADCAST_ROUTING_KEY
+            elif data.get('user_id'):
+                kind, routing_key = 'user', user_routing_key(data['user_id'])
+            else:
+                websocket_messages_routed_total.labels(kind='invalid').inc()
+                return
+            await self.exchange.publish(
+                aio_pika.Message(
+                    body=message.body,
+                    content_type=message.content_type,
+                    timestamp=message.timestamp,
+                    delivery_mode=aio_pika.DeliveryMode.NOT_PERSISTENT
+                ),
+                routing_key=routing_key
+            )
+            websocket_messages_routed_total.labels(kind=kind).inc()
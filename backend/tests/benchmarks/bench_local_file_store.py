@@ -0,0 +1,93 @@
+"""
+Upload/download throughput of LocalFileStore at 1, 10 and 100 concurrent clients.
+
+Compares the thread-pool store with an inline variant that performs the same
+filesystem calls directly on the event loop (the previous behaviour), and reports
+the longest event loop stall observed while the clients run.
+
+Usage (from backend/):
+    python -m tests.benchmarks.bench_local_file_store [--size-mb 4] [--chunk-kb 64]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import uuid
+
+from tests import test_env  # noqa: F401  (settings defaults)
+from src.storage.local_file_store import LocalFileStore
+
+CONCURRENCY_LEVELS = (1, 10, 100)
+
+
+class InlineLocalFileStore(LocalFileStore):
+    """LocalFileStore with filesystem calls made directly on the event loop."""
+
+    async def _run(self, func, *args):
+        return func(*args)
+
+
+async def _stream(payload: bytes, chunk_size: int):
+    for offset in range(0, len(payload), chunk_size):
+        yield payload[offset:offset + chunk_size]
+        await asyncio.sleep(0)
+
+
+async def _watch_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def _run_clients(store: LocalFileStore, clients: int, payload: bytes, chunk_size: int):
+    keys = [f'{uuid.uuid4()}/bench.bin' for _ in range(clients)]
+
+    async def measure(operation):
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(_watch_loop_lag(stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(operation(key) for key in keys))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        return elapsed, await watcher
+
+    async def upload(key):
+        await store.store_stream(key, _stream(payload, chunk_size))
+
+    async def download(key):
+        async for _ in store.iter_range(key, chunk_size=chunk_size):
+            pass
+
+    upload_time, upload_lag = await measure(upload)
+    download_time, download_lag = await measure(download)
+    total_mb = clients * len(payload) / (1024 * 1024)
+    return total_mb / upload_time, upload_lag, total_mb / download_time, download_lag
+
+
+async def main(size_mb: float, chunk_kb: int) -> None:
+    payload = bytes(int(size_mb * 1024 * 1024))
+    chunk_size = chunk_kb * 1024
+    print(f'payload {size_mb} MB per client, {chunk_kb} KB chunks')
+    print(f'{"store":<8} {"clients":>7} {"upload MB/s":>12} {"max stall ms":>13} {"download MB/s":>14} {"max stall ms":>13}')
+    for name, store_type in (('inline', InlineLocalFileStore), ('pool', LocalFileStore)):
+        for clients in CONCURRENCY_LEVELS:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                store = store_type(base_path=tmpdir)
+                store.logger.logger.setLevel(logging.WARNING)
+                up, up_lag, down, down_lag = await _run_clients(store, clients, payload, chunk_size)
+            print(
+                f'{name:<8} {clients:>7} {up:>12.1f} {up_lag * 1000:>13.1f} '
+                f'{down:>14.1f} {down_lag * 1000:>13.1f}'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=4)
+    parser.add_argument('--chunk-kb', type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.size_mb, args.chunk_kb))
@@ -0,0 +1,91 @@
+"""
+Per-upload CPU cost of FileStorageService.store_file_stream.
+
+Compares the previous fixed 8 KB read() loop with adaptive chunk sizing and
+readinto() into a reused buffer. Uploads are spooled the way FastAPI spools
+them and written to a storage that discards the bytes, so only the streaming
+overhead is measured.
+
+Usage (from backend/):
+    python -m tests.benchmarks.bench_upload_chunking [--size-mb 10] [--uploads 50]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Optional
+
+from fastapi import UploadFile
+
+from tests import test_env  # noqa: F401  (settings defaults)
+from src.services.file_storage_service import FileStorageService
+from src.storage.local_file_store import LocalFileStore
+
+LEGACY_CHUNK_SIZE = 8 * 1024
+
+
+class DiscardingFileStore(LocalFileStore):
+    """Consumes upload streams without touching the disk."""
+
+    async def store_stream(self, key: str, file_stream, content_type: Optional[str] = None) -> str:
+        async for _ in file_stream:
+            pass
+        return key
+
+
+class ReadOnlyUpload:
+    """Exposes only read(), which sends store_file_stream down the read() path."""
+
+    def __init__(self, upload: UploadFile):
+        self.upload = upload
+
+    async def read(self, size: int = -1) -> bytes:
+        return await self.upload.read(size)
+
+
+def _spooled_upload(payload: bytes) -> UploadFile:
+    # Same spooling threshold as Starlette's multipart parser
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(payload)
+    spooled.seek(0)
+    return UploadFile(spooled, size=len(payload), filename='bench.bin')
+
+
+async def _cpu_per_upload(service: FileStorageService, payload: bytes, uploads: int, legacy: bool) -> float:
+    total = 0.0
+    for _ in range(uploads):
+        upload = _spooled_upload(payload)
+        stream = ReadOnlyUpload(upload) if legacy else upload
+        started = time.process_time()
+        await service.store_file_stream(stream, original_filename='bench.bin', expected_size=upload.size)
+        total += time.process_time() - started
+        await upload.close()
+    return total / uploads
+
+
+async def main(size_mb: float, uploads: int) -> None:
+    payload = bytes(int(size_mb * 1024 * 1024))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = DiscardingFileStore(base_path=tmpdir)
+        legacy = FileStorageService(
+            store, min_upload_chunk_size=LEGACY_CHUNK_SIZE, max_upload_chunk_size=LEGACY_CHUNK_SIZE
+        )
+        adaptive = FileStorageService(store)
+        for service in (legacy, adaptive):
+            service.logger.logger.disabled = True
+
+        before = await _cpu_per_upload(legacy, payload, uploads, legacy=True)
+        after = await _cpu_per_upload(adaptive, payload, uploads, legacy=False)
+
+    print(f'{size_mb} MB upload, {uploads} runs')
+    print(f'fixed 8 KB read():          {before * 1000:8.2f} ms CPU per upload')
+    print(f'adaptive readinto() buffer: {after * 1000:8.2f} ms CPU per upload')
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=10)
+    parser.add_argument('--uploads', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.size_mb, args.uploads))
@@ -0,0 +1,92 @@
+"""
+Broadcast latency of ConnectionManager with thousands of simulated websocket clients.
+
+Compares the previous broadcast, which awaited every socket in turn, with the
+per-connection send queues. Each simulated client takes --send-ms to accept a
+frame; --slow clients take --slow-ms. Reported: how long the broadcast call
+blocks its caller and when the last fast client has the message.
+
+Usage (from backend/):
+    python -m tests.benchmarks.bench_websocket_broadcast [--clients 5000] [--slow 10]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Optional
+
+from tests import test_env  # noqa: F401  (settings defaults)
+from src.websocket.connection_manager import ConnectionManager, encode_message
+
+
+class SimulatedWebSocket:
+    def __init__(self, send_seconds: float):
+        self.send_seconds = send_seconds
+        self.received_at: Optional[float] = None
+
+    async def send_text(self, text: str) -> None:
+        await asyncio.sleep(self.send_seconds)
+        self.received_at = time.perf_counter()
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+class SequentialBroadcaster:
+    """The previous ConnectionManager.broadcast: one socket at a time."""
+
+    def __init__(self, sockets):
+        self.sockets = sockets
+
+    async def broadcast(self, data: Any) -> None:
+        for ws in self.sockets:
+            await ws.send_text(encode_message(data))
+
+
+def _clients(count: int, slow: int, send_ms: float, slow_ms: float):
+    return [
+        SimulatedWebSocket((slow_ms if i < slow else send_ms) / 1000)
+        for i in range(count)
+    ]
+
+
+async def _measure(broadcaster, sockets, fast_sockets, drain=None):
+    payload = {'type': 'notification', 'payload': {'text': 'x' * 200}}
+    started = time.perf_counter()
+    await broadcaster.broadcast(payload)
+    returned = time.perf_counter() - started
+    if drain:
+        await drain()
+    last_fast = max(ws.received_at for ws in fast_sockets) - started
+    return returned, last_fast
+
+
+async def main(clients: int, slow: int, send_ms: float, slow_ms: float) -> None:
+    sockets = _clients(clients, slow, send_ms, slow_ms)
+    before = await _measure(SequentialBroadcaster(sockets), sockets, sockets[slow:])
+
+    sockets = _clients(clients, slow, send_ms, slow_ms)
+    manager = ConnectionManager(queue_size=16, slow_consumer_policy='drop')
+    for i, ws in enumerate(sockets):
+        manager.register(ws, f'user-{i}')
+    fast_sockets = sockets[slow:]
+
+    async def fast_delivered():
+        while any(ws.received_at is None for ws in fast_sockets):
+            await asyncio.sleep(0.001)
+
+    after = await _measure(manager, sockets, fast_sockets, drain=fast_delivered)
+    await manager.shutdown()
+
+    print(f'{clients} clients ({slow} slow at {slow_ms} ms, others {send_ms} ms per frame)')
+    print(f'sequential broadcast: call blocks {before[0] * 1000:9.1f} ms, last fast client at {before[1] * 1000:9.1f} ms')
+    print(f'send queues:          call blocks {after[0] * 1000:9.1f} ms, last fast client at {after[1] * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--slow', type=int, default=10)
+    parser.add_argument('--send-ms', type=float, default=0.05)
+    parser.add_argument('--slow-ms', type=float, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.slow, args.send_ms, args.slow_ms))
@@ -0,0 +1,80 @@
+"""
+CPU cost of encoding one broadcast for many websocket recipients.
+
+Compares json.dumps per recipient (what WebSocket.send_json did for every
+socket) with ConnectionManager encoding the message once and queueing the same
+frame for every connection. Sockets discard frames, so only the encoding and
+delivery overhead is measured.
+
+Usage (from backend/):
+    python -m tests.benchmarks.bench_websocket_encoding [--clients 10000] [--messages 20]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from tests import test_env  # noqa: F401  (settings defaults)
+from src.websocket.connection_manager import ConnectionManager
+
+
+class DiscardingWebSocket:
+    async def send_text(self, text: str) -> None:
+        pass
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+def _payload() -> dict:
+    return {
+        'type': 'task_update',
+        'payload': {
+            'task_id': 'a' * 24,
+            'status': 'completed',
+            'progress': 100,
+            'items': [{'id': i, 'name': f'item-{i}', 'tags': ['x', 'y']} for i in range(20)],
+        },
+    }
+
+
+async def _per_recipient(sockets, payload, messages: int) -> float:
+    started = time.process_time()
+    for _ in range(messages):
+        for ws in sockets:
+            await ws.send_text(json.dumps(payload, separators=(',', ':'), ensure_ascii=False))
+    return (time.process_time() - started) / messages
+
+
+async def _encode_once(sockets, payload, messages: int) -> float:
+    manager = ConnectionManager(queue_size=messages + 1, slow_consumer_policy='drop')
+    for i, ws in enumerate(sockets):
+        manager.register(ws, f'user-{i}')
+    await asyncio.sleep(0)
+    started = time.process_time()
+    for _ in range(messages):
+        await manager.broadcast(payload)
+        await manager.drain()
+    elapsed = (time.process_time() - started) / messages
+    await manager.shutdown()
+    return elapsed
+
+
+async def main(clients: int, messages: int) -> None:
+    sockets = [DiscardingWebSocket() for _ in range(clients)]
+    payload = _payload()
+
+    before = await _per_recipient(sockets, payload, messages)
+    after = await _encode_once(sockets, payload, messages)
+
+    print(f'{clients} recipients, {len(json.dumps(payload))} byte message, {messages} broadcasts')
+    print(f'json.dumps per recipient: {before * 1000:8.1f} ms CPU per broadcast')
+    print(f'encoded once + queues:    {after * 1000:8.1f} ms CPU per broadcast')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--messages', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.messages))
@@ -9,6 +9,7 @@ from httpx_ws.transport import ASGIWebSocketTransport
 
 from src.main import app
 from src.database.connection import DatabaseConnection
+from src.auth.user_cache import user_cache
 from src.tasks.queue_backend import InMemoryQueueBackend, get_queue_backend
 from src.config import settings
 from src.repositories.user_repository import UserRepository
@@ -73,10 +74,13 @@ async def db_session(test_db: AsyncIOMotorDatabase) -> AsyncGenerator[AsyncIOMot
     collections = await test_db.list_collection_names()
     for collection_name in collections:
         await test_db[collection_name].delete_many({})
+    # Users are wiped behind the cache's back between tests
+    user_cache.clear()
     yield test_db
     collections = await test_db.list_collection_names()
     for collection_name in collections:
         await test_db[collection_name].delete_many({})
+    user_cache.clear()
     DatabaseConnection._db = original_db
     DatabaseConnection._client = original_client
 
@@ -2,6 +2,7 @@ import pytest
 from httpx import AsyncClient
 
 from src.auth.jwt import create_access_token, create_oauth_state_token
+from src.services.password import password_hasher
 
 
 @pytest.mark.integration
@@ -37,6 +38,23 @@ class TestAuthRoutes:
         assert data['status'] in ('error', 'common.error')
         assert 'status' in data
 
+    async def test_login_rejected_when_password_pool_is_full(
+        self, client: AsyncClient, test_user: dict, monkeypatch
+    ):
+        """Test login returns 503 instead of queueing when the password pool is saturated."""
+        monkeypatch.setattr(password_hasher, 'max_pending', 0)
+        response = await client.post(
+            '/api/auth/login',
+            json={
+                'email': test_user['email'],
+                'password': test_user['password'],
+                'strategy': 'credentials',
+            },
+        )
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert response.json()['status'] in ('error', 'common.error')
+
     async def test_login_user_not_found(self, client: AsyncClient, user_payload: dict):
         """Test login with non-existent user."""
         response = await client.post(
@@ -3,7 +3,11 @@ from datetime import datetime, timedelta
 import pytest
 
 from src.repositories.uploaded_file_repository import UploadedFileRepository
-from src.tasks.file_cleanup.pagination import create_cleanup_chunks, get_file_count_for_cleanup
+from src.tasks.file_cleanup.pagination import (
+    build_cleanup_filter,
+    create_cleanup_chunks,
+    get_file_count_for_cleanup,
+)
 
 
 @pytest.mark.integration
@@ -65,7 +69,7 @@ class TestFileCleanupPaginationIntegration:
         assert avatar_count == 1
         assert untyped_count == 2
 
-    async def test_create_cleanup_chunks_uses_count(self, db_session):
+    async def test_create_cleanup_chunks_partitions_by_id(self, db_session):
         repo = UploadedFileRepository(db_session)
         collection = repo._get_collection()
         old = datetime.utcnow() - timedelta(hours=7)
@@ -94,5 +98,15 @@ class TestFileCleanupPaginationIntegration:
         chunks = await create_cleanup_chunks(repo, 'avatar', 6, chunk_size=1)
 
         assert len(chunks) == 2
-        assert chunks[0]['skip'] == 0
-        assert chunks[1]['skip'] == 1
+        assert chunks[0]['end_id'] == chunks[1]['start_id']
+        assert chunks[1]['end_id'] is None
+
+        cutoff = datetime.utcnow() - timedelta(hours=6)
+        chunk_keys = []
+        for chunk in chunks:
+            docs = await collection.find(
+                build_cleanup_filter('avatar', cutoff, chunk['start_id'], chunk['end_id'])
+            ).to_list(length=None)
+            chunk_keys.append([doc['file_key'] for doc in docs])
+
+        assert chunk_keys == [['avatar-old-1'], ['avatar-old-2']]
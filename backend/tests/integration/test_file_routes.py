@@ -153,6 +153,51 @@ class TestFileRoutes:
 
         assert response.status_code == 403
     
+    async def test_get_file_supports_range_and_etag(self, authenticated_client: AsyncClient):
+        """Test partial downloads and conditional requests."""
+        file_data = bytes(range(256)) * 40
+        upload_response = await authenticated_client.post(
+            '/api/files/upload',
+            files={'file': ('data.bin', file_data, 'application/octet-stream')},
+        )
+        file_key = upload_response.json()['file_key']
+
+        full = await authenticated_client.get(f'/api/files/{file_key}')
+        assert full.status_code == 200
+        assert full.content == file_data
+        assert full.headers['accept-ranges'] == 'bytes'
+        etag = full.headers['etag']
+
+        partial = await authenticated_client.get(
+            f'/api/files/{file_key}', headers={'Range': 'bytes=100-1099'}
+        )
+        assert partial.status_code == 206
+        assert partial.content == file_data[100:1100]
+        assert partial.headers['content-range'] == f'bytes 100-1099/{len(file_data)}'
+
+        suffix = await authenticated_client.get(
+            f'/api/files/{file_key}', headers={'Range': 'bytes=-10'}
+        )
+        assert suffix.content == file_data[-10:]
+
+        not_modified = await authenticated_client.get(
+            f'/api/files/{file_key}', headers={'If-None-Match': etag}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b''
+
+        stale_range = await authenticated_client.get(
+            f'/api/files/{file_key}', headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'}
+        )
+        assert stale_range.status_code == 200
+        assert stale_range.content == file_data
+
+        unsatisfiable = await authenticated_client.get(
+            f'/api/files/{file_key}', headers={'Range': f'bytes={len(file_data)}-'}
+        )
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers['content-range'] == f'bytes */{len(file_data)}'
+
     async def test_get_file_different_content_types(self, authenticated_client: AsyncClient):
         """Test retrieving files with different content types."""
         # Test text file
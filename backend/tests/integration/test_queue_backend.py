@@ -64,10 +64,12 @@ async def test_cleanup_coordinator_enqueues_chunks(
 @pytest.mark.asyncio
 async def test_startup_tasks_enqueue_default_admin(
     in_memory_queue: InMemoryQueueBackend,
+    db_session,
 ) -> None:
     result = await _run_startup_tasks('corr-id', 'task-id')
 
     assert result['status'] == 'completed'
+    assert 'users' in result['indexes']
     assert result['tasks'] == ['ensure_default_admin']
 
     tasks = in_memory_queue.get_tasks()
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from src.repositories.uploaded_file_repository import UploadedFileRepository
+from src.repositories.user_repository import UserRepository
+from src.tasks.file_cleanup.pagination import CLEANUP_SCAN_INDEX, build_cleanup_filter
+
+
+def _plan_stages(plan) -> list[str]:
+    """Collect every stage name of an explain plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def _assert_no_collscan(explain: dict) -> None:
+    stages = _plan_stages(explain['queryPlanner']['winningPlan'])
+    assert 'COLLSCAN' not in stages, stages
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestRepositoryIndexes:
+    """Every query shape the repositories issue must be served by a declared index."""
+
+    @pytest.fixture
+    async def indexed_db(self, db_session):
+        for repository in (UserRepository(db_session), UploadedFileRepository(db_session)):
+            await repository.ensure_indexes()
+        return db_session
+
+    async def test_ensure_indexes_is_idempotent(self, indexed_db):
+        repo = UploadedFileRepository(indexed_db)
+
+        result = await repo.ensure_indexes()
+
+        assert result['rebuilt'] == []
+        assert result['undeclared'] == []
+
+    async def test_ensure_indexes_accepts_same_keys_under_default_name(self, db_session):
+        await db_session['users'].create_index('email')
+
+        result = await UserRepository(db_session).ensure_indexes()
+
+        assert result['equivalent'] == {'email': 'email_1'}
+
+    @pytest.mark.parametrize('query', [
+        {'_id': ObjectId()},
+        {'email': 'someone@example.com'},
+        {'role': 'admin'},
+        {'avatar_file_key': {'$in': ['a/a.png', 'b/b.png']}},
+    ])
+    async def test_user_queries_use_indexes(self, indexed_db, query):
+        explain = await indexed_db['users'].find(query).explain()
+        _assert_no_collscan(explain)
+
+    async def test_referenced_avatar_lookup_uses_index(self, indexed_db):
+        explain = await indexed_db.command({
+            'explain': {
+                'distinct': 'users',
+                'key': 'avatar_file_key',
+                'query': {'avatar_file_key': {'$in': ['a/a.png']}},
+            },
+            'verbosity': 'queryPlanner',
+        })
+        _assert_no_collscan(explain)
+
+    @pytest.mark.parametrize('file_type', ['avatar', None])
+    async def test_cleanup_queries_use_indexes(self, indexed_db, file_type):
+        cutoff = datetime.utcnow() - timedelta(hours=6)
+        collection = indexed_db['uploaded_files']
+
+        candidates = await collection.find(build_cleanup_filter(file_type, cutoff)).explain()
+        ranged = await collection.find(
+            build_cleanup_filter(file_type, cutoff, str(ObjectId()), str(ObjectId()))
+        ).explain()
+
+        _assert_no_collscan(candidates)
+        _assert_no_collscan(ranged)
+
+    @pytest.mark.parametrize('file_type', ['avatar', None])
+    async def test_cleanup_boundary_scan_needs_no_sort(self, indexed_db, file_type):
+        collection = UploadedFileRepository(indexed_db)._get_collection()
+        await collection.insert_many([
+            {'file_key': f'k{i}', 'used_for': file_type, 'created_at': datetime.utcnow() - timedelta(days=i)}
+            for i in range(20)
+        ])
+
+        explain = await collection.find(
+            build_cleanup_filter(file_type, datetime.utcnow() - timedelta(hours=6)), {'_id': 1}
+        ).sort('_id', 1).hint(CLEANUP_SCAN_INDEX).explain()
+
+        stages = _plan_stages(explain['queryPlanner']['winningPlan'])
+        assert 'IXSCAN' in stages, stages
+        assert 'COLLSCAN' not in stages and 'SORT' not in stages, stages
+
+    async def test_uploaded_file_lookups_use_indexes(self, indexed_db):
+        collection = indexed_db['uploaded_files']
+
+        by_key = await collection.find({'file_key': 'uuid/a.png'}).explain()
+        by_owner = await collection.find({'owner_id': 'user-1'}).sort('_id', 1).explain()
+
+        _assert_no_collscan(by_key)
+        _assert_no_collscan(by_owner)
@@ -0,0 +1,66 @@
+import pytest
+
+from src.models.domain import UploadedFile
+from src.repositories.uploaded_file_repository import UploadedFileRepository
+
+
+def _uploaded_file(file_key: str, owner_id: str = 'user-1', blob_key: str = None) -> UploadedFile:
+    return UploadedFile(
+        file_key=file_key,
+        owner_id=owner_id,
+        original_filename=file_key.split('/')[-1],
+        file_size=10,
+        blob_key=blob_key,
+    )
+
+
+@pytest.mark.integration
+class TestUploadedFileRepository:
+    async def test_delete_by_file_key(self, db_session):
+        """Test deleting a record by its storage key."""
+        repo = UploadedFileRepository(db_session)
+        await repo.create(_uploaded_file('uuid-1/a.png'))
+
+        assert await repo.delete_by_file_key('uuid-1/a.png') is True
+        assert await repo.get_by_file_key('uuid-1/a.png') is None
+        assert await repo.delete_by_file_key('uuid-1/a.png') is False
+
+    async def test_delete_many_by_file_keys(self, db_session):
+        """Test bulk deletion only removes the given keys."""
+        repo = UploadedFileRepository(db_session)
+        for key in ('uuid-1/a.png', 'uuid-2/b.png', 'uuid-3/c.png'):
+            await repo.create(_uploaded_file(key))
+
+        deleted = await repo.delete_many_by_file_keys(['uuid-1/a.png', 'uuid-3/c.png', 'missing/x.png'])
+
+        assert deleted == 2
+        assert await repo.get_by_file_key('uuid-2/b.png') is not None
+        assert await repo.get_by_file_key('uuid-1/a.png') is None
+
+    async def test_get_page_by_owner(self, db_session):
+        """Test keyset pagination of an owner's files."""
+        repo = UploadedFileRepository(db_session)
+        for index in range(3):
+            await repo.create(_uploaded_file(f'uuid-{index}/a.png'))
+        await repo.create(_uploaded_file('other/a.png', owner_id='user-2'))
+
+        first = await repo.get_page_by_owner('user-1', limit=2)
+        second = await repo.get_page_by_owner('user-1', limit=2, cursor=first.next_cursor)
+
+        assert [f.file_key for f in first.items] == ['uuid-0/a.png', 'uuid-1/a.png']
+        assert [f.file_key for f in second.items] == ['uuid-2/a.png']
+        assert second.next_cursor is None
+
+    async def test_blob_reference_lookups(self, db_session):
+        """Test resolving blob keys and finding blobs that are still referenced."""
+        repo = UploadedFileRepository(db_session)
+        await repo.create(_uploaded_file('uuid-1/a.png', blob_key='blobs/aaa'))
+        await repo.create(_uploaded_file('uuid-2/b.png', blob_key='blobs/aaa'))
+        await repo.create(_uploaded_file('uuid-3/c.png'))
+
+        blob_keys = await repo.get_blob_keys(['uuid-1/a.png', 'uuid-3/c.png'])
+        await repo.delete_by_file_key('uuid-1/a.png')
+        referenced = await repo.find_referenced_blob_keys(['blobs/aaa', 'blobs/bbb'])
+
+        assert blob_keys == {'uuid-1/a.png': 'blobs/aaa'}
+        assert referenced == {'blobs/aaa'}
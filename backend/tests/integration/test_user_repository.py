@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime
 
-from src.models.domain import User
+from src.models.domain import User, UserIdentity, UserSummary
 from src.repositories.user_repository import UserRepository
 from src.services.password import hash_password
 
@@ -101,3 +101,87 @@ class TestUserRepository:
         assert deleted is True
         found_user = await user_repository.get_by_id(created_user.id)
         assert found_user is None
+
+    async def test_get_page_follows_cursor(
+        self, user_repository: UserRepository, five_user_payloads: list
+    ):
+        """Test keyset pagination walks all users exactly once."""
+        created_ids = []
+        for payload in five_user_payloads:
+            user = User(
+                email=payload['email'],
+                name=payload['name'],
+                hashed_password=hash_password(payload['password']),
+                created_at=datetime.utcnow(),
+            )
+            created_ids.append((await user_repository.create(user)).id)
+
+        first = await user_repository.get_page(limit=3)
+        assert len(first.items) == 3
+        assert first.next_cursor is not None
+        second = await user_repository.get_page(limit=3, cursor=first.next_cursor)
+        assert len(second.items) == 2
+        assert second.next_cursor is None
+        assert [u.id for u in first.items + second.items] == created_ids
+
+    async def test_find_referenced_avatar_keys(
+        self, user_repository: UserRepository, five_user_payloads: list
+    ):
+        """Test batch lookup returns only keys referenced as avatars."""
+        for index, payload in enumerate(five_user_payloads[:2]):
+            user = User(
+                email=payload['email'],
+                name=payload['name'],
+                hashed_password=hash_password(payload['password']),
+                avatar_file_key=f'avatar-{index}/a.png',
+                created_at=datetime.utcnow(),
+            )
+            await user_repository.create(user)
+        referenced = await user_repository.find_referenced_avatar_keys(
+            ['avatar-0/a.png', 'avatar-1/a.png', 'orphan/a.png']
+        )
+        assert referenced == {'avatar-0/a.png', 'avatar-1/a.png'}
+
+    async def test_create_and_update_match_stored_document(
+        self, user_repository: UserRepository, user_payload: dict
+    ):
+        """Test entities returned by writes match what a fresh read returns."""
+        user = User(
+            email=user_payload['email'],
+            name=user_payload['name'],
+            hashed_password=hash_password(user_payload['password']),
+            avatar_file_key='uuid/avatar.png',
+            created_at=datetime.utcnow(),
+        )
+        created_user = await user_repository.create(user)
+        assert created_user == await user_repository.get_by_id(created_user.id)
+
+        created_user.avatar_file_key = None
+        updated_user = await user_repository.update(created_user.id, created_user)
+        assert updated_user.avatar_file_key is None
+        assert updated_user == await user_repository.get_by_id(created_user.id)
+
+        unchanged_user = await user_repository.update(created_user.id, updated_user)
+        assert unchanged_user == updated_user
+
+    async def test_projection_returns_partial_models(
+        self, user_repository: UserRepository, user_payload: dict
+    ):
+        """Test projected reads only load the partial model's fields."""
+        user = User(
+            email=user_payload['email'],
+            name=user_payload['name'],
+            hashed_password=hash_password(user_payload['password']),
+            role='admin',
+            created_at=datetime.utcnow(),
+        )
+        created_user = await user_repository.create(user)
+
+        identity = await user_repository.get_by_id(created_user.id, projection=UserIdentity)
+        assert identity == UserIdentity(
+            id=created_user.id, email=user.email, name=user.name, role='admin'
+        )
+
+        summaries = await user_repository.find_many({}, projection=UserSummary)
+        assert [summary.id for summary in summaries] == [created_user.id]
+        assert not hasattr(summaries[0], 'hashed_password')
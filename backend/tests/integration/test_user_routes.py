@@ -169,6 +169,52 @@ class TestUserRoutes:
         assert isinstance(data2, list)
         assert len(data2) <= 2
 
+    async def test_list_users_cursor_pagination(
+        self, client: AsyncClient, admin_client: AsyncClient, five_user_payloads: list
+    ):
+        """Test user list keyset pagination via the X-Next-Cursor header."""
+        for payload in five_user_payloads:
+            await client.post(
+                '/api/users',
+                json={
+                    'email': payload['email'],
+                    'name': payload['name'],
+                    'password': payload['password'],
+                },
+            )
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = await admin_client.get('/api/users', params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data) <= 2
+            seen.extend(user['id'] for user in data)
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen))
+        assert len(seen) >= 6
+
+    async def test_list_users_invalid_cursor(self, admin_client: AsyncClient):
+        """Test malformed cursor is rejected."""
+        response = await admin_client.get('/api/users', params={'cursor': 'bogus'})
+        assert response.status_code == 400
+
+    async def test_list_users_rejects_skip_with_cursor(self, admin_client: AsyncClient):
+        """Test skip and cursor cannot be combined."""
+        first = await admin_client.get('/api/users', params={'limit': 1})
+        cursor = first.headers.get('X-Next-Cursor') or 'bogus'
+        response = await admin_client.get('/api/users', params={'skip': 1, 'cursor': cursor})
+        assert response.status_code == 400
+        assert response.json()['detail'] in (
+            'Use either skip or cursor for pagination, not both',
+            'errors.pagination.skip_with_cursor',
+        )
+
     async def test_admin_create_user_duplicate_email(
         self, admin_client: AsyncClient, test_user: dict, user_payload: dict
     ):
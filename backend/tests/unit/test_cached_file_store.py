@@ -0,0 +1,162 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.storage.cached_file_store import CachedFileStore, DiskBlobCache, MemoryBlobCache, _write_atomic
+from src.storage.local_file_store import LocalFileStore
+
+
+def lookups(tier, result):
+    return REGISTRY.get_sample_value('file_cache_lookups_total', {'tier': tier, 'result': result}) or 0
+
+
+def served(source):
+    return REGISTRY.get_sample_value('file_cache_served_bytes_total', {'source': source}) or 0
+
+
+class CountingStore(LocalFileStore):
+    def __init__(self, base_path):
+        super().__init__(base_path)
+        self.retrieves = 0
+
+    async def retrieve(self, key):
+        self.retrieves += 1
+        return await super().retrieve(key)
+
+
+@pytest.fixture
+def backend():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield CountingStore(tmpdir)
+
+
+@pytest.fixture
+def disk_cache():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield DiskBlobCache(tmpdir, max_bytes=1024, max_entry_size=512)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCachedFileStore:
+    async def test_second_read_is_served_from_memory(self, backend):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=512))
+        await store.store('a/file.txt', b'hello')
+        hits, memory_bytes = lookups('memory', 'hit'), served('memory')
+
+        assert await store.retrieve('a/file.txt') == b'hello'
+        assert await store.retrieve('a/file.txt') == b'hello'
+
+        assert backend.retrieves == 1
+        assert lookups('memory', 'hit') == hits + 1
+        assert served('memory') == memory_bytes + 5
+
+    async def test_stat_does_not_read_body(self, backend):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=512))
+        await store.store('a/file.txt', b'0123456789')
+
+        info = await store.stat('a/file.txt')
+
+        assert info == await backend.stat('a/file.txt')
+        assert backend.retrieves == 0
+        assert store.memory_cache.size == 0
+
+    async def test_range_read_fills_cache_and_stat_uses_it(self, backend):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=512))
+        await store.store('a/file.txt', b'0123456789')
+
+        chunks = [chunk async for chunk in store.iter_range('a/file.txt', 2, 7, chunk_size=4)]
+        info = await store.stat('a/file.txt')
+        again = [chunk async for chunk in store.iter_range('a/file.txt', 0, 1)]
+
+        assert chunks == [b'2345', b'67']
+        assert again == [b'01']
+        assert info.size == 10
+        assert backend.retrieves == 1
+        assert store.get_local_path('a/file.txt') is None
+
+    async def test_large_files_bypass_the_cache(self, backend):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=4))
+        await store.store('a/large.txt', b'0123456789')
+
+        assert await store.retrieve('a/large.txt') == b'0123456789'
+        assert [chunk async for chunk in store.iter_range('a/large.txt')] == [b'0123456789']
+        assert store.memory_cache.size == 0
+        assert store.get_local_path('a/large.txt') == backend.get_local_path('a/large.txt')
+
+    async def test_delete_invalidates_entry(self, backend):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=512))
+        await store.store('a/file.txt', b'hello')
+        await store.retrieve('a/file.txt')
+
+        assert await store.delete('a/file.txt') is True
+        assert await store.retrieve('a/file.txt') is None
+        assert await store.exists('a/file.txt') is False
+
+    async def test_memory_cache_evicts_least_recently_used(self):
+        cache = MemoryBlobCache(max_bytes=10, max_entry_size=10)
+        cache.put('a', b'aaaa', None)
+        cache.put('b', b'bbbb', None)
+        cache.get('a')
+        cache.put('c', b'cccc', None)
+
+        assert cache.contains('a') and cache.contains('c')
+        assert not cache.contains('b')
+        assert cache.size == 8
+
+    async def test_disk_tier_serves_after_memory_eviction(self, backend, disk_cache):
+        store = CachedFileStore(backend, MemoryBlobCache(max_bytes=1024, max_entry_size=512), disk_cache)
+        await store.store('a/file.txt', b'hello')
+        await store.retrieve('a/file.txt')
+        store.memory_cache.clear()
+        disk_bytes = served('disk')
+
+        assert await store.retrieve('a/file.txt') == b'hello'
+        assert backend.retrieves == 1
+        assert served('disk') == disk_bytes + 5
+        assert store.memory_cache.contains('a/file.txt')
+
+    async def test_disk_tier_is_bounded_and_invalidated(self, disk_cache):
+        await disk_cache.put('a', b'x' * 500, None)
+        await disk_cache.put('b', b'y' * 500, None)
+        await disk_cache.put('c', b'z' * 500, None)
+
+        assert await disk_cache.get('a') is None
+        assert disk_cache.size == 1000
+        assert len(list(disk_cache.path.iterdir())) == 2
+
+        await disk_cache.evict('b')
+
+        assert await disk_cache.get('b') is None
+        assert len(list(disk_cache.path.iterdir())) == 1
+
+    async def test_disk_entry_evicted_during_read_is_a_miss(self, disk_cache):
+        await disk_cache.put('a', b'x' * 100, None)
+        await disk_cache.put('b', b'y' * 100, None)
+        run = disk_cache._run
+
+        async def read_while_evicting(func, *args):
+            result = await run(func, *args)
+            # A delete of the key drops the entry while the read is in flight
+            disk_cache._entries.pop('a', None)
+            return result
+
+        disk_cache._run = read_while_evicting
+        assert await disk_cache.get('a') is None
+        disk_cache._run = run
+
+        assert await disk_cache.get('b') is not None
+
+    async def test_concurrent_atomic_writes_use_distinct_temp_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'entry'
+            payloads = [bytes([i]) * 4096 for i in range(8)]
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda data: _write_atomic(path, data), payloads))
+
+            assert path.read_bytes() in payloads
+            assert [p.name for p in Path(tmpdir).iterdir()] == ['entry']
@@ -0,0 +1,112 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+from src.models.domain import UploadedFile
+from src.repositories.mongo.mongo_repository import MongoRepository
+from src.tasks import ensure_indexes
+
+
+class FakeIndexCursor:
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for index in self.indexes:
+            yield index
+
+
+class FakeCollection:
+    def __init__(self, existing):
+        self.existing = existing
+        self.dropped = []
+        self.created = []
+
+    def list_indexes(self):
+        return FakeIndexCursor(self.existing)
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+
+    async def create_indexes(self, indexes):
+        self.created.extend(index.document['name'] for index in indexes)
+        return [index.document['name'] for index in indexes]
+
+
+class FakeDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+class IndexedRepository(MongoRepository[UploadedFile, str]):
+    indexes = [
+        IndexModel([('file_key', ASCENDING)], name='file_key'),
+        IndexModel([('owner_id', ASCENDING), ('_id', ASCENDING)], name='owner_id__id'),
+    ]
+
+    def __init__(self, db):
+        super().__init__(db, 'uploaded_files', UploadedFile)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEnsureIndexes:
+    async def test_ensure_indexes_creates_rebuilds_and_reports(self):
+        collection = FakeCollection([
+            {'name': '_id_', 'key': {'_id': 1}},
+            {'name': 'owner_id__id', 'key': {'owner_id': 1}},
+            {'name': 'legacy', 'key': {'legacy': 1}},
+        ])
+        repo = IndexedRepository(FakeDatabase(collection))
+
+        result = await repo.ensure_indexes()
+
+        assert result['indexes'] == ['file_key', 'owner_id__id']
+        assert result['rebuilt'] == ['owner_id__id']
+        assert result['undeclared'] == ['legacy']
+        assert collection.dropped == ['owner_id__id']
+        assert result['equivalent'] == {}
+
+    async def test_ensure_indexes_skips_same_keys_under_another_name(self):
+        collection = FakeCollection([
+            {'name': '_id_', 'key': {'_id': 1}},
+            {'name': 'file_key_1', 'key': {'file_key': 1}},
+        ])
+        repo = IndexedRepository(FakeDatabase(collection))
+
+        result = await repo.ensure_indexes()
+
+        assert collection.created == ['owner_id__id']
+        assert result['equivalent'] == {'file_key': 'file_key_1'}
+        assert result['undeclared'] == []
+        assert collection.dropped == []
+
+    async def test_run_ensure_indexes_reconciles_every_repository(self, monkeypatch):
+        class FakeRepository:
+            def __init__(self, name):
+                self.collection_name = name
+
+            async def ensure_indexes(self):
+                return {'indexes': [f'{self.collection_name}_idx'], 'rebuilt': [], 'undeclared': [], 'equivalent': {}}
+
+        async def fake_connect():
+            return None
+
+        monkeypatch.setattr(ensure_indexes.DatabaseConnection, 'get_db', lambda: None)
+        monkeypatch.setattr(ensure_indexes.DatabaseConnection, 'connect', fake_connect)
+        monkeypatch.setattr(
+            ensure_indexes,
+            'get_indexed_repositories',
+            lambda: [FakeRepository('users'), FakeRepository('uploaded_files')]
+        )
+
+        result = await ensure_indexes._run_ensure_indexes('corr-id', 'task-id')
+
+        assert result['status'] == 'completed'
+        assert result['collections']['users']['indexes'] == ['users_idx']
+        assert set(result['collections']) == {'users', 'uploaded_files'}
@@ -1,8 +1,10 @@
+import asyncio
 from datetime import datetime
 
 import pytest
+from bson import ObjectId
 
-from src.models.domain import UploadedFile
+from src.models.domain import UploadedFile, UploadedFileRef
 from src.tasks.file_cleanup.handlers import (
     AvatarFileCleanupHandler,
     DefaultFileCleanupHandler,
@@ -16,23 +18,63 @@ class FakeUploadedFileRepository:
         self.last_filter = None
         self.last_skip = None
         self.last_limit = None
+        self.last_projection = None
 
-    async def find_many(self, filter, skip=0, limit=100):
+    async def find_many(self, filter, skip=0, limit=100, projection=None):
         self.last_filter = filter
         self.last_skip = skip
         self.last_limit = limit
+        self.last_projection = projection
         return self.files
 
 
 class FakeFileStorageService:
-    def __init__(self, delete_results=None, error_keys=None):
+    def __init__(self, delete_results=None):
         self.delete_results = delete_results or {}
-        self.error_keys = set(error_keys or [])
+        self.deleted_batches = []
+        self.last_concurrency = None
+        self.last_blob_keys = None
 
-    async def delete_file(self, key):
-        if key in self.error_keys:
-            raise RuntimeError('delete failed')
-        return self.delete_results.get(key, True)
+    async def delete_files(self, keys, concurrency=16, blob_keys=None):
+        self.deleted_batches.append(list(keys))
+        self.last_concurrency = concurrency
+        self.last_blob_keys = blob_keys
+        return {key: self.delete_results.get(key, True) for key in keys}
+
+
+class FakeUserRepository:
+    def __init__(self, avatar_keys):
+        self.avatar_keys = set(avatar_keys)
+        self.calls = []
+
+    async def find_referenced_avatar_keys(self, file_keys):
+        self.calls.append(list(file_keys))
+        return self.avatar_keys.intersection(file_keys)
+
+
+class SlowFileStorageService(FakeFileStorageService):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def delete_files(self, keys, concurrency=16, blob_keys=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().delete_files(keys, concurrency, blob_keys)
+
+
+class FailingUserRepository(FakeUserRepository):
+    def __init__(self, failing_keys):
+        super().__init__([])
+        self.failing_keys = failing_keys
+
+    async def find_referenced_avatar_keys(self, file_keys):
+        if self.failing_keys.intersection(file_keys):
+            raise ConnectionError('lookup failed')
+        return await super().find_referenced_avatar_keys(file_keys)
 
 
 class StubCleanupHandler(FileCleanupHandler):
@@ -78,7 +120,7 @@ class TestFileCleanupHandler:
         storage = FakeFileStorageService(delete_results={'deleted-file': True, 'failed-file': False})
         handler = StubCleanupHandler(repo, storage, {'used-file': True})
 
-        result = await handler.cleanup_files(max_age_hours=6, skip=0, limit=10)
+        result = await handler.cleanup_files(max_age_hours=6, limit=10)
 
         assert result['processed'] == 3
         assert result['deleted'] == 1
@@ -87,6 +129,88 @@ class TestFileCleanupHandler:
         assert repo.last_skip == 0
         assert repo.last_limit == 10
         assert repo.last_filter['used_for'] == 'avatar'
+        assert '_id' not in repo.last_filter
+        assert repo.last_projection is UploadedFileRef
+        assert storage.deleted_batches == [['deleted-file', 'failed-file']]
+
+    async def test_avatar_handler_resolves_used_files_in_one_query(self):
+        files = [
+            UploadedFile(
+                file_key=f'avatar-{i}',
+                owner_id='user-1',
+                original_filename=f'{i}.png',
+                file_size=10,
+                created_at=datetime.utcnow()
+            )
+            for i in range(4)
+        ]
+        user_repo = FakeUserRepository(['avatar-1', 'avatar-3'])
+        storage = FakeFileStorageService()
+        handler = AvatarFileCleanupHandler(
+            FakeUploadedFileRepository(files),
+            storage,
+            user_repo,
+            delete_concurrency=4
+        )
+
+        result = await handler.cleanup_files(max_age_hours=6, limit=10)
+
+        assert user_repo.calls == [['avatar-0', 'avatar-1', 'avatar-2', 'avatar-3']]
+        assert storage.deleted_batches == [['avatar-0', 'avatar-2']]
+        assert storage.last_concurrency == 4
+        assert result['deleted'] == 2
+        assert result['skipped'] == 2
+        assert result['failed'] == 0
+
+    async def test_cleanup_passes_blob_keys_of_content_addressed_files(self):
+        files = [
+            UploadedFileRef(id=str(ObjectId()), file_key='doc-1', blob_key='blobs/abc'),
+            UploadedFileRef(id=str(ObjectId()), file_key='doc-2'),
+        ]
+        storage = FakeFileStorageService()
+        handler = StubCleanupHandler(FakeUploadedFileRepository(files), storage, {})
+
+        result = await handler.cleanup_files(max_age_hours=6, limit=10)
+
+        assert storage.deleted_batches == [['doc-1', 'doc-2']]
+        assert storage.last_blob_keys == {'doc-1': 'blobs/abc'}
+        assert result['deleted'] == 2
+
+    async def test_cleanup_runs_batches_concurrently(self):
+        files = [UploadedFileRef(id=str(ObjectId()), file_key=f'file-{i}') for i in range(10)]
+        storage = SlowFileStorageService()
+        user_repo = FakeUserRepository(['file-0', 'file-5'])
+        handler = AvatarFileCleanupHandler(
+            FakeUploadedFileRepository(files),
+            storage,
+            user_repo,
+            delete_concurrency=8,
+            batch_size=3,
+            batch_concurrency=2
+        )
+
+        result = await handler.cleanup_files(max_age_hours=6, limit=10)
+
+        assert sorted(len(batch) for batch in user_repo.calls) == [1, 3, 3, 3]
+        assert storage.max_in_flight == 2
+        assert storage.last_concurrency == 4
+        assert result == {'file_type': 'avatar', 'processed': 10, 'deleted': 8, 'skipped': 2, 'failed': 0}
+
+    async def test_failing_batch_counts_its_files_as_failed(self):
+        files = [UploadedFileRef(id=str(ObjectId()), file_key=f'file-{i}') for i in range(4)]
+        storage = FakeFileStorageService()
+        handler = AvatarFileCleanupHandler(
+            FakeUploadedFileRepository(files),
+            storage,
+            FailingUserRepository({'file-2'}),
+            batch_size=2
+        )
+
+        result = await handler.cleanup_files(max_age_hours=6, limit=10)
+
+        assert storage.deleted_batches == [['file-0', 'file-1']]
+        assert result['deleted'] == 2
+        assert result['failed'] == 2
 
     async def test_avatar_handler_requires_repository_for_usage_check(self):
         handler = AvatarFileCleanupHandler(
@@ -102,13 +226,38 @@ class TestFileCleanupHandler:
         )
         assert await handler.is_file_used(file_record) is False
 
+    async def test_avatar_handler_is_file_used_uses_batch_lookup(self):
+        user_repo = FakeUserRepository(['avatar-file'])
+        handler = AvatarFileCleanupHandler(
+            FakeUploadedFileRepository([]),
+            FakeFileStorageService(),
+            user_repo
+        )
+        file_record = UploadedFile(
+            file_key='avatar-file',
+            owner_id='user-1',
+            original_filename='avatar.png',
+            file_size=10
+        )
+        assert await handler.is_file_used(file_record) is True
+        assert user_repo.calls == [['avatar-file']]
+
     async def test_default_handler_filters_untyped_files(self):
         repo = FakeUploadedFileRepository([])
         handler = DefaultFileCleanupHandler(repo, FakeFileStorageService())
 
-        result = await handler.cleanup_files(max_age_hours=6, skip=5, limit=20)
+        start_id = str(ObjectId())
+        end_id = str(ObjectId())
+
+        result = await handler.cleanup_files(
+            max_age_hours=6, start_id=start_id, end_id=end_id, limit=20
+        )
 
         assert result['file_type'] == 'untyped'
-        assert repo.last_skip == 5
+        assert repo.last_skip == 0
         assert repo.last_limit == 20
-        assert '$or' in repo.last_filter
+        assert repo.last_filter['used_for'] is None
+        assert repo.last_filter['_id'] == {
+            '$gte': ObjectId(start_id),
+            '$lt': ObjectId(end_id),
+        }
@@ -1,17 +1,49 @@
 import pytest
+from bson import ObjectId
 
 from src.tasks.file_cleanup.pagination import create_cleanup_chunks, get_file_count_for_cleanup
 
 
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.sort_spec = None
+        self.hint_spec = None
+
+    def sort(self, key, direction):
+        self.sort_spec = (key, direction)
+        return self
+
+    def hint(self, index):
+        self.hint_spec = index
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
 class FakeCollection:
     def __init__(self, count):
         self.count = count
+        self.ids = sorted(ObjectId() for _ in range(count))
         self.last_filter = None
+        self.last_projection = None
+        self.last_cursor = None
 
     async def count_documents(self, filter_query):
         self.last_filter = filter_query
         return self.count
 
+    def find(self, filter_query, projection=None):
+        self.last_filter = filter_query
+        self.last_projection = projection
+        self.last_cursor = FakeCursor([{'_id': object_id} for object_id in self.ids])
+        return self.last_cursor
+
 
 class FakeUploadedFileRepository:
     def __init__(self, count):
@@ -31,12 +63,26 @@ class TestFileCleanupPagination:
         assert count == 7
         assert repo.collection.last_filter['used_for'] == 'avatar'
 
-    async def test_create_cleanup_chunks_builds_expected_chunks(self):
+    async def test_create_cleanup_chunks_builds_id_ranges(self):
         repo = FakeUploadedFileRepository(5)
+        ids = [str(object_id) for object_id in repo.collection.ids]
         chunks = await create_cleanup_chunks(repo, None, 6, chunk_size=2)
 
         assert len(chunks) == 3
-        assert chunks[0]['skip'] == 0
-        assert chunks[1]['skip'] == 2
-        assert chunks[2]['skip'] == 4
+        assert [(c['start_id'], c['end_id']) for c in chunks] == [
+            (ids[0], ids[2]),
+            (ids[2], ids[4]),
+            (ids[4], None),
+        ]
+        assert all(c['limit'] == 2 for c in chunks)
         assert chunks[0]['file_type'] is None
+        assert repo.collection.last_filter['used_for'] is None
+        assert repo.collection.last_projection == {'_id': 1}
+        assert repo.collection.last_cursor.sort_spec == ('_id', 1)
+        assert repo.collection.last_cursor.hint_spec == [('used_for', 1), ('_id', 1)]
+
+    async def test_create_cleanup_chunks_empty_when_nothing_to_clean(self):
+        repo = FakeUploadedFileRepository(0)
+        chunks = await create_cleanup_chunks(repo, 'avatar', 6, chunk_size=2)
+
+        assert chunks == []
@@ -0,0 +1,33 @@
+import pytest
+
+from src.routes.files import UNSATISFIABLE_RANGE, _etag_matches, _parse_byte_range
+
+
+@pytest.mark.unit
+class TestByteRangeParsing:
+    @pytest.mark.parametrize('header, expected', [
+        ('bytes=0-99', (0, 99)),
+        ('bytes=100-', (100, 999)),
+        ('bytes=-200', (800, 999)),
+        ('bytes=900-5000', (900, 999)),
+        ('bytes=-5000', (0, 999)),
+        ('bytes=1000-', UNSATISFIABLE_RANGE),
+        ('bytes=-0', UNSATISFIABLE_RANGE),
+        ('bytes=0-1,5-9', None),
+        ('items=0-1', None),
+        ('bytes=abc', None),
+        ('bytes=9-1', None),
+    ])
+    def test_parse_byte_range(self, header, expected):
+        assert _parse_byte_range(header, 1000) == expected
+
+    @pytest.mark.parametrize('header, expected', [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('*', True),
+        ('"xyz"', False),
+    ])
+    def test_etag_matches(self, header, expected):
+        assert _etag_matches(header, '"abc"') is expected
@@ -1,9 +1,21 @@
+import asyncio
+import io
 import tempfile
+import threading
+from unittest.mock import patch
 
 import pytest
+from fastapi import UploadFile
+from PIL import Image
 
-from src.services.file_storage_service import FileStorageService
+from src.services.file_storage_service import (
+    VARIANT_PUBLISH_RETRY_POLICY,
+    FileStorageService,
+    choose_upload_chunk_size,
+)
 from src.storage.local_file_store import LocalFileStore
+from src.storage.base import FileStorage
+from src.services.image_variants import render_image_variants
 
 
 class AsyncBytesReader:
@@ -100,6 +112,35 @@ class TestFileStorageService:
         
         assert retrieved == file_data
     
+    async def test_stream_file_range(self, file_storage_service: FileStorageService):
+        """Test streaming a byte range in bounded chunks."""
+        file_data = bytes(range(256)) * 4
+        key = await file_storage_service.store_file(file_data=file_data, original_filename='data.bin')
+        
+        chunks = [
+            chunk async for chunk in file_storage_service.stream_file(key, start=10, end=700, chunk_size=100)
+        ]
+        whole = b''.join([chunk async for chunk in file_storage_service.stream_file(key)])
+        
+        assert b''.join(chunks) == file_data[10:701]
+        assert max(len(chunk) for chunk in chunks) == 100
+        assert whole == file_data
+    
+    async def test_get_file_info(self, file_storage_service: FileStorageService):
+        """Test file metadata is read without the content and the ETag changes with it."""
+        key = await file_storage_service.store_file(file_data=b'first', original_filename='a.txt')
+        
+        info = await file_storage_service.get_file_info(key)
+        await file_storage_service.file_storage.store(key, b'second version')
+        changed = await file_storage_service.get_file_info(key)
+        
+        assert info.size == 5
+        assert info.etag.startswith('"')
+        assert changed.size == 14
+        assert changed.etag != info.etag
+        assert await file_storage_service.get_file_info('missing/file.txt') is None
+        assert file_storage_service.get_local_file_path(key).read_bytes() == b'second version'
+    
     async def test_retrieve_file_not_found(self, file_storage_service: FileStorageService):
         """Test retrieving non-existent file."""
         retrieved = await file_storage_service.retrieve_file('nonexistent_key')
@@ -209,4 +250,352 @@ class TestFileStorageService:
 
         exists = await file_storage_service.file_exists(custom_key)
         assert exists is False
+
+    @pytest.mark.parametrize('rolled_to_disk', [False, True])
+    async def test_store_file_stream_reads_upload_file_into_reused_buffer(self, temp_storage, rolled_to_disk):
+        """Test UploadFile content is stored intact through the readinto path."""
+        file_data = bytes(range(256)) * 2048
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024 if rolled_to_disk else len(file_data) * 2)
+        spooled.write(file_data)
+        spooled.seek(0)
+        upload = UploadFile(spooled, size=len(file_data), filename='data.bin')
+        file_storage_service = FileStorageService(
+            temp_storage, min_upload_chunk_size=4096, max_upload_chunk_size=65536
+        )
+
+        key, size = await file_storage_service.store_file_stream(
+            file_stream=upload,
+            original_filename='data.bin',
+            expected_size=upload.size
+        )
+
+        assert size == len(file_data)
+        assert await file_storage_service.retrieve_file(key) == file_data
+
+    @pytest.mark.parametrize('expected_size, chunk_size', [
+        (None, 64 * 1024),
+        (0, 64 * 1024),
+        (100, 64 * 1024),
+        (2 * 1024 * 1024, 128 * 1024),
+        (3 * 1024 * 1024, 256 * 1024),
+        (10 * 1024 * 1024, 1024 * 1024),
+        (1024 * 1024 * 1024, 1024 * 1024),
+    ])
+    async def test_choose_upload_chunk_size(self, expected_size, chunk_size):
+        assert choose_upload_chunk_size(expected_size) == chunk_size
+
+    @pytest.mark.parametrize('file_size, threaded', [(1000, False), (100 * 1024, True)])
+    async def test_only_uploads_larger_than_a_chunk_are_read_in_a_thread(
+        self, temp_storage, monkeypatch, file_size, threaded
+    ):
+        thread_calls = []
+        to_thread = asyncio.to_thread
+
+        async def tracking_to_thread(func, *args):
+            thread_calls.append(func)
+            return await to_thread(func, *args)
+
+        monkeypatch.setattr('src.services.file_storage_service.asyncio.to_thread', tracking_to_thread)
+        upload = make_upload(b'x' * file_size)
+
+        await FileStorageService(temp_storage).store_file_stream(
+            file_stream=upload,
+            original_filename='data.bin',
+            expected_size=upload.size
+        )
+
+        assert bool(thread_calls) is threaded
     
+
+
+class RecordingUploadedFileRepository:
+    def __init__(self):
+        self.deleted_key_batches = []
+
+    async def delete_many_by_file_keys(self, file_keys):
+        self.deleted_key_batches.append(list(file_keys))
+        return len(file_keys)
+
+
+class ConcurrencyTrackingStorage:
+    def __init__(self, missing_keys=(), error_keys=()):
+        self.missing_keys = set(missing_keys)
+        self.error_keys = set(error_keys)
+        self.active = 0
+        self.max_active = 0
+
+    async def delete(self, key):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if key in self.error_keys:
+                raise RuntimeError('delete failed')
+            return key not in self.missing_keys
+        finally:
+            self.active -= 1
+
+    delete_many = FileStorage.delete_many
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFileStorageServiceBulkDelete:
+    async def test_delete_files_bounds_concurrency_and_removes_records_once(self):
+        storage = ConcurrencyTrackingStorage(missing_keys={'k3'}, error_keys={'k4'})
+        repo = RecordingUploadedFileRepository()
+        service = FileStorageService(storage, repo)
+        keys = [f'k{i}' for i in range(10)]
+
+        results = await service.delete_files(keys, concurrency=3)
+
+        assert storage.max_active == 3
+        assert results['k3'] is False
+        assert results['k4'] is False
+        assert sum(results.values()) == 8
+        assert repo.deleted_key_batches == [[k for k in keys if k not in ('k3', 'k4')]]
+
+    async def test_delete_files_empty_input(self):
+        repo = RecordingUploadedFileRepository()
+        service = FileStorageService(ConcurrencyTrackingStorage(), repo)
+
+        assert await service.delete_files([]) == {}
+        assert repo.deleted_key_batches == []
+
+
+class InMemoryUploadedFileRepository:
+    def __init__(self):
+        self.records = {}
+
+    async def create(self, uploaded_file):
+        self.records[uploaded_file.file_key] = uploaded_file
+        return uploaded_file
+
+    async def get_blob_keys(self, file_keys):
+        return {
+            key: self.records[key].blob_key
+            for key in file_keys
+            if key in self.records and self.records[key].blob_key
+        }
+
+    async def find_referenced_blob_keys(self, blob_keys):
+        return {record.blob_key for record in self.records.values() if record.blob_key in blob_keys}
+
+    async def delete_by_file_key(self, file_key):
+        return self.records.pop(file_key, None) is not None
+
+    async def delete_many_by_file_keys(self, file_keys):
+        return sum([await self.delete_by_file_key(key) for key in file_keys])
+
+
+class WriteCountingStorage(LocalFileStore):
+    def __init__(self, base_path):
+        super().__init__(base_path)
+        self.stream_writes = 0
+
+    async def store_stream(self, key, file_stream, content_type=None):
+        self.stream_writes += 1
+        return await super().store_stream(key, file_stream, content_type)
+
+
+def make_upload(data: bytes, filename: str = 'data.bin') -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile()
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(spooled, size=len(data), filename=filename)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFileStorageServiceContentAddressed:
+    @pytest.fixture
+    def storage(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield WriteCountingStorage(tmpdir)
+
+    @pytest.fixture
+    def repo(self):
+        return InMemoryUploadedFileRepository()
+
+    @pytest.fixture
+    def service(self, storage, repo):
+        return FileStorageService(storage, repo, content_addressed=True)
+
+    async def test_duplicate_uploads_share_one_blob(self, service, storage, repo):
+        first, _ = await service.store_file_stream(make_upload(b'same'), original_filename='a.txt', owner_id='u1')
+        second, size = await service.store_file_stream(make_upload(b'same'), original_filename='b.txt', owner_id='u2')
+
+        assert first != second
+        assert size == 4
+        assert repo.records[first].blob_key == repo.records[second].blob_key
+        assert repo.records[first].blob_key.startswith('blobs/')
+        assert storage.stream_writes == 1
+        assert await service.retrieve_file(second) == b'same'
+        assert await storage.exists(first) is False
+
+    async def test_stream_without_rewind_is_staged_then_deduplicated(self, service, storage, repo):
+        await service.store_file_stream(make_upload(b'payload'), owner_id='u1', original_filename='a.bin')
+        key, _ = await service.store_file_stream(
+            AsyncBytesReader(b'payload'), owner_id='u1', original_filename='b.bin'
+        )
+
+        blob_key = repo.records[key].blob_key
+        assert await service.retrieve_file(key) == b'payload'
+        assert list((storage.base_path / 'staging').glob('*')) == []
+        assert await storage.exists(blob_key) is True
+
+    async def test_blob_is_deleted_with_last_reference(self, service, storage, repo):
+        first, _ = await service.store_file_stream(make_upload(b'same'), owner_id='u1', original_filename='a.txt')
+        second, _ = await service.store_file_stream(make_upload(b'same'), owner_id='u1', original_filename='b.txt')
+        blob_key = repo.records[first].blob_key
+
+        assert await service.delete_file(first) is True
+        assert await storage.exists(blob_key) is True
+
+        assert await service.delete_file(second) is True
+        assert await storage.exists(blob_key) is False
+        assert repo.records == {}
+
+    async def test_delete_files_releases_blobs(self, service, storage, repo):
+        keys = [
+            (await service.store_file_stream(make_upload(data), owner_id='u1', original_filename='f.txt'))[0]
+            for data in (b'one', b'one', b'two')
+        ]
+        shared_blob = repo.records[keys[0]].blob_key
+        kept_blob = repo.records[keys[2]].blob_key
+
+        results = await service.delete_files(keys[:2] + ['missing/file.txt'])
+
+        assert results == {keys[0]: True, keys[1]: True, 'missing/file.txt': False}
+        assert await storage.exists(shared_blob) is False
+        assert await storage.exists(kept_blob) is True
+        assert list(repo.records) == [keys[2]]
+
+    async def test_release_keeps_blob_referenced_after_the_count(self, service, storage, repo):
+        key, _ = await service.store_file_stream(make_upload(b'same'), owner_id='u1', original_filename='a.txt')
+        record = repo.records[key]
+        count_references = repo.find_referenced_blob_keys
+
+        async def count_then_upload(blob_keys):
+            referenced = await count_references(blob_keys)
+            if not repo.records:
+                # A concurrent upload of the same content creates its record right after
+                # the count and finds the blob still in place, so it does not write it
+                assert await storage.exists(record.blob_key) is True
+                await repo.create(record.model_copy(update={'file_key': 'u2/b.txt'}))
+            return referenced
+
+        repo.find_referenced_blob_keys = count_then_upload
+
+        assert await service.delete_file(key) is True
+        assert await storage.exists(record.blob_key) is True
+        assert await service.retrieve_file('u2/b.txt') == b'same'
+        assert list((storage.base_path / 'staging').glob('*')) == []
+
+    async def test_get_file_url_points_at_download_endpoint(self, service):
+        assert service.get_file_url('abc/my file.png') == '/api/files/abc/my%20file.png'
+
+    async def test_get_file_url_with_resolved_storage_key(self, service, repo):
+        key, _ = await service.store_file_stream(make_upload(b'same'), owner_id='u1', original_filename='a.png')
+        blob_key = await service.resolve_storage_key(key)
+
+        assert blob_key == repo.records[key].blob_key
+        assert service.get_file_url(key, storage_key=blob_key) == f'/storage/{blob_key}'
+
+
+def make_png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGBA', (width, height), (200, 40, 40, 255)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFileStorageServiceImageVariants:
+    @pytest.fixture
+    def storage(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield LocalFileStore(tmpdir)
+
+    @pytest.fixture
+    def service(self, storage):
+        return FileStorageService(storage, image_variant_sizes=[256, 64])
+
+    @pytest.fixture
+    def enqueued(self, monkeypatch):
+        calls = []
+
+        class RecordingBackend:
+            def send_task(self, task_name, *args, publish_options=None, **kwargs):
+                calls.append((task_name, args, publish_options, threading.current_thread()))
+
+        monkeypatch.setattr('src.tasks.queue.get_queue_backend', RecordingBackend)
+        return calls
+
+    async def test_render_image_variants_crops_to_square(self):
+        variants = render_image_variants(make_png(400, 300), [64, 32])
+
+        assert set(variants) == {(64, 'webp'), (64, 'jpeg'), (32, 'webp'), (32, 'jpeg')}
+        with Image.open(io.BytesIO(variants[(64, 'webp')])) as image:
+            assert (image.format, image.size) == ('WEBP', (64, 64))
+        with Image.open(io.BytesIO(variants[(32, 'jpeg')])) as image:
+            assert (image.format, image.size) == ('JPEG', (32, 32))
+
+    async def test_variant_key_picks_closest_larger_size(self, service):
+        assert service.variant_key('a/avatar.png', 48) == 'a/avatar.png.64.webp'
+        assert service.variant_key('a/avatar.png', 100, 'jpeg') == 'a/avatar.png.256.jpeg'
+        assert service.variant_key('a/avatar.png', 1024) == 'a/avatar.png.256.webp'
+        assert service.variant_key('a/report.pdf', 64) is None
+        assert FileStorageService(service.file_storage).variant_key('a/avatar.png', 64) is None
+
+    async def test_get_file_url_with_size(self, service):
+        assert service.get_file_url('a/avatar.png', size=256, variant_sizes=[64, 256]) == '/storage/a/avatar.png.256.webp'
+        assert service.get_file_url('a/avatar.png', size=256, variant_sizes=[64]) == '/storage/a/avatar.png.64.webp'
+        assert service.get_file_url('a/avatar.png') == '/storage/a/avatar.png'
+        assert service.get_file_url('a/report.pdf', size=256, variant_sizes=[256]) == '/storage/a/report.pdf'
+
+    async def test_get_file_url_falls_back_to_original_without_known_variants(self, service):
+        # Not generated yet, failed to render, or set before variants existed
+        assert service.get_file_url('a/avatar.png', size=256) == '/storage/a/avatar.png'
+        assert service.get_file_url('a/avatar.png', size=256, variant_sizes=[512]) == '/storage/a/avatar.png'
+
+    async def test_generate_and_delete_variants(self, service, storage):
+        await service.store_file(make_png(300, 300), 'image/png', custom_key='a/avatar.png')
+
+        variant_keys = await service.generate_image_variants('a/avatar.png')
+
+        assert sorted(variant_keys) == sorted(service._variant_keys('a/avatar.png'))
+        assert all([await storage.exists(key) for key in variant_keys])
+        assert await service.stored_variant_sizes('a/avatar.png') == [64, 256]
+
+        # A repeated task finds every variant and does not render again
+        with patch('src.services.file_storage_service.render_image_variants') as render:
+            assert sorted(await service.generate_image_variants('a/avatar.png')) == sorted(variant_keys)
+        render.assert_not_called()
+
+        assert await service.delete_file('a/avatar.png') is True
+        assert not any([await storage.exists(key) for key in variant_keys])
+
+    async def test_generate_variants_skips_missing_and_non_images(self, service):
+        await service.store_file(b'%PDF', 'application/pdf', custom_key='a/report.pdf')
+
+        assert await service.generate_image_variants('a/missing.png') == []
+        assert await service.generate_image_variants('a/report.pdf') == []
+        assert await service.stored_variant_sizes('a/missing.png') == []
+
+    async def test_schedule_image_variants_publishes_off_the_event_loop(self, service, enqueued):
+        assert await service.schedule_image_variants('a/avatar.png') is True
+        assert await service.schedule_image_variants('a/report.pdf') is False
+
+        [(task_name, args, publish_options, thread)] = enqueued
+        assert (task_name, args) == ('generate_image_variants', ('a/avatar.png',))
+        assert publish_options == {'retry_policy': VARIANT_PUBLISH_RETRY_POLICY}
+        assert thread is not threading.main_thread()
+
+    async def test_schedule_image_variants_survives_broker_errors(self, service, monkeypatch):
+        async def unavailable(task_name, *args, **kwargs):
+            raise ConnectionError('broker down')
+
+        monkeypatch.setattr('src.services.file_storage_service.enqueue_async', unavailable)
+
+        assert await service.schedule_image_variants('a/avatar.png') is False
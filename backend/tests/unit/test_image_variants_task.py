@@ -0,0 +1,41 @@
+import pytest
+
+from src.tasks import image_variants
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_generate_image_variants(monkeypatch):
+    class FakeUploadedFileRepository:
+        def __init__(self, db):
+            self.db = db
+
+    class FakeUserRepository:
+        marked = []
+
+        def __init__(self, db):
+            self.db = db
+
+        async def set_avatar_variant_sizes(self, file_key, sizes):
+            self.marked.append((file_key, sizes))
+            return 1
+
+    class FakeFileStorageService:
+        image_variant_sizes = [64]
+
+        def __init__(self, file_storage, repository):
+            self.repository = repository
+
+        async def generate_image_variants(self, key):
+            return [f'{key}.64.webp', f'{key}.64.jpeg']
+
+    monkeypatch.setattr(image_variants.DatabaseConnection, 'get_db', lambda: 'db')
+    monkeypatch.setattr(image_variants, 'UploadedFileRepository', FakeUploadedFileRepository)
+    monkeypatch.setattr(image_variants, 'UserRepository', FakeUserRepository)
+    monkeypatch.setattr(image_variants, 'get_file_storage', lambda: None)
+    monkeypatch.setattr(image_variants, 'get_file_storage_service', FakeFileStorageService)
+
+    result = await image_variants._run_generate_image_variants('a/avatar.png', 'corr-id', 'task-id')
+
+    assert result == {'status': 'completed', 'file_key': 'a/avatar.png', 'variants': 2}
+    assert FakeUserRepository.marked == [('a/avatar.png', [64])]
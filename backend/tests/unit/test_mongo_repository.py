@@ -0,0 +1,150 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from src.models.domain import User, UserIdentity
+from src.repositories.uploaded_file_repository import UploadedFileRepository
+from src.repositories.mongo.mongo_repository import MongoRepository
+
+
+class RecordingCollection:
+    def __init__(self, stored_doc=None):
+        self.stored_doc = stored_doc
+        self.calls = []
+
+    async def insert_one(self, data):
+        self.calls.append(('insert_one', dict(data)))
+        return SimpleNamespace(inserted_id=ObjectId())
+
+    async def find_one(self, filter, projection=None):
+        self.calls.append(('find_one', filter, projection))
+        if not self.stored_doc:
+            return None
+        if projection:
+            return {key: value for key, value in self.stored_doc.items() if key in projection}
+        return dict(self.stored_doc)
+
+    async def delete_one(self, filter):
+        self.calls.append(('delete_one', filter))
+        return SimpleNamespace(deleted_count=1 if self.stored_doc else 0)
+
+    async def find_one_and_update(self, filter, update, return_document=None):
+        self.calls.append(('find_one_and_update', filter, update, return_document))
+        if not self.stored_doc:
+            return None
+        doc = dict(self.stored_doc)
+        doc.update(update.get('$set', {}))
+        for key in update.get('$unset', {}):
+            doc.pop(key, None)
+        return doc
+
+
+class FakeDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+def make_user(**overrides):
+    data = {
+        'email': 'user@example.com',
+        'name': 'User',
+        'hashed_password': 'hashed',
+        'created_at': datetime.utcnow(),
+    }
+    data.update(overrides)
+    return User(**data)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestMongoRepositoryWrites:
+    async def test_create_returns_entity_without_reading_back(self):
+        collection = RecordingCollection()
+        repo = MongoRepository(FakeDatabase(collection), 'users', User)
+
+        created = await repo.create(make_user())
+
+        assert [call[0] for call in collection.calls] == ['insert_one']
+        assert ObjectId.is_valid(created.id)
+        assert created.email == 'user@example.com'
+        assert created.created_at.microsecond % 1000 == 0
+
+    async def test_update_uses_single_find_one_and_update(self):
+        object_id = ObjectId()
+        stored = {
+            '_id': object_id,
+            'email': 'user@example.com',
+            'name': 'User',
+            'hashed_password': 'hashed',
+            'avatar_file_key': 'old/a.png',
+        }
+        collection = RecordingCollection(stored)
+        repo = MongoRepository(FakeDatabase(collection), 'users', User)
+
+        updated = await repo.update(str(object_id), make_user(name='Renamed', avatar_file_key=None))
+
+        assert len(collection.calls) == 1
+        name, filter, update, return_document = collection.calls[0]
+        assert name == 'find_one_and_update'
+        assert filter == {'_id': object_id}
+        assert update['$unset'] == {'avatar_file_key': '', 'avatar_storage_key': ''}
+        assert return_document == ReturnDocument.AFTER
+        assert updated.id == str(object_id)
+        assert updated.name == 'Renamed'
+        assert updated.avatar_file_key is None
+
+    async def test_update_missing_document_returns_none(self):
+        collection = RecordingCollection()
+        repo = MongoRepository(FakeDatabase(collection), 'users', User)
+
+        assert await repo.update(str(ObjectId()), make_user()) is None
+
+    async def test_delete_by_file_key_is_single_query(self):
+        collection = RecordingCollection({'_id': ObjectId(), 'file_key': 'uuid/a.png'})
+        repo = UploadedFileRepository(FakeDatabase(collection))
+
+        assert await repo.delete_by_file_key('uuid/a.png') is True
+        assert collection.calls == [('delete_one', {'file_key': 'uuid/a.png'})]
+
+    async def test_delete_by_file_key_missing_record(self):
+        repo = UploadedFileRepository(FakeDatabase(RecordingCollection()))
+
+        assert await repo.delete_by_file_key('uuid/missing.png') is False
+
+    async def test_get_by_id_with_projection_loads_partial_model(self):
+        user_id = ObjectId()
+        collection = RecordingCollection({
+            '_id': user_id,
+            'email': 'user@example.com',
+            'name': 'User',
+            'hashed_password': 'hashed',
+            'role': 'admin',
+        })
+        repo = MongoRepository(FakeDatabase(collection), 'users', User)
+
+        identity = await repo.get_by_id(str(user_id), projection=UserIdentity)
+
+        assert isinstance(identity, UserIdentity)
+        assert identity.id == str(user_id)
+        assert identity.role == 'admin'
+        assert collection.calls == [(
+            'find_one',
+            {'_id': user_id},
+            {'_id': 1, 'email': 1, 'name': 1, 'role': 1},
+        )]
+
+    async def test_get_by_id_without_projection_loads_full_entity(self):
+        user_id = ObjectId()
+        collection = RecordingCollection({'_id': user_id, **make_user().model_dump(exclude_none=True)})
+        repo = MongoRepository(FakeDatabase(collection), 'users', User)
+
+        user = await repo.get_by_id(str(user_id))
+
+        assert user.hashed_password == 'hashed'
+        assert collection.calls[0][2] is None
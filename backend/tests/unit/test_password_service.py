@@ -1,5 +1,11 @@
+import asyncio
+import threading
+
 import pytest
-from src.services.password import hash_password, verify_password
+from prometheus_client import REGISTRY
+
+from src.exceptions import ServiceUnavailableException
+from src.services.password import PasswordHasher, hash_password, verify_password
 
 
 @pytest.mark.unit
@@ -35,3 +41,62 @@ class TestPasswordService:
         hashed = hash_password(password)
         
         assert verify_password('', hashed) is False
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPasswordHasher:
+    async def test_hash_and_verify_run_on_pool(self):
+        """Test that pooled hashing is compatible with the synchronous functions."""
+        hasher = PasswordHasher(max_workers=2, max_pending=4)
+
+        hashed = await hasher.hash('testpassword123')
+
+        assert verify_password('testpassword123', hashed) is True
+        assert await hasher.verify('testpassword123', hash_password('testpassword123')) is True
+        assert await hasher.verify('wrongpassword', hashed) is False
+        assert hasher.pending == 0
+
+    async def test_event_loop_keeps_running_while_hashing(self):
+        """Test that bcrypt work does not block other coroutines."""
+        hasher = PasswordHasher(max_workers=1, max_pending=4)
+        release = threading.Event()
+        hasher._executor.submit(release.wait)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not release.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        hashing = asyncio.create_task(hasher.hash('testpassword123'))
+        ticking = asyncio.create_task(ticker())
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(hashing, ticking)
+
+        assert ticks > 1
+
+    async def test_rejects_when_pool_is_full(self):
+        """Test that calls beyond max_pending are rejected instead of queued."""
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        release = threading.Event()
+        hasher._executor.submit(release.wait)
+        rejected = REGISTRY.get_sample_value(
+            'password_hash_rejected_total', {'operation': 'verify'}
+        ) or 0
+
+        queued = asyncio.create_task(hasher.hash('testpassword123'))
+        await asyncio.sleep(0)
+        assert hasher.pending == 1
+        with pytest.raises(ServiceUnavailableException):
+            await hasher.verify('testpassword123', 'hashed')
+        release.set()
+        await queued
+
+        assert REGISTRY.get_sample_value(
+            'password_hash_rejected_total', {'operation': 'verify'}
+        ) == rejected + 1
+        assert hasher.pending == 0
+
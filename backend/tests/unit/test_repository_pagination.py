@@ -0,0 +1,134 @@
+import pytest
+from bson import ObjectId
+
+from src.models.domain import UploadedFile, UploadedFileRef
+from src.repositories.mongo.mongo_repository import MongoRepository
+from src.database.pagination import decode_cursor, encode_cursor
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.sort_spec = None
+        self.limit_value = None
+
+    def sort(self, key, direction):
+        self.sort_spec = (key, direction)
+        self.docs = sorted(self.docs, key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs[:length]]
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.last_query = None
+        self.last_projection = None
+        self.last_cursor = None
+
+    def find(self, query, projection=None):
+        self.last_query = query
+        self.last_projection = projection
+        after = None
+        for clause in query.get('$and', [query]):
+            if '_id' in clause:
+                after = clause['_id']['$gt']
+        docs = [doc for doc in self.docs if after is None or doc['_id'] > after]
+        if projection:
+            docs = [{key: value for key, value in doc.items() if key in projection} for doc in docs]
+        self.last_cursor = FakeCursor(docs)
+        return self.last_cursor
+
+
+class FakeDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+def make_docs(count):
+    return [
+        {
+            '_id': ObjectId(),
+            'file_key': f'key-{i}',
+            'owner_id': 'user-1',
+            'original_filename': f'{i}.png',
+            'file_size': 10,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestKeysetPagination:
+    async def test_cursor_round_trip(self):
+        object_id = ObjectId()
+        cursor = encode_cursor(object_id)
+
+        assert str(object_id) not in cursor
+        assert decode_cursor(cursor) == object_id
+
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', '', '!!!', encode_cursor(ObjectId())[:-2]])
+    async def test_decode_cursor_rejects_malformed_tokens(self, cursor):
+        with pytest.raises(ValueError, match='errors.pagination.invalid_cursor'):
+            decode_cursor(cursor)
+
+    async def test_find_page_walks_all_documents_without_skip(self):
+        collection = FakeCollection(make_docs(5))
+        repo = MongoRepository(FakeDatabase(collection), 'uploaded_files', UploadedFile)
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = await repo.find_page({'owner_id': 'user-1'}, limit=2, cursor=cursor)
+            pages += 1
+            seen.extend(item.file_key for item in page.items)
+            assert collection.last_cursor.sort_spec == ('_id', 1)
+            assert collection.last_cursor.limit_value == 3
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+
+        assert pages == 3
+        assert seen == [f'key-{i}' for i in range(5)]
+
+    async def test_find_page_combines_filter_with_resume_point(self):
+        docs = make_docs(3)
+        collection = FakeCollection(docs)
+        repo = MongoRepository(FakeDatabase(collection), 'uploaded_files', UploadedFile)
+
+        await repo.find_page({'owner_id': 'user-1'}, limit=2, cursor=encode_cursor(docs[0]['_id']))
+
+        assert collection.last_query == {
+            '$and': [{'owner_id': 'user-1'}, {'_id': {'$gt': docs[0]['_id']}}]
+        }
+
+    async def test_get_page_returns_no_cursor_on_last_page(self):
+        collection = FakeCollection(make_docs(2))
+        repo = MongoRepository(FakeDatabase(collection), 'uploaded_files', UploadedFile)
+
+        page = await repo.get_page(limit=2)
+
+        assert len(page.items) == 2
+        assert page.next_cursor is None
+        assert collection.last_query == {}
+
+    async def test_find_page_with_projection_returns_partial_models(self):
+        collection = FakeCollection(make_docs(3))
+        repo = MongoRepository(FakeDatabase(collection), 'uploaded_files', UploadedFile)
+
+        page = await repo.find_page({}, limit=2, projection=UploadedFileRef)
+
+        assert all(isinstance(item, UploadedFileRef) for item in page.items)
+        assert collection.last_projection == {'_id': 1, 'file_key': 1, 'used_for': 1, 'blob_key': 1, 'created_at': 1}
+        assert page.next_cursor is not None
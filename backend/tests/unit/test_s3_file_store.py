@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.storage.s3_file_store import MIN_MULTIPART_PART_SIZE, S3FileStore
+
+BUCKET = 'test-bucket'
+PART_SIZE = MIN_MULTIPART_PART_SIZE
+
+
+async def stream(payload: bytes, chunk_size: int = 256 * 1024):
+    view = memoryview(payload)
+    for offset in range(0, len(payload), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+async def failing_stream(payload: bytes, fail_after: int):
+    yield payload[:fail_after]
+    raise ConnectionError('client went away')
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def store(s3_client):
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield S3FileStore(
+        bucket_name=BUCKET,
+        part_size=PART_SIZE,
+        upload_concurrency=2,
+        client=s3_client,
+        executor=executor
+    )
+    executor.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestS3FileStore:
+    async def test_store_and_retrieve(self, store):
+        await store.store('a/file.txt', b'hello', 'text/plain')
+
+        assert await store.retrieve('a/file.txt') == b'hello'
+        assert await store.exists('a/file.txt') is True
+
+    async def test_missing_key(self, store):
+        assert await store.retrieve('missing') is None
+        assert await store.stat('missing') is None
+        assert await store.exists('missing') is False
+
+    async def test_small_stream_uses_single_put(self, store, s3_client):
+        payload = b'x' * 1000
+
+        await store.store_stream('a/small.bin', stream(payload, 100), 'application/octet-stream')
+
+        head = s3_client.head_object(Bucket=BUCKET, Key='a/small.bin')
+        assert '-' not in head['ETag']
+        assert await store.retrieve('a/small.bin') == payload
+
+    async def test_large_stream_uses_multipart_upload(self, store, s3_client):
+        payload = bytes(range(256)) * (PART_SIZE * 2 // 256) + b'tail'
+
+        await store.store_stream('a/large.bin', stream(payload))
+
+        head = s3_client.head_object(Bucket=BUCKET, Key='a/large.bin')
+        assert head['ETag'].endswith('-3"')
+        assert await store.retrieve('a/large.bin') == payload
+
+    async def test_failed_stream_aborts_multipart_upload(self, store, s3_client):
+        payload = b'x' * (PART_SIZE + 1)
+
+        with pytest.raises(ConnectionError):
+            await store.store_stream('a/broken.bin', failing_stream(payload, len(payload)))
+
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get('Uploads', []) == []
+        assert await store.exists('a/broken.bin') is False
+
+    async def test_stat_and_iter_range(self, store):
+        await store.store('a/file.txt', b'0123456789')
+
+        info = await store.stat('a/file.txt')
+        chunks = [chunk async for chunk in store.iter_range('a/file.txt', 2, 7, chunk_size=4)]
+
+        assert info.size == 10
+        assert info.etag.startswith('"')
+        assert b''.join(chunks) == b'234567'
+        assert [chunk async for chunk in store.iter_range('a/file.txt', 8)] == [b'89']
+
+    async def test_delete_many_batches_keys(self, store, s3_client, monkeypatch):
+        monkeypatch.setattr('src.storage.s3_file_store.MAX_DELETE_BATCH_SIZE', 2)
+        keys = [f'k/{i}.txt' for i in range(5)]
+        for key in keys:
+            await store.store(key, b'data')
+        calls = []
+        delete_objects = s3_client.delete_objects
+        monkeypatch.setattr(
+            s3_client, 'delete_objects', lambda **kwargs: calls.append(kwargs) or delete_objects(**kwargs)
+        )
+
+        results = await store.delete_many(keys)
+
+        assert results == dict.fromkeys(keys, True)
+        assert len(calls) == 3
+        assert s3_client.list_objects_v2(Bucket=BUCKET).get('KeyCount') == 0
+
+    async def test_presigned_urls(self, store):
+        download_url = store.get_url('a/file.txt')
+        upload_url = store.generate_presigned_upload_url('a/file.txt', 'text/plain')
+
+        assert download_url.startswith(f'https://{BUCKET}.s3.amazonaws.com/a/file.txt?')
+        assert 'Signature' in download_url
+        assert upload_url.startswith(f'https://{BUCKET}.s3.amazonaws.com/a/file.txt?')
+        assert store.presigned_upload_method == 'PUT'
+
+    async def test_empty_endpoint_url_uses_default_endpoint(self, s3_client):
+        store = S3FileStore(bucket_name=BUCKET, endpoint_url='')
+
+        assert store.endpoint_url is None
+        assert store.s3_client.meta.endpoint_url == 'https://s3.amazonaws.com'
+        assert store.s3_client is S3FileStore(bucket_name=BUCKET).s3_client
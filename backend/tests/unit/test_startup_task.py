@@ -5,7 +5,7 @@ from src.tasks import startup
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_run_startup_tasks_enqueues_default_admin(monkeypatch):
+async def test_run_startup_tasks_enqueues_startup_tasks(monkeypatch):
     class FakeTaskResult:
         def __init__(self, task_id):
             self.id = task_id
@@ -13,10 +13,23 @@ async def test_run_startup_tasks_enqueues_default_admin(monkeypatch):
     def fake_enqueue(task_name: str, *args, **kwargs):
         return FakeTaskResult(f'{task_name}-id')
 
-    monkeypatch.setattr(startup, 'enqueue', fake_enqueue)
+    calls = []
+
+    async def fake_ensure_indexes(correlation_id, task_id):
+        calls.append('ensure_indexes')
+        return {'status': 'completed', 'collections': {'users': {}}}
+
+    def recording_enqueue(task_name: str, *args, **kwargs):
+        calls.append(task_name)
+        return fake_enqueue(task_name, *args, **kwargs)
+
+    monkeypatch.setattr(startup, '_run_ensure_indexes', fake_ensure_indexes)
+    monkeypatch.setattr(startup, 'enqueue', recording_enqueue)
 
     result = await startup._run_startup_tasks('corr-id', 'task-id')
 
     assert result['status'] == 'completed'
+    assert calls == ['ensure_indexes', 'ensure_default_admin']
+    assert result['indexes'] == {'users': {}}
     assert result['tasks'] == ['ensure_default_admin']
     assert result['task_ids'] == ['ensure_default_admin-id']
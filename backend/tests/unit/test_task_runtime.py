@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.auth.user_cache import UserCache
+from src.tasks.celery import runtime
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+async def fail():
+    raise ValueError('boom')
+
+
+@pytest.fixture
+def task_loop():
+    yield
+    runtime.stop_task_loop()
+
+
+@pytest.mark.unit
+class TestTaskRuntime:
+    def test_tasks_share_one_persistent_loop(self, task_loop):
+        first = runtime.run_async(current_loop())
+        second = runtime.run_async(current_loop())
+
+        assert first is second
+        assert first.is_running()
+
+    def test_exceptions_propagate(self, task_loop):
+        with pytest.raises(ValueError, match='boom'):
+            runtime.run_async(fail())
+
+        assert runtime.run_async(asyncio.sleep(0, result='ok')) == 'ok'
+
+    def test_concurrent_callers_from_threads(self, task_loop):
+        async def work(i):
+            await asyncio.sleep(0.01)
+            return i
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda i: runtime.run_async(work(i)), range(8)))
+
+        assert results == list(range(8))
+
+    def test_async_task_runs_body_on_task_loop(self, task_loop):
+        @runtime.async_task
+        async def body(task, value):
+            """Task body."""
+            return task, value, asyncio.get_running_loop()
+
+        task, value, loop = body('self', 42)
+
+        assert (task, value) == ('self', 42)
+        assert loop is runtime.get_task_loop()
+        assert body.__name__ == 'body' and body.__doc__ == 'Task body.'
+
+    def test_worker_signals_connect_and_disconnect_database(self, task_loop, monkeypatch):
+        calls = []
+
+        async def connect():
+            calls.append(('connect', asyncio.get_running_loop()))
+
+        async def disconnect():
+            calls.append(('disconnect', asyncio.get_running_loop()))
+
+        monkeypatch.setattr(runtime.DatabaseConnection, 'connect', connect)
+        monkeypatch.setattr(runtime.DatabaseConnection, 'disconnect', disconnect)
+
+        runtime.start_task_runtime()
+        loop = runtime.get_task_loop()
+        runtime.stop_task_runtime()
+
+        assert calls == [('connect', loop), ('disconnect', loop)]
+        assert loop.is_closed()
+
+    def test_worker_publishes_user_cache_invalidations(self, task_loop, monkeypatch):
+        exchange = MagicMock(publish=AsyncMock())
+        channel = MagicMock(declare_exchange=AsyncMock(return_value=exchange), declare_queue=AsyncMock())
+        connection = MagicMock(channel=AsyncMock(return_value=channel), close=AsyncMock())
+        cache = UserCache(max_size=10, ttl_seconds=30, invalidation_exchange='user_cache_invalidation')
+
+        async def noop():
+            pass
+
+        monkeypatch.setattr(runtime.DatabaseConnection, 'connect', noop)
+        monkeypatch.setattr(runtime.DatabaseConnection, 'disconnect', noop)
+        monkeypatch.setattr(runtime.settings, 'user_cache_invalidation_exchange', 'user_cache_invalidation')
+        monkeypatch.setattr(runtime.aio_pika, 'connect_robust', AsyncMock(return_value=connection))
+        monkeypatch.setattr(runtime, 'user_cache', cache)
+
+        runtime.start_task_runtime()
+        runtime.run_async(cache.invalidate('user-1'))
+        runtime.stop_task_runtime()
+
+        exchange.publish.assert_awaited_once()
+        channel.declare_queue.assert_not_awaited()
+        connection.close.assert_awaited_once()
+        assert cache._exchange is None
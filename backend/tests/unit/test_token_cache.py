@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.auth.jwt import create_access_token, create_refresh_token, verify_token
+from src.auth.service import AuthenticationService
+from src.auth.token_cache import TokenCache
+
+
+def lookups(result):
+    return REGISTRY.get_sample_value('auth_token_cache_lookups_total', {'result': result}) or 0
+
+
+@pytest.mark.unit
+class TestTokenCache:
+    def test_cached_payload_is_returned_until_exp(self):
+        cache = TokenCache(max_size=10)
+        payload = {'sub': 'user-1', 'exp': time.time() + 60}
+        cache.set('token', payload)
+
+        assert cache.get('token') == payload
+        with patch('src.auth.token_cache.time.time', return_value=payload['exp']):
+            assert cache.get('token') is None
+
+    def test_payload_without_exp_is_not_cached(self):
+        cache = TokenCache(max_size=10)
+        cache.set('token', {'sub': 'user-1'})
+
+        assert cache.get('token') is None
+
+    def test_least_recently_used_token_is_evicted(self):
+        cache = TokenCache(max_size=2)
+        exp = time.time() + 60
+        for token in ('a', 'b'):
+            cache.set(token, {'sub': token, 'exp': exp})
+        cache.get('a')
+        cache.set('c', {'sub': 'c', 'exp': exp})
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+
+    def test_returned_payload_is_a_copy(self):
+        cache = TokenCache(max_size=10)
+        cache.set('token', {'sub': 'user-1', 'exp': time.time() + 60})
+
+        cache.get('token')['sub'] = 'tampered'
+
+        assert cache.get('token')['sub'] == 'user-1'
+
+
+@pytest.mark.unit
+class TestVerifyAccessTokenCache:
+    def test_repeated_token_skips_signature_verification(self):
+        service = AuthenticationService()
+        token = create_access_token({'sub': 'user-1'})
+        hits = lookups('hit')
+
+        with patch('src.auth.service.verify_token', wraps=verify_token) as verify:
+            first = service.verify_access_token(token)
+            second = service.verify_access_token(token)
+
+        assert first == second
+        assert first['sub'] == 'user-1'
+        assert verify.call_count == 1
+        assert lookups('hit') == hits + 1
+
+    def test_expired_and_refresh_tokens_are_not_cached(self):
+        service = AuthenticationService()
+        expired = create_access_token({'sub': 'user-1'}, expires_delta=timedelta(seconds=-1))
+        refresh = create_refresh_token({'sub': 'user-1'})
+
+        for token in (expired, refresh, expired, refresh):
+            assert service.verify_access_token(token) is None
+
+        assert len(service._token_cache._entries) == 0
+
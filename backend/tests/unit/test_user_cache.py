@@ -0,0 +1,152 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.auth import user_cache as user_cache_module
+from src.auth.dependencies import load_user_identity
+from src.auth.user_cache import UserCache
+from src.models.domain import UserIdentity
+
+
+def make_identity(user_id='user-1', role='user'):
+    return UserIdentity(id=user_id, email=f'{user_id}@example.com', name='User', role=role)
+
+
+def lookups(result):
+    return REGISTRY.get_sample_value('auth_user_cache_lookups_total', {'result': result}) or 0
+
+
+class FakeUserRepository:
+    def __init__(self, users):
+        self.users = {user.id: user for user in users}
+        self.calls = []
+
+    async def get_by_id(self, user_id, projection=None):
+        self.calls.append((user_id, projection))
+        return self.users.get(user_id)
+
+
+@pytest.mark.unit
+class TestUserCache:
+    def test_get_counts_hits_and_misses(self):
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        hits, misses = lookups('hit'), lookups('miss')
+
+        assert cache.get('user-1') is None
+        cache.set(make_identity())
+        assert cache.get('user-1') == make_identity()
+
+        assert lookups('hit') == hits + 1
+        assert lookups('miss') == misses + 1
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(user_cache_module.time, 'monotonic', lambda: now[0])
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        cache.set(make_identity())
+
+        now[0] += 29
+        assert cache.get('user-1') is not None
+        now[0] += 2
+        assert cache.get('user-1') is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = UserCache(max_size=2, ttl_seconds=30)
+        cache.set(make_identity('a'))
+        cache.set(make_identity('b'))
+        cache.get('a')
+        cache.set(make_identity('c'))
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = UserCache(max_size=10, ttl_seconds=0)
+        cache.set(make_identity())
+
+        assert cache.get('user-1') is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestUserCacheInvalidation:
+    async def test_invalidate_is_local_without_exchange(self):
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        cache.set(make_identity())
+
+        await cache.invalidate('user-1')
+
+        assert cache.get('user-1') is None
+
+    async def test_attach_publishes_invalidations(self):
+        exchange = MagicMock(publish=AsyncMock())
+        queue = MagicMock(bind=AsyncMock(), consume=AsyncMock())
+        channel = MagicMock(
+            declare_exchange=AsyncMock(return_value=exchange),
+            declare_queue=AsyncMock(return_value=queue)
+        )
+        cache = UserCache(max_size=10, ttl_seconds=30, invalidation_exchange='user_cache_invalidation')
+
+        await cache.attach(channel)
+        await cache.invalidate('user-1')
+
+        queue.bind.assert_awaited_once_with(exchange)
+        message = exchange.publish.await_args.args[0]
+        assert json.loads(message.body)['user_id'] == 'user-1'
+
+    async def test_publish_only_attach_does_not_consume(self):
+        exchange = MagicMock(publish=AsyncMock())
+        channel = MagicMock(declare_exchange=AsyncMock(return_value=exchange), declare_queue=AsyncMock())
+        cache = UserCache(max_size=10, ttl_seconds=30, invalidation_exchange='user_cache_invalidation')
+
+        await cache.attach(channel, consume=False)
+        await cache.invalidate('user-1')
+
+        channel.declare_queue.assert_not_awaited()
+        exchange.publish.assert_awaited_once()
+
+    async def test_attach_without_exchange_name_is_noop(self):
+        channel = MagicMock(declare_exchange=AsyncMock())
+        cache = UserCache(max_size=10, ttl_seconds=30)
+
+        await cache.attach(channel)
+
+        channel.declare_exchange.assert_not_awaited()
+
+    async def test_remote_invalidation_evicts_entry(self):
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        cache.set(make_identity())
+        message = MagicMock(body=json.dumps({'user_id': 'user-1', 'origin': 'other'}).encode())
+
+        await cache._handle_invalidation(message)
+
+        assert cache.get('user-1') is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestLoadUserIdentity:
+    async def test_second_lookup_is_served_from_cache(self, monkeypatch):
+        monkeypatch.setattr(
+            'src.auth.dependencies.user_cache', UserCache(max_size=10, ttl_seconds=30)
+        )
+        repo = FakeUserRepository([make_identity()])
+
+        first = await load_user_identity('user-1', repo)
+        second = await load_user_identity('user-1', repo)
+
+        assert first == second == make_identity()
+        assert repo.calls == [('user-1', UserIdentity)]
+
+    async def test_unknown_user_is_not_cached(self, monkeypatch):
+        monkeypatch.setattr(
+            'src.auth.dependencies.user_cache', UserCache(max_size=10, ttl_seconds=30)
+        )
+        repo = FakeUserRepository([])
+
+        assert await load_user_identity('missing', repo) is None
+        assert await load_user_identity('missing', repo) is None
+        assert len(repo.calls) == 2
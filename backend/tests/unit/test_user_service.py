@@ -3,8 +3,9 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.auth.user_cache import UserCache
 from src.config import settings
-from src.models.domain import User, UserCreate, AdminUserCreate
+from src.models.domain import User, UserCreate, AdminUserCreate, UserIdentity
 from src.services.user_service import UserService
 
 
@@ -47,10 +48,21 @@ class TestUserService:
             async def delete(self, user_id: str):
                 return self._users.pop(user_id, None) is not None
 
+            async def set_avatar_variant_sizes(self, file_key: str, sizes):
+                for user in self._users.values():
+                    if user.avatar_file_key == file_key:
+                        user.avatar_variant_sizes = list(sizes)
+
             async def get_all(self, skip: int = 0, limit: int = 100):
                 users = list(self._users.values())
                 return users[skip:skip + limit]
 
+            async def find_many(self, filter: dict, skip: int = 0, limit: int = 100, projection=None):
+                users = list(self._users.values())[skip:skip + limit]
+                if projection:
+                    return [projection.model_validate(user.model_dump()) for user in users]
+                return users
+
         return FakeUserRepository()
 
     @pytest.fixture
@@ -304,6 +316,7 @@ class TestUserService:
         assert len(page1) == 2
         assert len(page2) == 2
         assert page1[0].email != page2[0].email
+        assert not hasattr(page1[0], 'hashed_password')
 
     async def test_set_avatar_storage_not_configured(self, user_service: UserService):
         """Test set_avatar when file_storage_service is None raises error."""
@@ -331,7 +344,91 @@ class TestUserService:
         with pytest.raises(ValueError, match='errors.file.not_found'):
             await service.set_avatar(user.id, 'missing/file-key')
 
+    async def test_avatar_url_uses_thumbnail_once_generated(self, user_repository):
+        """Test avatar_url stays on the original until the thumbnail is known to exist."""
+        storage = MagicMock()
+        storage.file_exists = AsyncMock(return_value=True)
+        storage.stored_variant_sizes = AsyncMock(return_value=[])
+        storage.resolve_storage_key = AsyncMock(side_effect=lambda key: key)
+        storage.schedule_image_variants = AsyncMock(return_value=True)
+        storage.get_file_url = lambda key, size=None, variant_sizes=(), storage_key=None: (
+            f'/storage/{key}.{size}.webp' if size in variant_sizes else f'/storage/{key}'
+        )
+        service = UserService(user_repository, file_storage_service=storage)
+        user = await service.create_user(UserCreate(
+            email='thumb@example.com',
+            name='Thumb User',
+            password='password123'
+        ))
+
+        user = await service.set_avatar(user.id, 'uuid/avatar.png')
+        storage.schedule_image_variants.assert_awaited_once_with('uuid/avatar.png')
+        assert service.to_response(user).avatar_url == '/storage/uuid/avatar.png'
+
+        # The variants task records the generated sizes on the user
+        await user_repository.set_avatar_variant_sizes('uuid/avatar.png', [64, 256])
+        user = await service.get_user_or_raise(user.id)
+        assert service.to_response(user).avatar_url == '/storage/uuid/avatar.png.256.webp'
+
+        # Variants that already exist are recorded right away
+        storage.stored_variant_sizes = AsyncMock(return_value=[256])
+        storage.schedule_image_variants.reset_mock()
+        user = await service.set_avatar(user.id, 'uuid/other.png')
+        storage.schedule_image_variants.assert_not_awaited()
+        assert user.avatar_variant_sizes == [256]
+
+    async def test_content_addressed_avatar_url_points_at_blob(self, user_repository):
+        """Test avatar_url uses the resolved blob, not the authenticated download endpoint."""
+        storage = MagicMock()
+        storage.file_exists = AsyncMock(return_value=True)
+        storage.stored_variant_sizes = AsyncMock(return_value=[])
+        storage.resolve_storage_key = AsyncMock(return_value='blobs/abc')
+        storage.get_file_url = MagicMock(return_value='/storage/blobs/abc')
+        storage.schedule_image_variants = AsyncMock(return_value=True)
+        service = UserService(user_repository, file_storage_service=storage)
+        user = await service.create_user(UserCreate(
+            email='blob@example.com',
+            name='Blob User',
+            password='password123'
+        ))
+
+        user = await service.set_avatar(user.id, 'uuid/avatar.png')
+        assert user.avatar_storage_key == 'blobs/abc'
+        assert service.to_response(user).avatar_url == '/storage/blobs/abc'
+        assert storage.get_file_url.call_args.kwargs['storage_key'] == 'blobs/abc'
+
+        user = await service.delete_avatar(user.id)
+        assert user.avatar_storage_key is None
+
     async def test_update_user_not_found(self, user_service: UserService):
         """Test update_user with non-existent user_id raises error."""
         with pytest.raises(ValueError, match='errors.user.not_found'):
             await user_service.update_user('nonexistent-id', {'name': 'Updated'})
+
+    async def test_writes_invalidate_cached_user(self, user_repository):
+        """Test update_user, set_avatar, delete_avatar and delete_user evict the cached user."""
+        storage = MagicMock()
+        storage.file_exists = AsyncMock(return_value=True)
+        storage.delete_file = AsyncMock(return_value=True)
+        storage.stored_variant_sizes = AsyncMock(return_value=[])
+        storage.resolve_storage_key = AsyncMock(side_effect=lambda key: key)
+        storage.schedule_image_variants = AsyncMock(return_value=True)
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        service = UserService(user_repository, file_storage_service=storage, user_cache=cache)
+        user = await service.create_user(UserCreate(
+            email='cached@example.com',
+            name='Cached User',
+            password='password123'
+        ))
+        identity = UserIdentity(id=user.id, email=user.email, name=user.name, role=user.role)
+
+        for write in (
+            lambda: service.update_user(user.id, {'name': 'Renamed'}),
+            lambda: service.set_avatar(user.id, 'uuid/avatar.png'),
+            lambda: service.delete_avatar(user.id),
+            lambda: service.delete_user(user.id),
+        ):
+            cache.set(identity)
+            await write()
+            assert cache.get(user.id) is None
+
@@ -1,64 +1,210 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock
 
 import pytest
+from prometheus_client import REGISTRY
 
-from src.websocket.connection_manager import ConnectionManager
+from src.websocket.connection_manager import ConnectionManager, encode_message
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestConnectionManager:
+    @pytest.fixture(autouse=True)
+    async def stop_writers(self):
+        self.managers = []
+        yield
+        for manager in self.managers:
+            await manager.shutdown()
+
+    def manager(self, **kwargs):
+        manager = ConnectionManager(**kwargs)
+        self.managers.append(manager)
+        return manager
+
     async def test_register_adds_connection_for_user(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws = AsyncMock()
         manager.register(ws, 'user1')
         assert 'user1' in manager._connections
         assert ws in manager._connections['user1']
 
     async def test_unregister_removes_connection(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws = AsyncMock()
         manager.register(ws, 'user1')
         manager.unregister(ws)
         assert 'user1' not in manager._connections
 
     async def test_send_to_user_sends_only_to_that_user(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws1 = AsyncMock()
         ws2 = AsyncMock()
         manager.register(ws1, 'user1')
         manager.register(ws2, 'user2')
         await manager.send_to_user('user1', {'msg': 'hello'})
-        ws1.send_json.assert_awaited_once_with({'msg': 'hello'})
-        ws2.send_json.assert_not_awaited()
+        await manager.drain()
+        ws1.send_text.assert_awaited_once_with(json.dumps({'msg': 'hello'}, separators=(',', ':')))
+        ws2.send_text.assert_not_awaited()
 
     async def test_broadcast_sends_to_all_connections(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws1 = AsyncMock()
         ws2 = AsyncMock()
         manager.register(ws1, 'user1')
         manager.register(ws2, 'user2')
         await manager.broadcast({'msg': 'broadcast'})
-        ws1.send_json.assert_awaited_once_with({'msg': 'broadcast'})
-        ws2.send_json.assert_awaited_once_with({'msg': 'broadcast'})
+        await manager.drain()
+        ws1.send_text.assert_awaited_once_with(json.dumps({'msg': 'broadcast'}, separators=(',', ':')))
+        ws2.send_text.assert_awaited_once_with(json.dumps({'msg': 'broadcast'}, separators=(',', ':')))
 
     async def test_multiple_connections_per_user_all_receive_send_to_user(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws1 = AsyncMock()
         ws2 = AsyncMock()
         manager.register(ws1, 'user1')
         manager.register(ws2, 'user1')
         await manager.send_to_user('user1', {'x': 1})
-        ws1.send_json.assert_awaited_once_with({'x': 1})
-        ws2.send_json.assert_awaited_once_with({'x': 1})
+        await manager.drain()
+        ws1.send_text.assert_awaited_once_with(json.dumps({'x': 1}, separators=(',', ':')))
+        ws2.send_text.assert_awaited_once_with(json.dumps({'x': 1}, separators=(',', ':')))
 
     async def test_send_to_user_unregisters_dead_connections(self):
-        manager = ConnectionManager()
+        manager = self.manager()
         ws1 = AsyncMock()
         ws2 = AsyncMock()
-        ws1.send_json = AsyncMock(side_effect=Exception('closed'))
+        ws1.send_text = AsyncMock(side_effect=Exception('closed'))
         manager.register(ws1, 'user1')
         manager.register(ws2, 'user1')
         await manager.send_to_user('user1', {'x': 1})
+        await manager.drain()
         assert ws1 not in manager._connections.get('user1', set())
         assert ws2 in manager._connections['user1']
+
+    async def test_unregister_only_touches_owner(self):
+        manager = self.manager()
+        sockets = [AsyncMock() for _ in range(3)]
+        manager.register(sockets[0], 'user1')
+        manager.register(sockets[1], 'user1')
+        manager.register(sockets[2], 'user2')
+
+        manager.unregister(sockets[0])
+        manager.unregister(sockets[0])
+
+        assert manager._connections == {'user1': {sockets[1]}, 'user2': {sockets[2]}}
+        assert manager.connection_count == 2
+        assert manager.get_connection_info(sockets[0]) is None
+
+    async def test_reregister_moves_connection_to_new_user(self):
+        manager = self.manager()
+        ws = AsyncMock()
+        manager.register(ws, 'user1')
+        manager.register(ws, 'user2')
+
+        assert manager._connections == {'user2': {ws}}
+        assert manager.get_connection_info(ws).user_id == 'user2'
+
+    async def test_connection_info_tracks_sends(self):
+        manager = self.manager()
+        ws = AsyncMock()
+        manager.register(ws, 'user1')
+        info = manager.get_connection_info(ws)
+        connected_at = info.connected_at
+
+        await manager.send_to_user('user1', {'msg': 'héllo'})
+        await manager.broadcast({'x': 1})
+        await manager.drain()
+        manager.touch(ws)
+
+        assert info.messages_sent == 2
+        assert info.bytes_sent == len('{"msg":"héllo"}'.encode()) + len('{"x":1}')
+        assert info.last_seen >= connected_at
+
+    async def test_connection_gauges(self):
+        manager = self.manager()
+        connections = REGISTRY.get_sample_value('websocket_connections')
+        users = REGISTRY.get_sample_value('websocket_connected_users')
+        ws1, ws2 = AsyncMock(), AsyncMock()
+
+        manager.register(ws1, 'user1')
+        manager.register(ws2, 'user1')
+        assert REGISTRY.get_sample_value('websocket_connections') == connections + 2
+        assert REGISTRY.get_sample_value('websocket_connected_users') == users + 1
+
+        ws1.send_text = AsyncMock(side_effect=Exception('closed'))
+        await manager.broadcast({'x': 1})
+        await manager.drain()
+        manager.unregister(ws2)
+        assert REGISTRY.get_sample_value('websocket_connections') == connections
+        assert REGISTRY.get_sample_value('websocket_connected_users') == users
+
+    async def test_slow_client_does_not_delay_others(self):
+        manager = self.manager()
+        slow, fast = AsyncMock(), AsyncMock()
+        release = asyncio.Event()
+
+        async def blocked_send(text):
+            await release.wait()
+
+        slow.send_text = AsyncMock(side_effect=blocked_send)
+        manager.register(slow, 'user1')
+        manager.register(fast, 'user2')
+
+        await manager.broadcast({'x': 1})
+        await asyncio.wait_for(manager._conns[fast].queue.join(), timeout=1)
+
+        fast.send_text.assert_awaited_once()
+        assert manager.get_connection_info(slow).messages_sent == 0
+        release.set()
+        await manager.drain()
+        assert manager.get_connection_info(slow).messages_sent == 1
+
+    async def test_full_queue_drops_messages_with_drop_policy(self):
+        manager = self.manager(queue_size=2, slow_consumer_policy='drop')
+        ws = AsyncMock()
+        manager.register(ws, 'user1')
+
+        for i in range(5):
+            await manager.send_to_user('user1', {'i': i})
+        await manager.drain()
+
+        assert [c.args[0] for c in ws.send_text.await_args_list] == ['{"i":0}', '{"i":1}']
+        assert manager.get_connection_info(ws).messages_dropped == 3
+
+    async def test_full_queue_disconnects_with_disconnect_policy(self):
+        manager = self.manager(queue_size=2, slow_consumer_policy='disconnect')
+        ws = AsyncMock()
+        manager.register(ws, 'user1')
+
+        for i in range(3):
+            await manager.broadcast({'i': i})
+        await manager.drain()
+
+        assert manager.connection_count == 0
+        ws.close.assert_awaited_once_with(code=1013)
+        ws.send_text.assert_not_awaited()
+
+    async def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            ConnectionManager(slow_consumer_policy='block')
+
+    async def test_broadcast_encodes_message_once(self):
+        manager = self.manager()
+        sockets = [AsyncMock() for _ in range(5)]
+        for i, ws in enumerate(sockets):
+            manager.register(ws, f'user{i}')
+        encodes = REGISTRY.get_sample_value('websocket_message_encode_seconds_count')
+
+        await manager.broadcast({'msg': 'hello'})
+        await manager.send_to_user('missing', {'msg': 'nobody'})
+        await manager.drain()
+
+        assert REGISTRY.get_sample_value('websocket_message_encode_seconds_count') == encodes + 1
+        frames = {ws.send_text.await_args.args[0] for ws in sockets}
+        assert frames == {'{"msg":"hello"}'}
+        assert len({id(ws.send_text.await_args.args[0]) for ws in sockets}) == 1
+
+    async def test_encode_message_matches_send_json_encoding(self):
+        for data in ({'text': 'héllo', 'n': [1, 2.5, None]}, {1: 'int key'}, {'big': 2 ** 70}):
+            assert encode_message(data) == json.dumps(data, separators=(',', ':'), ensure_ascii=False)
@@ -1,27 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from prometheus_client import REGISTRY
 
-from src.websocket.queue_consumer import _handle_message
+from src.websocket.queue_consumer import MessageDispatcher, _dispatch
+
+
+def make_message(body: bytes, timestamp=None):
+    message = MagicMock()
+    message.body = body
+    message.timestamp = timestamp
+    message.ack = AsyncMock()
+    message.reject = AsyncMock()
+    return message
+
+
+async def run_until_idle(dispatcher: MessageDispatcher):
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestQueueConsumer:
-    async def test_handle_message_send_to_user(self):
-        message = MagicMock()
-        message.body = b'{"user_id": "u1", "payload": {"x": 1}}'
-        message.process = MagicMock(return_value=AsyncMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=None)))
+    async def test_dispatch_send_to_user(self):
         with patch('src.websocket.queue_consumer.connection_manager') as mgr:
             mgr.send_to_user = AsyncMock()
-            await _handle_message(message)
+            assert await _dispatch(b'{"user_id": "u1", "payload": {"x": 1}}') == 'user'
             mgr.send_to_user.assert_awaited_once_with('u1', {'x': 1})
 
-    async def test_handle_message_broadcast(self):
-        message = MagicMock()
-        message.body = b'{"broadcast": true, "payload": {"msg": "hi"}}'
-        message.process = MagicMock(return_value=AsyncMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=None)))
+    async def test_dispatch_broadcast(self):
         with patch('src.websocket.queue_consumer.connection_manager') as mgr:
             mgr.broadcast = AsyncMock()
-            await _handle_message(message)
+            assert await _dispatch(b'{"broadcast": true, "payload": {"msg": "hi"}}') == 'broadcast'
             mgr.broadcast.assert_awaited_once_with({'msg': 'hi'})
+
+    async def test_dispatch_invalid_messages(self):
+        with patch('src.websocket.queue_consumer.connection_manager') as mgr:
+            assert await _dispatch(b'not json') == 'invalid'
+            assert await _dispatch(b'{"user_id": "u1"}') == 'invalid'
+            assert await _dispatch(b'{"payload": {"x": 1}}') == 'invalid'
+            mgr.send_to_user.assert_not_called()
+
+    async def test_dispatcher_acks_in_batches(self):
+        dispatcher = MessageDispatcher(queue_size=10, ack_batch_size=2, ack_interval=0.01)
+        messages = [make_message(b'{"user_id": "u1", "payload": {"i": %d}}' % i) for i in range(5)]
+        with patch('src.websocket.queue_consumer.connection_manager') as mgr:
+            mgr.send_to_user = AsyncMock()
+            for message in messages:
+                await dispatcher.enqueue(message)
+            await run_until_idle(dispatcher)
+
+        assert mgr.send_to_user.await_count == 5
+        acked = [i for i, message in enumerate(messages) if message.ack.await_count]
+        assert acked == [1, 3, 4]
+        for i in acked:
+            messages[i].ack.assert_awaited_once_with(multiple=True)
+
+    async def test_failed_dispatch_is_rejected_after_flushing_acks(self):
+        dispatcher = MessageDispatcher(queue_size=10, ack_batch_size=10, ack_interval=1)
+        ok = make_message(b'{"user_id": "u1", "payload": {}}')
+        failing = make_message(b'{"user_id": "u2", "payload": {}}')
+        failed = REGISTRY.get_sample_value('websocket_messages_dispatched_total', {'kind': 'failed'}) or 0
+        with patch('src.websocket.queue_consumer.connection_manager') as mgr:
+            mgr.send_to_user = AsyncMock(side_effect=[None, RuntimeError('boom')])
+            await dispatcher.enqueue(ok)
+            await dispatcher.enqueue(failing)
+            await run_until_idle(dispatcher)
+
+        ok.ack.assert_awaited_once_with(multiple=True)
+        failing.reject.assert_awaited_once()
+        failing.ack.assert_not_awaited()
+        assert REGISTRY.get_sample_value('websocket_messages_dispatched_total', {'kind': 'failed'}) == failed + 1
+
+    async def test_queue_lag_observed_from_message_timestamp(self):
+        dispatcher = MessageDispatcher(queue_size=10, ack_batch_size=1, ack_interval=1)
+
+        def lag_bucket(le):
+            return REGISTRY.get_sample_value('websocket_queue_lag_seconds_bucket', {'le': le}) or 0
+
+        lag_count = REGISTRY.get_sample_value('websocket_queue_lag_seconds_count') or 0
+        under_2s, under_5s = lag_bucket('2.0'), lag_bucket('5.0')
+        published = datetime.now(timezone.utc) - timedelta(seconds=3)
+        with patch('src.websocket.queue_consumer.connection_manager') as mgr:
+            mgr.broadcast = AsyncMock()
+            await dispatcher.enqueue(make_message(b'{"broadcast": true, "payload": {}}', published))
+            await dispatcher.enqueue(make_message(b'{"broadcast": true, "payload": {}}'))
+            await run_until_idle(dispatcher)
+
+        assert REGISTRY.get_sample_value('websocket_queue_lag_seconds_count') == lag_count + 1
+        assert (lag_bucket('2.0'), lag_bucket('5.0')) == (under_2s, under_5s + 1)
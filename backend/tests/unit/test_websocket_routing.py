@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.websocket.connection_manager import ConnectionManager
+from src.websocket.routing import BROADCAST_ROUTING_KEY, MessageRouter, NodePresence
+
+
+class FakeQueue:
+    def __init__(self):
+        self.bindings = set()
+        self.calls = []
+
+    async def bind(self, exchange, routing_key):
+        self.calls.append(('bind', routing_key))
+        self.bindings.add(routing_key)
+
+    async def unbind(self, exchange, routing_key):
+        self.calls.append(('unbind', routing_key))
+        self.bindings.discard(routing_key)
+
+
+def make_message(body: bytes):
+    message = MagicMock()
+    message.body = body
+    message.content_type = 'application/json'
+    message.timestamp = None
+    message.process = MagicMock(return_value=AsyncMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=None)))
+    return message
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestNodePresence:
+    async def test_bindings_follow_first_and_last_connection(self):
+        presence = NodePresence()
+        manager = ConnectionManager()
+        manager.add_presence_listener(presence)
+        queue = FakeQueue()
+        task = asyncio.create_task(presence.run(queue, None, manager.user_ids))
+        ws1, ws2, ws3 = AsyncMock(), AsyncMock(), AsyncMock()
+
+        manager.register(ws1, 'u1')
+        manager.register(ws2, 'u1')
+        manager.register(ws3, 'u2')
+        manager.unregister(ws1)
+        await settle()
+        assert queue.bindings == {'user.u1', 'user.u2'}
+
+        manager.unregister(ws2)
+        await settle()
+        assert queue.bindings == {'user.u2'}
+        assert queue.calls.count(('bind', 'user.u1')) == 1
+
+        await manager.shutdown()
+        await settle()
+        assert queue.bindings == set()
+        task.cancel()
+
+    async def test_attach_binds_connected_users_and_drops_stale_changes(self):
+        presence = NodePresence()
+        presence.user_connected('gone')
+        presence.user_disconnected('gone')
+        queue = FakeQueue()
+
+        task = asyncio.create_task(presence.run(queue, None, lambda: ['u1', 'u2']))
+        await settle()
+
+        assert queue.calls == [('bind', 'user.u1'), ('bind', 'user.u2')]
+        task.cancel()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestMessageRouter:
+    async def test_routes_by_user_and_broadcast(self):
+        exchange = AsyncMock()
+        router = MessageRouter(exchange)
+
+        await router.route(make_message(b'{"user_id": "u1", "payload": {"x": 1}}'))
+        await router.route(make_message(b'{"broadcast": true, "payload": {}}'))
+
+        routing_keys = [call.kwargs['routing_key'] for call in exchange.publish.await_args_list]
+        assert routing_keys == ['user.u1', BROADCAST_ROUTING_KEY]
+        assert exchange.publish.await_args_list[0].args[0].body == b'{"user_id": "u1", "payload": {"x": 1}}'
+
+    async def test_invalid_messages_are_dropped(self):
+        exchange = AsyncMock()
+        router = MessageRouter(exchange)
+
+        await router.route(make_message(b'not json'))
+        await router.route(make_message(b'{"payload": {}}'))
+
+        exchange.publish.assert_not_awaited()